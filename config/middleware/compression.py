@@ -0,0 +1,12 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+
+
+class ThresholdGZipMiddleware(GZipMiddleware):
+    """GZip middleware that leaves responses below a size threshold alone."""
+
+    def process_response(self, request, response):
+        min_bytes = getattr(settings, "RESPONSE_COMPRESSION_MIN_BYTES", 1024)
+        if not response.streaming and len(response.content) < min_bytes:
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,12 @@
+from library.repositories.identity_map import identity_map
+
+
+class IdentityMapMiddleware:
+    """Give each request its own repository identity map."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with identity_map():
+            return self.get_response(request)
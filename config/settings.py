@@ -49,12 +49,14 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "config.middleware.request_context.RequestContextMiddleware",
     "config.middleware.request_logging.RequestLoggingMiddleware",
+    "config.middleware.compression.ThresholdGZipMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    "config.middleware.identity_map.IdentityMapMiddleware",
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -66,8 +68,53 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 10,
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "library-default",
+    }
+}
+
+# Seconds a cached public catalog response is kept. Invalidation is by
+# bumping a version counter in the database; a worker other than the one
+# that made the change keeps serving its entry for up to
+# LIBRARY_SHARED_VERSION_TTL seconds, so this mainly bounds memory use.
+LIBRARY_CATALOG_CACHE_TIMEOUT = 300
+
+# Responses smaller than this are sent uncompressed.
+RESPONSE_COMPRESSION_MIN_BYTES = 1024
+
+# Seconds a process trusts its in-memory loan policy table, catalog
+# indexes and catalog response versions before re-reading their shared
+# version counters.
+LIBRARY_SHARED_VERSION_TTL = 5
+
+# Defaults for terms no LoanPolicy row sets.
 LIBRARY_MAX_BOOKS_ALLOWED = 5
 LIBRARY_LOAN_DAYS = 14
+# Currency units per late day.
+LIBRARY_DAILY_FINE_RATE = 1.50
+# Times a loan may be extended by another loan period.
+LIBRARY_MAX_RENEWALS = 2
+# Days a member has to collect a copy put on hold for their reservation.
+LIBRARY_HOLD_PICKUP_DAYS = 3
+
+# "optimistic" claims a copy with a conditional UPDATE and retries on
+# another copy when it loses a race; "locking" uses SELECT ... FOR UPDATE.
+LIBRARY_BORROW_STRATEGY = "optimistic"
+LIBRARY_BORROW_CLAIM_ATTEMPTS = 3
+
+# (tokens per second, burst) for the circulation endpoints, enforced per
+# process; None disables a limit. Excess requests get 429 + Retry-After.
+LIBRARY_CIRCULATION_MEMBER_RATE = (2, 10)
+LIBRARY_CIRCULATION_GLOBAL_RATE = (200, 400)
+
+# Seconds a response stored under an Idempotency-Key is replayed for.
+LIBRARY_IDEMPOTENCY_TTL = 24 * 60 * 60
+
+# Seconds an unfinished Idempotency-Key claim blocks retries before it is
+# treated as abandoned by a crashed worker and claimed again.
+LIBRARY_IDEMPOTENCY_LEASE = 60
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
@@ -102,6 +149,10 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Take the write lock when a transaction starts. With deferred
+        # transactions two writers that both read first deadlock and one
+        # fails with "database is locked" instead of waiting its turn.
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
     }
 }
 
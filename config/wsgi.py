@@ -14,3 +14,13 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Build the in-memory catalog indexes before the first request.
+from library.services.catalog_index import warm_catalog_indexes  # noqa: E402
+from django.db import DatabaseError  # noqa: E402
+
+try:
+    warm_catalog_indexes()
+except DatabaseError:
+    # Not migrated yet; the indexes build lazily on first use instead.
+    pass
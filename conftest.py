@@ -0,0 +1,21 @@
+import pytest
+from django.core.cache import cache
+
+from library.apis.throttling import token_buckets
+from library.services.catalog_cache import forget_versions
+from library.services.catalog_index import catalog_indexes
+from library.services.loan_policy import loan_policies
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Cached catalog responses must not leak between test databases."""
+    cache.clear()
+    # Shared version counters roll back with each test, so a compiled
+    # copy could otherwise look current in the next one.
+    loan_policies.forget()
+    forget_versions()
+    for index in catalog_indexes:
+        index.forget()
+    # Buckets are keyed by user id, and ids are reused across test databases.
+    token_buckets.clear()
@@ -1,18 +1,28 @@
-from rest_framework.generics import CreateAPIView, UpdateAPIView, RetrieveAPIView, ListAPIView
+from rest_framework.generics import (
+    CreateAPIView, UpdateAPIView, RetrieveAPIView, ListAPIView, GenericAPIView
+)
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ValidationError
 
 from library.serializers.book_serializers import (
     AvailableBookSerializer, BookCreateSerializer, BookUpdateSerializer,
-    MemberBookDetailSerializer, LibrarianBookDetailSerializer
+    IdListField, MemberBookDetailSerializer, LibrarianBookDetailSerializer
 )
 from library.services.book_factory import create_book_with_copies
-from library.services.book_queries import get_available_books
+from library.services.book_queries import (
+    get_available_books, get_available_book_facets, get_book_last_modified
+)
 from library.services.book_updater import update_book_with_copies
 from library.services.book_soft_deleter import soft_delete_book
+from library.services.catalog_index import autocomplete_index, fuzzy_index
+from library.apis.caching import CatalogCacheMixin
+from library.apis.conditional import ConditionalGetMixin
+from library.apis.fieldsets import SparseFieldsetMixin
+from library.apis.pagination import KeysetPagination
 from library.models.book_models import Book
 from django.shortcuts import get_object_or_404
 from users.permissions.roles import IsMember, IsLibrarian
@@ -45,21 +55,86 @@ class BookUpdateAPI(UpdateAPIView):
         detail_serializer = LibrarianBookDetailSerializer(self.get_object(), context={"request": request})
         return Response(detail_serializer.data)
 
-class LibrarianBookDetailAPI(RetrieveAPIView):
-    queryset = Book.objects.prefetch_related("authors", "copies")
+class LibrarianBookDetailAPI(ConditionalGetMixin, SparseFieldsetMixin, RetrieveAPIView):
     serializer_class = LibrarianBookDetailSerializer
     permission_classes = [IsAuthenticated, IsLibrarian]
     lookup_field = 'id'
 
-class MemberBookDetailAPI(RetrieveAPIView):
+    def get_last_modified(self, request, id):
+        return get_book_last_modified(id, include_copies=True)
+
+    def get_queryset(self):
+        return self.apply_fieldset(
+            Book.objects.all(),
+            relations=["authors", "copies"],
+        )
+
+class MemberBookDetailAPI(
+    ConditionalGetMixin, CatalogCacheMixin, SparseFieldsetMixin, RetrieveAPIView
+):
     serializer_class = MemberBookDetailSerializer
     permission_classes = [IsAuthenticated, IsMember]
     lookup_field = 'id'
+    cache_scope = "member-detail"
+    cache_book_kwarg = "id"
+
+    def get_last_modified(self, request, id):
+        return get_book_last_modified(id, active_only=True)
+
+    def get_queryset(self):
+        return self.apply_fieldset(
+            Book.objects.filter(is_deleted=False),
+            relations=["authors"],
+        )
+
+class BookBatchMixin(SparseFieldsetMixin):
+    """
+    `?ids=1,2,3` multi-get built on a detail serializer.
+
+    Resolves all ids with one query plus one per prefetched relation and
+    returns them in the requested order, listing unknown ids separately.
+    """
+
+    max_ids = 200
+
+    def get_requested_ids(self):
+        field = IdListField(max_ids=self.max_ids)
+        try:
+            return field.run_validation(self.request.query_params.get("ids", ""))
+        except ValidationError as exc:
+            raise ValidationError({"ids": exc.detail})
+
+    def get(self, request):
+        ids = self.get_requested_ids()
+        books = {book.id: book for book in self.get_queryset().filter(id__in=ids)}
+
+        serializer = self.get_serializer(
+            [books[book_id] for book_id in ids if book_id in books], many=True
+        )
+        return Response({
+            "results": serializer.data,
+            "missing": [book_id for book_id in ids if book_id not in books],
+        })
+
+class LibrarianBookBatchAPI(BookBatchMixin, GenericAPIView):
+    serializer_class = LibrarianBookDetailSerializer
+    permission_classes = [IsAuthenticated, IsLibrarian]
+
+    def get_queryset(self):
+        return self.apply_fieldset(
+            Book.objects.all(),
+            relations=["authors", "copies"],
+        )
+
+class MemberBookBatchAPI(BookBatchMixin, GenericAPIView):
+    serializer_class = MemberBookDetailSerializer
+    permission_classes = [IsAuthenticated, IsMember]
 
     def get_queryset(self):
-        return Book.objects.filter(
-            is_deleted=False
-        ).prefetch_related("authors")
+        return self.apply_fieldset(
+            Book.objects.filter(is_deleted=False),
+            relations=["authors"],
+        )
 
 class BookSoftDeleteAPI(APIView):
     permission_classes = [IsAuthenticated, IsLibrarian]
@@ -69,14 +144,102 @@ class BookSoftDeleteAPI(APIView):
         soft_delete_book(book=book)
         return Response(status=204)
 
-class AvailableBooksAPI(ListAPIView):
+class AvailableBookFilterMixin:
+
+    def get_filters(self):
+        params = self.request.query_params
+
+        decade = params.get("decade")
+        if decade is not None:
+            try:
+                decade = int(decade) // 10 * 10
+            except ValueError:
+                raise ValidationError({"decade": "Must be a year"})
+
+        return {
+            "query": params.get("q"),
+            "title": params.get("title"),
+            "author": params.get("author"),
+            "category": params.get("category"),
+            "decade": decade,
+        }
+
+class AvailableBooksAPI(
+    CatalogCacheMixin, SparseFieldsetMixin, AvailableBookFilterMixin, ListAPIView
+):
     serializer_class = AvailableBookSerializer
+    cache_scope = "available"
     pagination_class = PageNumberPagination
+    cursor_pagination_class = KeysetPagination
+    # Only indexed columns, so both pagination modes stay index scans.
     ordering_fields = ["title", "published_year"]
 
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if self.uses_cursor_pagination():
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def uses_cursor_pagination(self):
+        params = self.request.query_params
+        return "cursor" in params or params.get("pagination") == "cursor"
+
+    def get_ordering(self):
+        ordering = self.request.query_params.get("ordering")
+        if ordering is None:
+            # Relevance ordering cannot be keyed on, so cursors fall back to title.
+            if self.uses_cursor_pagination():
+                return "title"
+            return None
+
+        if ordering.lstrip("-") not in self.ordering_fields:
+            raise ValidationError({
+                "ordering": f"Must be one of: {', '.join(self.ordering_fields)}"
+            })
+        return ordering
+
     def get_queryset(self):
-        return get_available_books(
-            title=self.request.query_params.get("title"),
-            author=self.request.query_params.get("author"),
-            ordering=self.request.query_params.get("ordering", "title"),
-        )
\ No newline at end of file
+        ordering = self.get_ordering()
+        qs = get_available_books(ordering=ordering, **self.get_filters())
+        # Keyset cursors read the ordering column from the last row.
+        return self.apply_fieldset(
+            qs,
+            relations=["authors"],
+            required=[(ordering or "").lstrip("-")],
+        )
+
+class BookFacetsAPI(AvailableBookFilterMixin, APIView):
+
+    def get(self, request):
+        return Response(get_available_book_facets(**self.get_filters()))
+
+class AvailableBookFacetsAPI(CatalogCacheMixin, BookFacetsAPI):
+    cache_scope = "facets"
+
+class BookAutocompleteAPI(APIView):
+    default_limit = 10
+    max_limit = 25
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer"})
+        return max(1, min(limit, self.max_limit))
+
+    def get(self, request):
+        results = autocomplete_index.suggest(
+            request.query_params.get("q", ""), limit=self.get_limit(request)
+        )
+        return Response({"results": results})
+
+class BookFuzzySearchAPI(BookAutocompleteAPI):
+
+    def get(self, request):
+        results = fuzzy_index.search(
+            request.query_params.get("q", ""), limit=self.get_limit(request)
+        )
+        return Response({"results": results})
@@ -3,25 +3,46 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
-from library.services.borrowing import borrow_book, BorrowingError
-from library.services.returning import return_book
-from library.services.reservation import reserve_book
+from rest_framework.exceptions import NotFound
+from library.services.borrowing import (
+    borrow_book, borrow_books, check_borrow_eligibility, BorrowingError
+)
+from library.services.returning import return_book, return_books_by_barcodes
+from library.services.reservation import (
+    reserve_book, reserve_books, cancel_reservation, ReservationError
+)
+from library.services.fines import pay_fine, FinePaymentError
+from library.services.renewal import renew_loans
+from library.apis.idempotency import idempotent
+from library.apis.throttling import CIRCULATION_THROTTLES
 from library.models.book_models import Book
-from library.models.borrow_models import Member, Loan, Reservation
-from library.serializers.borrow_serializers import BorrowBookSerializer, ReturnBookSerializer
-from users.permissions.roles import IsMember
+from library.models.borrow_models import Reservation
+from library.repositories.book_repository import BookRepository
+from library.repositories.fine_repository import FineRepository
+from library.repositories.loan_repository import LoanRepository
+from library.repositories.member_repository import MemberRepository
+from library.repositories.reservation_repository import ReservationRepository
+from library.serializers.borrow_serializers import (
+    BorrowBookSerializer, BorrowBooksSerializer, BorrowEligibilitySerializer,
+    ReturnBookSerializer,
+    ReturnCopiesSerializer, PayFineSerializer, ReserveBooksSerializer,
+    RenewLoanSerializer,
+)
+from users.permissions.roles import IsMember, IsLibrarian
 from users.permissions.loan_permissions import IsBorrowerOrLibrarian
 from users.permissions.reservation_permissions import IsReservationOwner
 
 class BorrowBookAPI(APIView):
     permission_classes = [IsAuthenticated, IsMember]
+    throttle_classes = CIRCULATION_THROTTLES
 
+    @idempotent
     def post(self, request):
         serializer = BorrowBookSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        member = Member.objects.get(user=request.user)
-        book = Book.objects.get(id=serializer.validated_data["book_id"])
+        member = MemberRepository().get_for_user(request.user)
+        book = BookRepository().get_active(serializer.validated_data["book_id"])
 
         try:
             loan = borrow_book(member, book)
@@ -38,16 +59,91 @@ class BorrowBookAPI(APIView):
             },
             status=status.HTTP_201_CREATED
         )
-    
+
+class BorrowBooksAPI(APIView):
+    permission_classes = [IsAuthenticated, IsMember]
+    throttle_classes = CIRCULATION_THROTTLES
+
+    def post(self, request):
+        serializer = BorrowBooksSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        member = MemberRepository().get_for_user(request.user)
+        book_ids = serializer.validated_data["book_ids"]
+        books = Book.objects.filter(is_deleted=False).in_bulk(book_ids)
+
+        try:
+            outcomes = borrow_books(
+                member, [books[book_id] for book_id in book_ids if book_id in books]
+            )
+        except BorrowingError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        by_book = {outcome["book"].id: outcome for outcome in outcomes}
+        results = []
+        for book_id in book_ids:
+            outcome = by_book.get(book_id)
+            if outcome is None:
+                results.append({"book_id": book_id, "error": "Book not found"})
+            elif "loan" in outcome:
+                results.append({
+                    "book_id": book_id,
+                    "loan_id": outcome["loan"].id,
+                    "due_at": outcome["loan"].due_at,
+                })
+            else:
+                results.append({"book_id": book_id, "error": outcome["error"]})
+
+        borrowed = any("loan_id" in result for result in results)
+        return Response(
+            {"results": results},
+            status=status.HTTP_201_CREATED if borrowed else status.HTTP_400_BAD_REQUEST
+        )
+
+class BorrowEligibilityAPI(APIView):
+    permission_classes = [IsAuthenticated, IsMember]
+    throttle_classes = CIRCULATION_THROTTLES
+
+    def get(self, request):
+        serializer = BorrowEligibilitySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        member = MemberRepository().get_for_user(request.user)
+        book_ids = serializer.validated_data["ids"]
+        books = Book.objects.filter(is_deleted=False).in_bulk(book_ids)
+        verdicts = check_borrow_eligibility(member, list(books.values()))
+
+        results = []
+        for book_id in book_ids:
+            if book_id not in books:
+                error = "Book not found"
+            else:
+                error = verdicts[book_id]
+            results.append({
+                "book_id": book_id,
+                "can_borrow": error is None,
+                "error": error,
+            })
+
+        return Response({"results": results})
+
 class ReturnBookAPI(APIView):
     permission_classes = [IsAuthenticated, IsBorrowerOrLibrarian]
+    throttle_classes = CIRCULATION_THROTTLES
 
+    @idempotent
     def post(self, request):
         serializer = ReturnBookSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        member = Member.objects.get(user=request.user)
-        loan = get_object_or_404(Loan, id=serializer.validated_data["loan_id"], member=member)
+        member = MemberRepository().get_for_user(request.user)
+        loan = LoanRepository().get(serializer.validated_data["loan_id"])
+        if loan.member_id != member.id:
+            raise NotFound()
+        loan.member = member
 
         self.check_object_permissions(request, loan)
 
@@ -66,9 +162,109 @@ class ReturnBookAPI(APIView):
             status=status.HTTP_201_CREATED
         )
 
+def _renewal_result(outcome):
+    if "loan" not in outcome:
+        return {"loan_id": outcome["loan_id"], "error": outcome["error"]}
+    if "error" in outcome:
+        return {"loan_id": outcome["loan"].id, "error": outcome["error"]}
+    return {
+        "loan_id": outcome["loan"].id,
+        "due_at": outcome["loan"].due_at,
+        "renewal_count": outcome["loan"].renewal_count,
+    }
+
+class RenewLoanAPI(APIView):
+    permission_classes = [IsAuthenticated, IsMember]
+    throttle_classes = CIRCULATION_THROTTLES
+
+    @idempotent
+    def post(self, request):
+        serializer = RenewLoanSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        member = MemberRepository().get_for_user(request.user)
+        outcome = renew_loans(member, [serializer.validated_data["loan_id"]])[0]
+
+        result = _renewal_result(outcome)
+        if "loan" not in outcome:
+            return Response(result, status=status.HTTP_404_NOT_FOUND)
+        if "error" in result:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_200_OK)
+
+class RenewAllLoansAPI(APIView):
+    permission_classes = [IsAuthenticated, IsMember]
+    throttle_classes = CIRCULATION_THROTTLES
+
+    @idempotent
+    def post(self, request):
+        member = MemberRepository().get_for_user(request.user)
+        outcomes = renew_loans(member)
+
+        return Response(
+            {"results": [_renewal_result(outcome) for outcome in outcomes]},
+            status=status.HTTP_200_OK
+        )
+
+class ReturnCopiesAPI(APIView):
+    permission_classes = [IsAuthenticated, IsLibrarian]
+    throttle_classes = CIRCULATION_THROTTLES
+
+    def post(self, request):
+        serializer = ReturnCopiesSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        outcomes = return_books_by_barcodes(serializer.validated_data["barcodes"])
+
+        results = []
+        for outcome in outcomes:
+            if "loan" in outcome:
+                results.append({
+                    "barcode": outcome["barcode"],
+                    "loan_id": outcome["loan"].id,
+                    "status": outcome["loan"].status,
+                    "fine": outcome["fine"],
+                })
+            else:
+                results.append({
+                    "barcode": outcome["barcode"],
+                    "error": outcome["error"],
+                })
+
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+class PayFineAPI(APIView):
+    permission_classes = [IsAuthenticated, IsLibrarian]
+    throttle_classes = CIRCULATION_THROTTLES
+
+    def post(self, request):
+        serializer = PayFineSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        fine = FineRepository().get(serializer.validated_data["fine_id"])
+
+        try:
+            pay_fine(fine)
+        except FinePaymentError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(
+            {
+                "fine_id": fine.id,
+                "amount": fine.amount,
+                "is_paid": fine.is_paid,
+            },
+            status=status.HTTP_200_OK
+        )
+
 class ReserveBookAPI(APIView):
     permission_classes = [IsAuthenticated, IsMember]
+    throttle_classes = CIRCULATION_THROTTLES
 
+    @idempotent
     def post(self, request):
 
         book = get_object_or_404(
@@ -86,12 +282,49 @@ class ReserveBookAPI(APIView):
             {
                 "reservation_id": reservation.id,
                 "expires_at": reservation.expires_at,
+                "queue_position": ReservationRepository().queue_position(reservation),
             },
             status=201
         )
     
+class ReserveBooksAPI(APIView):
+    permission_classes = [IsAuthenticated, IsMember]
+    throttle_classes = CIRCULATION_THROTTLES
+
+    @idempotent
+    def post(self, request):
+        serializer = ReserveBooksSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        member = MemberRepository().get_for_user(request.user)
+        book_ids = serializer.validated_data["book_ids"]
+        outcomes = reserve_books(member, book_ids)
+
+        by_book = {outcome["book"].id: outcome for outcome in outcomes}
+        results = []
+        for book_id in book_ids:
+            outcome = by_book.get(book_id)
+            if outcome is None:
+                results.append({"book_id": book_id, "error": "Book not found"})
+            elif "reservation" in outcome:
+                results.append({
+                    "book_id": book_id,
+                    "reservation_id": outcome["reservation"].id,
+                    "queue_position": outcome["queue_position"],
+                    "expires_at": outcome["reservation"].expires_at,
+                })
+            else:
+                results.append({"book_id": book_id, "error": outcome["error"]})
+
+        reserved = any("reservation_id" in result for result in results)
+        return Response(
+            {"results": results},
+            status=status.HTTP_201_CREATED if reserved else status.HTTP_400_BAD_REQUEST
+        )
+
 class CancelReservationAPI(APIView):
     permission_classes = [IsAuthenticated, IsReservationOwner]
+    throttle_classes = CIRCULATION_THROTTLES
 
     def post(self, request):
         self.check_permissions(request)
@@ -103,14 +336,39 @@ class CancelReservationAPI(APIView):
 
         self.check_object_permissions(request, reservation)
 
-        if reservation.status != Reservation.Status.ACTIVE:
+        try:
+            cancel_reservation(reservation)
+        except ReservationError as e:
             return Response(
-                {"error": f"Cannot cancel a {reservation.status.lower()} reservation"},
+                {"error": str(e)},
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        reservation.status = Reservation.Status.CANCELLED
-        reservation.save()
-
         return Response(status=204)
 
+class ReservationQueueAPI(APIView):
+    permission_classes = [IsAuthenticated, IsReservationOwner]
+    throttle_classes = CIRCULATION_THROTTLES
+
+    def get(self, request, reservation_id):
+        reservation = get_object_or_404(
+            Reservation.objects.select_related("held_copy"),
+            id=reservation_id
+        )
+
+        self.check_object_permissions(request, reservation)
+
+        active = reservation.status == Reservation.Status.ACTIVE
+        held_copy = getattr(reservation, "held_copy", None)
+        return Response({
+            "reservation_id": reservation.id,
+            "book_id": reservation.book_id,
+            "status": reservation.status,
+            "queue_position": (
+                ReservationRepository().queue_position(reservation) if active else None
+            ),
+            "held_copy": held_copy.barcode if held_copy and active else None,
+            "pickup_deadline": reservation.pickup_deadline if active else None,
+            "expires_at": reservation.expires_at,
+        })
+
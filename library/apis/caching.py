@@ -0,0 +1,35 @@
+from rest_framework import status
+from rest_framework.response import Response
+
+from library.services.catalog_cache import (
+    cache_response_data,
+    get_cached_response_data,
+    response_cache_key,
+)
+
+
+class CatalogCacheMixin:
+    """
+    Read-through cache for catalog GET endpoints.
+
+    Successful responses are stored under a key built from the normalized
+    query string and the catalog version counters, which the circulation
+    and book-editing services bump. Authentication and permissions still
+    run on every request; only the queries and serialization are skipped.
+    """
+
+    cache_scope = None
+    cache_book_kwarg = None
+
+    def get(self, request, *args, **kwargs):
+        book_id = kwargs.get(self.cache_book_kwarg) if self.cache_book_kwarg else None
+        key = response_cache_key(self.cache_scope, request, book_id=book_id)
+
+        data = get_cached_response_data(key)
+        if data is not None:
+            return Response(data)
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache_response_data(key, response.data)
+        return response
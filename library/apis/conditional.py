@@ -0,0 +1,38 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified support for detail endpoints.
+
+    `get_last_modified()` returns `(last_modified, fingerprint)` from a
+    single narrow query, or None to let the view answer 404. The ETag also
+    covers the query string, since `?fields=` changes the representation.
+    """
+
+    def get_last_modified(self, request, **kwargs):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        marker = self.get_last_modified(request, **kwargs)
+        if marker is None:
+            return super().get(request, *args, **kwargs)
+
+        last_modified, fingerprint = marker
+        etag = quote_etag(hashlib.md5(
+            f"{fingerprint}?{request.query_params.urlencode()}".encode()
+        ).hexdigest())
+        timestamp = int(last_modified.timestamp())
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+
+        response.headers.setdefault("ETag", etag)
+        response.headers.setdefault("Last-Modified", http_date(timestamp))
+        return response
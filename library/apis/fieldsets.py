@@ -0,0 +1,57 @@
+from rest_framework.exceptions import ValidationError
+
+
+class SparseFieldsetMixin:
+    """
+    `?fields=id,title` support for read endpoints.
+
+    Trims the serializer output and loads only the matching columns and
+    relations, so large unrequested columns such as `Book.description`
+    never leave the database.
+    """
+
+    fields_query_param = "fields"
+
+    def get_requested_fields(self):
+        if not hasattr(self, "_requested_fields"):
+            self._requested_fields = self._parse_requested_fields()
+        return self._requested_fields
+
+    def _parse_requested_fields(self):
+        raw = self.request.query_params.get(self.fields_query_param)
+        if not raw:
+            return None
+
+        requested = {name.strip() for name in raw.split(",") if name.strip()}
+        allowed = self.get_serializer_class().Meta.fields
+
+        unknown = requested - set(allowed)
+        if unknown:
+            raise ValidationError({
+                self.fields_query_param: f"Unknown fields: {', '.join(sorted(unknown))}"
+            })
+
+        return [name for name in allowed if name in requested or name == "id"]
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = self.get_requested_fields()
+        return context
+
+    def apply_fieldset(self, queryset, *, relations=(), required=()):
+        requested = self.get_requested_fields()
+
+        prefetch = [
+            name for name in relations
+            if requested is None or name in requested
+        ]
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+
+        if requested is None:
+            return queryset
+
+        concrete = {field.name for field in queryset.model._meta.concrete_fields}
+        columns = [name for name in requested if name in concrete]
+        columns += [name for name in required if name in concrete]
+        return queryset.only(*dict.fromkeys(columns))
@@ -0,0 +1,132 @@
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.http import Http404
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from library.models.idempotency_models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def idempotent(handler):
+    """
+    Replay the stored response for a retried POST that carries the same
+    `Idempotency-Key` header, instead of running the handler again.
+
+    The key is claimed before the handler runs. The handler and the stored
+    response then share one transaction, so a response is only kept if
+    what it reports was committed. API errors the handler raises are
+    rendered with the view's exception handling and stored like any other
+    client error. Server errors and unexpected exceptions release the key
+    so the client can retry, and a claim left unfinished for longer than
+    `LIBRARY_IDEMPOTENCY_LEASE` seconds is taken over by the next retry.
+    Requests without the header are handled as before.
+    """
+    @wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return handler(view, request, *args, **kwargs)
+
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"error": f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        fingerprint = _fingerprint(request)
+        record, created = _claim(request.user, key, fingerprint)
+        if not created:
+            return _replay(record, fingerprint)
+
+        try:
+            with transaction.atomic():
+                response = handler(view, request, *args, **kwargs)
+                _complete(record, response)
+        except (APIException, Http404, PermissionDenied) as exc:
+            # The handler's writes are rolled back; its error is the answer.
+            response = view.handle_exception(exc)
+            _complete(record, response)
+        except Exception:
+            record.delete()
+            raise
+
+        if response.status_code >= 500:
+            record.delete()
+        return response
+
+    return wrapper
+
+
+def _fingerprint(request):
+    payload = json.dumps(
+        [request.method, request.path, request.data],
+        sort_keys=True,
+        cls=DjangoJSONEncoder,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _complete(record, response):
+    if response.status_code < 500:
+        record.status_code = response.status_code
+        record.response_body = response.data
+        record.save(update_fields=["status_code", "response_body"])
+
+
+def _claim(user, key, fingerprint):
+    ttl = getattr(settings, "LIBRARY_IDEMPOTENCY_TTL", 24 * 60 * 60)
+    lease = getattr(settings, "LIBRARY_IDEMPOTENCY_LEASE", 60)
+    now = timezone.now()
+
+    # An expired row still holds the unique slot until purged, and so does
+    # the claim of a worker that died before completing it. A handler that
+    # outlives its lease fails to save its response and is rolled back.
+    IdempotencyKey.objects.filter(user=user, key=key).filter(
+        Q(expires_at__lte=now)
+        | Q(status_code__isnull=True, created_at__lte=now - timedelta(seconds=lease))
+    ).delete()
+    try:
+        with transaction.atomic():
+            record = IdempotencyKey.objects.create(
+                user=user,
+                key=key,
+                fingerprint=fingerprint,
+                expires_at=now + timedelta(seconds=ttl),
+            )
+        return record, True
+    except IntegrityError:
+        return IdempotencyKey.objects.get(user=user, key=key), False
+
+
+def _replay(record, fingerprint):
+    if record.fingerprint != fingerprint:
+        return Response(
+            {"error": f"{IDEMPOTENCY_HEADER} was already used for a different request"},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+
+    if record.status_code is None:
+        return Response(
+            {"error": "A request with this key is still being processed"},
+            status=status.HTTP_409_CONFLICT,
+            headers={"Retry-After": "1"}
+        )
+
+    return Response(
+        record.response_body,
+        status=record.status_code,
+        headers={"Idempotent-Replayed": "true"}
+    )
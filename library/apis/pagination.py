@@ -0,0 +1,92 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on (ordering field, id).
+
+    The queryset must already be ordered by `view.get_ordering()` with `id`
+    as tie-breaker. Each page is a range seek on that pair, so no COUNT(*)
+    or OFFSET scan is issued however deep the client scrolls.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = view.get_ordering()
+        self.field = self.ordering.lstrip("-")
+        self.descending = self.ordering.startswith("-")
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self._after(*position))
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        last = self.page[-1]
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(getattr(last, self.field), last.id),
+        )
+
+    def encode_cursor(self, value, pk):
+        payload = json.dumps({"o": self.ordering, "v": value, "id": pk})
+        return urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode()))
+            ordering, value, pk = payload["o"], payload["v"], int(payload["id"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if ordering != self.ordering:
+            raise NotFound(self.invalid_cursor_message)
+
+        return value, pk
+
+    def _after(self, value, pk):
+        op = "lt" if self.descending else "gt"
+        return (
+            Q(**{f"{self.field}__{op}": value})
+            | Q(**{self.field: value, f"id__{op}": pk})
+        )
@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+
+class TokenBucketStore:
+    """
+    In-process token buckets keyed by string.
+
+    Each bucket holds up to `burst` tokens and refills at `rate` per
+    second; a request takes one. Only the token count, refill time and
+    limits are kept per key, under one lock, so a check costs a dict
+    lookup. Buckets are kept in least recently used order. Once the store
+    grows past `max_keys`, the bucket idle longest is dropped, one per
+    insert. That bucket has had the most time to refill, and a missing
+    bucket means a full one.
+    """
+
+    max_keys = 10000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def take(self, key, *, rate, burst, now=None):
+        """Take one token; returns 0 if admitted, else seconds until one is free."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated, _, _ = self._buckets.get(key, (burst, now, rate, burst))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            admitted = tokens >= 1
+            if admitted:
+                tokens -= 1
+            self._buckets[key] = (tokens, now, rate, burst)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return 0 if admitted else (1 - tokens) / rate
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+token_buckets = TokenBucketStore()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Admit a request if its bucket has a token, else answer 429 straight
+    away with `Retry-After`, before the view touches the database.
+
+    `rate_setting` names a `(tokens per second, burst)` setting; None
+    turns the throttle off.
+    """
+
+    rate_setting = None
+    default_rate = None
+    store = token_buckets
+
+    def get_bucket_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        rate = getattr(settings, self.rate_setting, self.default_rate)
+        if rate is None:
+            return True
+
+        per_second, burst = rate
+        self.wait_seconds = self.store.take(
+            f"{self.rate_setting}:{self.get_bucket_key(request, view)}",
+            rate=per_second,
+            burst=burst,
+        )
+        return self.wait_seconds == 0
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class MemberCirculationThrottle(TokenBucketThrottle):
+    """One bucket per signed-in user, or per client address."""
+
+    rate_setting = "LIBRARY_CIRCULATION_MEMBER_RATE"
+    default_rate = (2, 10)
+
+    def get_bucket_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        return f"ip:{self.get_ident(request)}"
+
+
+class GlobalCirculationThrottle(TokenBucketThrottle):
+    """One bucket shared by every circulation request this process serves."""
+
+    rate_setting = "LIBRARY_CIRCULATION_GLOBAL_RATE"
+    default_rate = (200, 400)
+
+    def get_bucket_key(self, request, view):
+        return "all"
+
+
+CIRCULATION_THROTTLES = [MemberCirculationThrottle, GlobalCirculationThrottle]
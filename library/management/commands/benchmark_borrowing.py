@@ -0,0 +1,106 @@
+import threading
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, IntegrityError, connection
+
+from library.models.book_models import Book, BookCopy
+from library.models.borrow_models import Member
+from library.services.borrowing import borrow_book, BorrowingError
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure concurrent borrow throughput for a single hot title. "
+        "Creates throwaway members and a book prefixed BENCH-, and removes "
+        "them afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--copies",
+            type=int,
+            nargs="+",
+            default=[1, 4, 16],
+            help="Copy counts to benchmark, one run each.",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="Concurrent borrower threads.",
+        )
+
+    def handle(self, *args, copies, threads, **options):
+        self.stdout.write(
+            f"{'copies':>6} {'threads':>7} {'borrowed':>8} "
+            f"{'rejected':>8} {'conflicts':>9} {'seconds':>8} {'per_sec':>8}"
+        )
+        for copy_count in copies:
+            self._run(copy_count, threads)
+
+    def _run(self, copy_count, threads):
+        tag = f"BENCH-{uuid.uuid4().hex[:8]}"
+        book, members = self._setup(tag, copy_count, threads)
+        outcomes = {"borrowed": 0, "rejected": 0, "conflicts": 0}
+        lock = threading.Lock()
+        barrier = threading.Barrier(threads)
+
+        def borrower(member):
+            barrier.wait()
+            try:
+                borrow_book(member, book)
+                outcome = "borrowed"
+            except BorrowingError:
+                outcome = "rejected"
+            except (IntegrityError, DatabaseError):
+                outcome = "conflicts"
+            finally:
+                connection.close()
+            with lock:
+                outcomes[outcome] += 1
+
+        workers = [threading.Thread(target=borrower, args=(m,)) for m in members]
+        started = time.monotonic()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.monotonic() - started
+
+        self._teardown(tag, book)
+        self.stdout.write(
+            f"{copy_count:>6} {threads:>7} {outcomes['borrowed']:>8} "
+            f"{outcomes['rejected']:>8} {outcomes['conflicts']:>9} "
+            f"{elapsed:>8.3f} {outcomes['borrowed'] / elapsed:>8.1f}"
+        )
+
+    def _setup(self, tag, copy_count, member_count):
+        book = Book.objects.create(
+            title=tag,
+            isbn=tag[-13:],
+            category="Benchmark",
+            description="",
+            published_year=2000,
+            available_copies=copy_count,
+        )
+        BookCopy.objects.bulk_create([
+            BookCopy(book=book, barcode=f"{tag}-{i}", shelf_location="BENCH")
+            for i in range(copy_count)
+        ])
+
+        members = []
+        for i in range(member_count):
+            user = User(username=f"{tag}-{i}")
+            user.set_unusable_password()
+            user.save()
+            members.append(Member.objects.create(
+                user=user, membership_number=f"{tag[-11:]}-{i}"
+            ))
+        return book, members
+
+    def _teardown(self, tag, book):
+        User.objects.filter(username__startswith=tag).delete()
+        book.delete()
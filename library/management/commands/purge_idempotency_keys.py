@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from library.models.idempotency_models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Delete stored Idempotency-Key responses past their TTL."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of keys deleted per statement.",
+        )
+
+    def handle(self, *args, chunk_size, **options):
+        cutoff = timezone.now()
+        started = time.monotonic()
+        deleted = 0
+
+        while True:
+            ids = list(
+                IdempotencyKey.objects
+                .filter(expires_at__lte=cutoff)
+                .order_by("expires_at")
+                .values_list("id", flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+
+            count, _ = IdempotencyKey.objects.filter(id__in=ids).delete()
+            deleted += count
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {deleted} expired idempotency keys "
+            f"in {time.monotonic() - started:.2f}s"
+        ))
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from library.models.book_models import Book
+from library.services.book_search import get_book_search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text catalog search index from Book and Author rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of books indexed per transaction.",
+        )
+
+    def handle(self, *args, chunk_size, **options):
+        search = get_book_search()
+        started = time.monotonic()
+        last_id = 0
+        indexed = 0
+
+        with transaction.atomic():
+            search.clear()
+
+        while True:
+            books = list(
+                Book.objects
+                .filter(id__gt=last_id, is_deleted=False)
+                .order_by("id")
+                .prefetch_related("authors")[:chunk_size]
+            )
+            if not books:
+                break
+
+            with transaction.atomic():
+                search.index_books(books)
+
+            indexed += len(books)
+            last_id = books[-1].id
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {indexed} books in {time.monotonic() - started:.2f}s"
+        ))
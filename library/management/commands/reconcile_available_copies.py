@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from library.models.book_models import Book
+from library.repositories.book_repository import BookRepository
+
+
+class Command(BaseCommand):
+    help = "Recount Book.available_copies from BookCopy rows and fix any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of books recounted per transaction.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted books without writing corrections.",
+        )
+
+    def handle(self, *args, chunk_size, dry_run, **options):
+        book_repo = BookRepository()
+        started = time.monotonic()
+        last_id = 0
+        scanned = 0
+        fixed = 0
+
+        while True:
+            book_ids = list(
+                Book.objects
+                .filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:chunk_size]
+            )
+            if not book_ids:
+                break
+
+            with transaction.atomic():
+                drifted = book_repo.recount_available_copies(
+                    book_ids, dry_run=dry_run
+                )
+
+            for book in drifted:
+                self.stdout.write(
+                    f"book {book.id}: available_copies -> {book.available_copies}"
+                )
+
+            scanned += len(book_ids)
+            fixed += len(drifted)
+            last_id = book_ids[-1]
+
+        verb = "would fix" if dry_run else "fixed"
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {scanned} books, {verb} {fixed} "
+            f"in {time.monotonic() - started:.2f}s"
+        ))
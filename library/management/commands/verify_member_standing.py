@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from library.models.borrow_models import Member
+from library.repositories.member_standing_repository import MemberStandingRepository
+
+
+class Command(BaseCommand):
+    help = "Recompute MemberStanding totals from loans and fines and fix any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of members recomputed per transaction.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted members without writing corrections.",
+        )
+
+    def handle(self, *args, chunk_size, dry_run, **options):
+        standing_repo = MemberStandingRepository()
+        started = time.monotonic()
+        last_id = 0
+        scanned = 0
+        fixed = 0
+
+        while True:
+            member_ids = list(
+                Member.objects
+                .filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:chunk_size]
+            )
+            if not member_ids:
+                break
+
+            with transaction.atomic():
+                drifted = standing_repo.recompute(member_ids, dry_run=dry_run)
+
+            for standing in drifted:
+                self.stdout.write(
+                    f"member {standing.member_id}: "
+                    f"active_loan_count -> {standing.active_loan_count}, "
+                    f"unpaid_fine_total -> {standing.unpaid_fine_total}"
+                )
+
+            scanned += len(member_ids)
+            fixed += len(drifted)
+            last_id = member_ids[-1]
+
+        verb = "would fix" if dry_run else "fixed"
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {scanned} members, {verb} {fixed} "
+            f"in {time.monotonic() - started:.2f}s"
+        ))
@@ -0,0 +1,40 @@
+# Generated by Django 6.0.2 on 2026-10-18 04:00
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_available_copies(apps, schema_editor):
+    Book = apps.get_model("library", "Book")
+
+    books = (
+        Book.objects
+        .filter(is_deleted=False)
+        .annotate(
+            counted=Count("copies", filter=Q(copies__status="AVAILABLE"))
+        )
+        .filter(counted__gt=0)
+    )
+
+    for book in books.iterator():
+        Book.objects.filter(id=book.id).update(available_copies=book.counted)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0002_remove_member_max_books_allowed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='available_copies',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_available_copies, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['is_deleted', 'available_copies'], name='library_boo_is_dele_f0911c_idx'),
+        ),
+    ]
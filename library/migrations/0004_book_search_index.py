@@ -0,0 +1,67 @@
+# Generated by Django 6.0.2 on 2026-10-18 04:02
+
+import django.db.models.deletion
+import library.models.search_models
+from django.db import migrations, models
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS library_book_fts USING fts5("
+        "title, authors, "
+        "tokenize = 'unicode61 remove_diacritics 2', "
+        "prefix = '2 3')"
+    )
+    # Title matches outrank author matches.
+    schema_editor.execute(
+        "INSERT INTO library_book_fts (library_book_fts, rank) "
+        "VALUES ('rank', 'bm25(10.0, 5.0)')"
+    )
+
+    Book = apps.get_model("library", "Book")
+    books = Book.objects.filter(is_deleted=False).prefetch_related("authors")
+    for book in books.iterator(chunk_size=1000):
+        schema_editor.execute(
+            "INSERT INTO library_book_fts (rowid, title, authors) "
+            "VALUES (%s, %s, %s)",
+            [
+                book.id,
+                book.title,
+                ", ".join(author.name for author in book.authors.all()),
+            ],
+        )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    schema_editor.execute("DROP TABLE IF EXISTS library_book_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0003_book_available_copies'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookSearchDocument',
+            fields=[
+                ('book', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_document', serialize=False, to='library.book')),
+                ('title', models.TextField()),
+                ('authors', models.TextField()),
+                ('document', library.models.search_models.FullTextField(db_column='library_book_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'library_book_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-18 04:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0004_book_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['published_year'], name='library_boo_publish_2d4013_idx'),
+        ),
+    ]
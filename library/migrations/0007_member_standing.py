@@ -0,0 +1,53 @@
+# Generated by Django 6.0.2 on 2026-10-18 04:27
+
+import django.db.models.deletion
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_member_standing(apps, schema_editor):
+    Member = apps.get_model("library", "Member")
+    MemberStanding = apps.get_model("library", "MemberStanding")
+
+    members = Member.objects.annotate(
+        loans=Count("loan", filter=Q(loan__status="ACTIVE"), distinct=True),
+        fines=Coalesce(
+            Sum("loan__fine__amount", filter=Q(loan__fine__is_paid=False)),
+            Value(Decimal("0")),
+            output_field=DecimalField(max_digits=8, decimal_places=2),
+        ),
+    )
+
+    MemberStanding.objects.bulk_create(
+        (
+            MemberStanding(
+                member_id=member.id,
+                active_loan_count=member.loans,
+                unpaid_fine_total=member.fines,
+            )
+            for member in members.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0006_book_bookcopy_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberStanding',
+            fields=[
+                ('member', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='standing', serialize=False, to='library.member')),
+                ('active_loan_count', models.PositiveIntegerField(default=0)),
+                ('unpaid_fine_total', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+            ],
+        ),
+        migrations.RunPython(backfill_member_standing, migrations.RunPython.noop),
+    ]
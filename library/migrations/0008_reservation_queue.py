@@ -0,0 +1,62 @@
+# Generated by Django 6.0.2 on 2026-10-18 04:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_queue_positions(apps, schema_editor):
+    Reservation = apps.get_model("library", "Reservation")
+
+    book_id, position = None, 0
+    updated = []
+    for reservation in Reservation.objects.order_by("book_id", "reserved_at", "id").iterator():
+        if reservation.book_id != book_id:
+            book_id, position = reservation.book_id, 0
+        position += 1
+        reservation.queue_position = position
+        updated.append(reservation)
+
+    Reservation.objects.bulk_update(updated, ["queue_position"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0007_member_standing'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='reservation',
+            name='library_res_book_id_8972ea_idx',
+        ),
+        migrations.AddField(
+            model_name='bookcopy',
+            name='held_for',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='held_copy', to='library.reservation'),
+        ),
+        migrations.AddField(
+            model_name='reservation',
+            name='pickup_deadline',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='reservation',
+            name='queue_position',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.RunPython(backfill_queue_positions, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='reservation',
+            name='queue_position',
+            field=models.PositiveIntegerField(),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['book', 'status', 'queue_position'], name='library_res_book_id_c9d1ca_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='reservation',
+            constraint=models.UniqueConstraint(fields=('book', 'queue_position'), name='one_reservation_per_queue_position'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-18 04:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0008_reservation_queue'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='reservation',
+            name='library_res_expires_707d66_idx',
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['status', 'expires_at'], name='library_res_status_02e546_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.2 on 2026-10-18 04:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0009_reservation_expiry_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fine',
+            name='accrued_days',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='loan',
+            name='is_overdue',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['status', 'due_at'], name='library_loa_status_020428_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 05:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0011_idempotency_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loan',
+            name='renewal_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
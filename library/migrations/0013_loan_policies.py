@@ -0,0 +1,33 @@
+# Generated by Django 6.0.2 on 2026-10-18 05:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0012_loan_renewal_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='tier',
+            field=models.CharField(choices=[('STANDARD', 'Standard'), ('STUDENT', 'Student'), ('PREMIUM', 'Premium')], default='STANDARD', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='LoanPolicy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(blank=True, default='', max_length=100)),
+                ('tier', models.CharField(blank=True, choices=[('STANDARD', 'Standard'), ('STUDENT', 'Student'), ('PREMIUM', 'Premium')], default='', max_length=20)),
+                ('loan_days', models.PositiveIntegerField(blank=True, null=True)),
+                ('max_books', models.PositiveIntegerField(blank=True, null=True)),
+                ('daily_fine_rate', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('category', 'tier'), name='one_loan_policy_per_category_and_tier')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.2 on 2026-10-18 05:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0013_loan_policies'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VersionCounter',
+            fields=[
+                ('key', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('value', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -21,12 +21,18 @@ class Book(models.Model):
     published_year = models.IntegerField()
     is_deleted = models.BooleanField(default=False)
     deleted_at = models.DateTimeField(null=True, blank=True)
+    # Denormalized count of AVAILABLE copies, maintained by the circulation
+    # services and repaired by `manage.py reconcile_available_copies`.
+    available_copies = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         indexes = [
             models.Index(fields=["title"]),
             models.Index(fields=["category"]),
+            models.Index(fields=["published_year"]),
             models.Index(fields=["is_deleted"]),
+            models.Index(fields=["is_deleted", "available_copies"]),
         ]
 
     def __str__(self):
@@ -48,6 +54,15 @@ class BookCopy(models.Model):
         db_index=True,
     )
     shelf_location = models.CharField(max_length=50)
+    updated_at = models.DateTimeField(auto_now=True)
+    # The reservation a RESERVED copy is waiting on the hold shelf for.
+    held_for = models.OneToOneField(
+        "library.Reservation",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="held_copy",
+    )
 
     class Meta:
         indexes = [
@@ -1,16 +1,44 @@
-from django.db import models
-from django.db.models import Q
+from django.db import models, transaction
+from django.db.models import Max, Q
 from django.contrib.auth.models import User
 from django.utils.timezone import now
 from datetime import timedelta
-from library.models.book_models import BookCopy
+from library.models.book_models import Book, BookCopy
 
 class Member(models.Model):
+    class Tier(models.TextChoices):
+        STANDARD = "STANDARD"
+        STUDENT = "STUDENT"
+        PREMIUM = "PREMIUM"
+
     user = models.OneToOneField(User, on_delete=models.CASCADE)
 
     membership_number = models.CharField(max_length=20, unique=True)
     joined_at = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
+    # Selects the LoanPolicy rows that apply to this member.
+    tier = models.CharField(
+        max_length=20,
+        choices=Tier.choices,
+        default=Tier.STANDARD
+    )
+
+class MemberStanding(models.Model):
+    """
+    Running totals the borrow rules check, kept in step by the borrowing,
+    returning and fine services. `verify_member_standing` recomputes them.
+    """
+    member = models.OneToOneField(
+        Member,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="standing"
+    )
+
+    active_loan_count = models.PositiveIntegerField(default=0)
+    unpaid_fine_total = models.DecimalField(
+        max_digits=8, decimal_places=2, default=0
+    )
 
 class Loan(models.Model):
     class Status(models.TextChoices):
@@ -29,8 +57,14 @@ class Loan(models.Model):
         choices=Status.choices,
         default=Status.ACTIVE
     )
+    # Set by the nightly overdue job while the loan is still out.
+    is_overdue = models.BooleanField(default=False)
+    renewal_count = models.PositiveIntegerField(default=0)
 
     class Meta:
+        indexes = [
+            models.Index(fields=["status", "due_at"]),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["book_copy"],
@@ -67,14 +101,38 @@ class Reservation(models.Model):
     reserved_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField()
     fulfilled = models.BooleanField(default=False)
+    # Ticket number within the book's queue; lower is served first.
+    queue_position = models.PositiveIntegerField()
+    # Set once a returned copy is held for this reservation.
+    pickup_deadline = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         unique_together = ["member", "book"]
         indexes = [
-            models.Index(fields=["book", "status"]),
-            models.Index(fields=["expires_at"]),
+            models.Index(fields=["book", "status", "queue_position"]),
+            models.Index(fields=["status", "expires_at"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["book", "queue_position"],
+                name="one_reservation_per_queue_position"
+            )
         ]
 
+    def save(self, *args, **kwargs):
+        if self.queue_position is not None:
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            # Hold the book row until the ticket is written, like
+            # reserve_books, so concurrent saves never issue the same one.
+            list(Book.objects.select_for_update().filter(id=self.book_id).values("id"))
+            last = Reservation.objects.filter(book_id=self.book_id).aggregate(
+                last=Max("queue_position")
+            )["last"]
+            self.queue_position = (last or 0) + 1
+            super().save(*args, **kwargs)
+
     @staticmethod
     def default_expiry():
         return now() + timedelta(days=2)
@@ -85,3 +143,5 @@ class Fine(models.Model):
     amount = models.DecimalField(max_digits=6, decimal_places=2)
     currency = models.CharField(max_length=10, default="EUR")
     is_paid = models.BooleanField(default=False)
+    # Late days `amount` covers; grows nightly while the loan is out.
+    accrued_days = models.PositiveIntegerField(default=0)
@@ -0,0 +1,38 @@
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class IdempotencyKey(models.Model):
+    """
+    First response to a POST sent with an `Idempotency-Key` header.
+
+    The row is inserted before the view runs, so a concurrent duplicate
+    finds it in flight (`status_code` still null). It is completed in the
+    view's transaction and replayed for later duplicates until
+    `expires_at`. `purge_idempotency_keys` removes expired rows.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys"
+    )
+    key = models.CharField(max_length=255)
+    # SHA-256 of method, path and body, so a key reused for a different
+    # request is refused rather than answered with the wrong response.
+    fingerprint = models.CharField(max_length=64)
+
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"],
+                name="one_idempotency_key_per_user"
+            )
+        ]
@@ -0,0 +1,54 @@
+from django.db import models
+
+from library.models.borrow_models import Member
+
+
+class LoanPolicy(models.Model):
+    """
+    Loan terms for a book category and member tier.
+
+    A blank `category` or `tier` matches any, and a null term falls back to
+    the next broader row, then to the LIBRARY_* settings. Rows are compiled
+    into `library.services.loan_policy.loan_policies`; saving or deleting
+    one bumps its shared version so every process recompiles. Queryset
+    updates and deletes skip that, so edit rows one at a time.
+    """
+
+    category = models.CharField(max_length=100, blank=True, default="")
+    tier = models.CharField(
+        max_length=20,
+        choices=Member.Tier.choices,
+        blank=True,
+        default=""
+    )
+
+    loan_days = models.PositiveIntegerField(null=True, blank=True)
+    # Borrow cap; only read from rows without a category.
+    max_books = models.PositiveIntegerField(null=True, blank=True)
+    daily_fine_rate = models.DecimalField(
+        max_digits=6, decimal_places=2, null=True, blank=True
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["category", "tier"],
+                name="one_loan_policy_per_category_and_tier"
+            )
+        ]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._invalidate()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self._invalidate()
+        return result
+
+    @staticmethod
+    def _invalidate():
+        from library.services.loan_policy import invalidate_loan_policies
+        invalidate_loan_policies()
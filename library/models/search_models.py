@@ -0,0 +1,42 @@
+from django.db import models
+from django.db.models import Lookup
+
+
+class FullTextField(models.TextField):
+    """Hidden FTS5 column named after its table; only used for MATCH lookups."""
+
+
+@FullTextField.register_lookup
+class Match(Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+
+class BookSearchDocument(models.Model):
+    """
+    Row of the SQLite FTS5 table backing catalog search.
+
+    The table is created by migration 0004 and written by
+    `library.services.book_search`; the ORM only reads it through joins.
+    """
+
+    book = models.OneToOneField(
+        "library.Book",
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column="rowid",
+        db_constraint=False,
+        related_name="search_document",
+    )
+    title = models.TextField()
+    authors = models.TextField()
+    document = FullTextField(db_column="library_book_fts")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "library_book_fts"
@@ -0,0 +1,15 @@
+from django.db import models
+
+
+class VersionCounter(models.Model):
+    """
+    Counter bumped whenever data that processes keep compiled in memory
+    changes.
+
+    It lives in the database because the default cache is per process,
+    so a counter kept there is never seen by other workers. See
+    `library.services.shared_version`.
+    """
+
+    key = models.CharField(max_length=100, primary_key=True)
+    value = models.PositiveBigIntegerField(default=0)
@@ -1,11 +1,149 @@
+import random
+
+from django.db import connection
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
 from library.models.book_models import BookCopy
+from library.repositories import identity_map
 
 
 class BookCopyRepository:
+    # How many AVAILABLE copies a borrower picks from when rows cannot be
+    # skipped while locked.
+    candidate_window = 16
+
+    def get(self, copy_id):
+        return identity_map.load(
+            ("book_copy", copy_id),
+            lambda: BookCopy.objects.filter(id=copy_id).first(),
+        )
+
+    def _candidate_ids(self, available):
+        candidate_ids = list(
+            available.order_by("id").values_list("id", flat=True)[:self.candidate_window]
+        )
+        random.shuffle(candidate_ids)
+        return candidate_ids
+
     def find_available_for_book(self, book):
-        return (
+        """
+        Lock one AVAILABLE copy of `book`, spreading concurrent borrowers.
+
+        With SKIP LOCKED each borrower takes the first copy nobody else has
+        locked. Elsewhere borrowers start at a random copy among the first
+        few, so they rarely queue behind the same row.
+        """
+        available = BookCopy.objects.filter(
+            book=book, status=BookCopy.Status.AVAILABLE
+        )
+
+        if connection.features.has_select_for_update_skip_locked:
+            return available.select_for_update(skip_locked=True).first()
+
+        for copy_id in self._candidate_ids(available):
+            copy = available.select_for_update().filter(id=copy_id).first()
+            if copy is not None:
+                return copy
+
+        return None
+
+    def claim_held_for(self, reservation):
+        """Mark the copy on hold for `reservation` as BORROWED; None if there is none."""
+        copy = BookCopy.objects.filter(
+            held_for=reservation, status=BookCopy.Status.RESERVED
+        ).first()
+        if copy is None:
+            return None
+
+        now = timezone.now()
+        claimed = BookCopy.objects.filter(
+            id=copy.id, held_for=reservation, status=BookCopy.Status.RESERVED
+        ).update(status=BookCopy.Status.BORROWED, held_for=None, updated_at=now)
+        if not claimed:
+            return None
+
+        copy.status = BookCopy.Status.BORROWED
+        copy.held_for = None
+        copy.updated_at = now
+        return identity_map.remember(("book_copy", copy.id), copy)
+
+    def claim_available_for_book(self, book, *, attempts=3):
+        """
+        Mark one AVAILABLE copy of `book` as BORROWED without row locks.
+
+        Each candidate is claimed with `UPDATE ... WHERE status='AVAILABLE'`;
+        an affected row count of zero means another borrower got there
+        first, so the next candidate is tried. When a whole round loses,
+        the candidates are re-read straight away. There is no pause between
+        rounds: this runs inside the borrower's transaction, after an
+        UPDATE that may already hold the write lock, so sleeping would
+        stall every other writer. Returns the claimed copy, or None when no
+        copy is left or every attempt lost.
+        """
+        available = BookCopy.objects.filter(
+            book=book, status=BookCopy.Status.AVAILABLE
+        )
+
+        for _ in range(attempts):
+            candidate_ids = self._candidate_ids(available)
+            if not candidate_ids:
+                return None
+
+            for copy_id in candidate_ids:
+                claimed = available.filter(id=copy_id).update(
+                    status=BookCopy.Status.BORROWED,
+                    updated_at=timezone.now(),
+                )
+                if claimed:
+                    copy = BookCopy.objects.get(id=copy_id)
+                    return identity_map.remember(("book_copy", copy_id), copy)
+
+        return None
+
+    def claim_available_for_books(self, books, *, attempts=3):
+        """
+        Claim one AVAILABLE copy for each of `books`; returns {book_id: copy}.
+
+        Candidates for every book come from a single windowed query, and
+        only books whose candidates were all taken meanwhile fall back to
+        `claim_available_for_book`. Books with no copy left are absent
+        from the result.
+        """
+        books = {book.id: book for book in books}
+        candidates = {}
+        rows = (
             BookCopy.objects
-            .select_for_update()
-            .filter(book=book, status=BookCopy.Status.AVAILABLE)
-            .first()
+            .filter(book_id__in=books, status=BookCopy.Status.AVAILABLE)
+            .annotate(slot=Window(
+                RowNumber(), partition_by=F("book_id"), order_by=F("id").asc()
+            ))
+            .filter(slot__lte=self.candidate_window)
+            .values_list("id", "book_id")
         )
+        for copy_id, book_id in rows:
+            candidates.setdefault(book_id, []).append(copy_id)
+
+        claimed_ids = {}
+        for book_id, candidate_ids in candidates.items():
+            random.shuffle(candidate_ids)
+            for copy_id in candidate_ids:
+                claimed = BookCopy.objects.filter(
+                    id=copy_id, status=BookCopy.Status.AVAILABLE
+                ).update(status=BookCopy.Status.BORROWED, updated_at=timezone.now())
+                if claimed:
+                    claimed_ids[book_id] = copy_id
+                    break
+
+        copies = BookCopy.objects.in_bulk(claimed_ids.values())
+        for copy_id, copy in copies.items():
+            identity_map.remember(("book_copy", copy_id), copy)
+        claimed = {book_id: copies[copy_id] for book_id, copy_id in claimed_ids.items()}
+
+        for book_id in candidates.keys() - claimed.keys():
+            copy = self.claim_available_for_book(books[book_id], attempts=attempts)
+            if copy is not None:
+                claimed[book_id] = copy
+
+        return claimed
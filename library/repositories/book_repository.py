@@ -0,0 +1,70 @@
+from django.db.models import Case, Count, F, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest
+
+from library.models.book_models import Book, BookCopy
+from library.repositories import identity_map
+
+
+class BookRepository:
+    def get_active(self, book_id):
+        """The non-deleted book with `book_id`, or None."""
+        return identity_map.load(
+            ("book:active", book_id),
+            lambda: Book.objects.filter(id=book_id, is_deleted=False).first(),
+        )
+
+    def lock(self, book_ids):
+        """
+        Row-lock the books until the end of the transaction, in id order so
+        two callers locking overlapping sets cannot deadlock.
+        """
+        return list(
+            Book.objects.select_for_update()
+            .filter(id__in=book_ids)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+    def adjust_available_copies(self, book_id, delta):
+        return Book.objects.filter(id=book_id).update(
+            available_copies=Greatest(F("available_copies") + delta, Value(0))
+        )
+
+    def adjust_available_copies_bulk(self, deltas):
+        """Apply `{book_id: delta}` to the counters in a single UPDATE."""
+        if not deltas:
+            return 0
+
+        delta = Case(
+            *[When(id=book_id, then=Value(d)) for book_id, d in deltas.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        return Book.objects.filter(id__in=deltas).update(
+            available_copies=Greatest(F("available_copies") + delta, Value(0))
+        )
+
+    def recount_available_copies(self, book_ids, dry_run=False):
+        books = (
+            Book.objects
+            .filter(id__in=book_ids)
+            .annotate(
+                actual_available=Count(
+                    "copies",
+                    filter=Q(copies__status=BookCopy.Status.AVAILABLE),
+                )
+            )
+            .only("id", "is_deleted", "available_copies")
+        )
+
+        drifted = []
+        for book in books:
+            actual = 0 if book.is_deleted else book.actual_available
+            if book.available_copies != actual:
+                book.available_copies = actual
+                drifted.append(book)
+
+        if drifted and not dry_run:
+            Book.objects.bulk_update(drifted, ["available_copies"])
+
+        return drifted
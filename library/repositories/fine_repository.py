@@ -1,6 +1,14 @@
 from library.models.borrow_models import Fine
+from library.repositories import identity_map
 
 
 class FineRepository:
+    def get(self, fine_id):
+        """The fine with its loan, or None."""
+        return identity_map.load(
+            ("fine", fine_id),
+            lambda: Fine.objects.select_related("loan").filter(id=fine_id).first(),
+        )
+
     def member_has_unpaid_fines(self, member):
         return Fine.objects.filter(loan__member=member, is_paid=False).exists()
@@ -0,0 +1,43 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current = ContextVar("identity_map", default=None)
+
+
+@contextmanager
+def identity_map():
+    """
+    Scope in which repository lookups by key are loaded at most once.
+
+    Entered for every request by `IdentityMapMiddleware`. Outside a scope
+    every lookup goes to the database, so services called from commands
+    or tests behave as before.
+    """
+    token = _current.set({})
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def load(key, loader):
+    """Return the object held under `key`, calling `loader()` on first use."""
+    objects = _current.get()
+    if objects is None:
+        return loader()
+    if key not in objects:
+        objects[key] = loader()
+    return objects[key]
+
+
+def remember(key, obj):
+    objects = _current.get()
+    if objects is not None:
+        objects[key] = obj
+    return obj
+
+
+def forget(key):
+    objects = _current.get()
+    if objects is not None:
+        objects.pop(key, None)
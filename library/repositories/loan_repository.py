@@ -1,6 +1,44 @@
+from django.db.models import Q
+
 from library.models.borrow_models import Loan
+from library.repositories import identity_map
 
 
 class LoanRepository:
+    def get(self, loan_id):
+        """The loan with its copy and book, or None."""
+        def loader():
+            loan = (
+                Loan.objects.select_related("book_copy__book")
+                .filter(id=loan_id)
+                .first()
+            )
+            if loan is not None:
+                identity_map.remember(("book_copy", loan.book_copy_id), loan.book_copy)
+            return loan
+
+        return identity_map.load(("loan", loan_id), loader)
+
     def count_active_by_member(self, member):
         return Loan.objects.filter(member=member, status=Loan.Status.ACTIVE).count()
+
+    def overdue(self, as_of, *, after=None, limit, lock=False):
+        """
+        `(id, member_id, due_at, category, tier)` of ACTIVE loans due
+        before `as_of`, with the book category and member tier that pick
+        the loan's fine rate.
+
+        Walks the (status, due_at) index in `(due_at, id)` order, starting
+        past the `after` key so callers can page through it.
+        """
+        qs = Loan.objects.filter(status=Loan.Status.ACTIVE, due_at__lt=as_of)
+        if after is not None:
+            due_at, pk = after
+            qs = qs.filter(Q(due_at__gt=due_at) | Q(due_at=due_at, id__gt=pk))
+        if lock:
+            qs = qs.select_for_update(of=("self",))
+        return list(
+            qs.order_by("due_at", "id").values_list(
+                "id", "member_id", "due_at", "book_copy__book__category", "member__tier"
+            )[:limit]
+        )
@@ -0,0 +1,12 @@
+from library.models.borrow_models import Member
+from library.repositories import identity_map
+
+
+class MemberRepository:
+    def get_for_user(self, user):
+        def loader():
+            member = Member.objects.get(user=user)
+            member.user = user
+            return member
+
+        return identity_map.load(("member:user", user.id), loader)
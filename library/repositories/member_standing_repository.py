@@ -0,0 +1,98 @@
+from decimal import Decimal
+
+from django.db.models import Case, Count, DecimalField, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+from library.models.borrow_models import Loan, Member, MemberStanding
+
+_MONEY = DecimalField(max_digits=8, decimal_places=2)
+
+
+class MemberStandingRepository:
+    def get_for_member(self, member):
+        """The member's standing, cached on the instance; built on first use."""
+        try:
+            return member.standing
+        except MemberStanding.DoesNotExist:
+            self.recompute([member.id])
+            member.standing = MemberStanding.objects.get(member_id=member.id)
+            return member.standing
+
+    def adjust(self, member_id, *, loans=0, fines=0):
+        return self.adjust_bulk({member_id: (loans, fines)})
+
+    def adjust_bulk(self, deltas):
+        """Apply `{member_id: (loan_delta, fine_delta)}` in a single UPDATE."""
+        if not deltas:
+            return 0
+
+        loan_delta = Case(
+            *[When(member_id=m, then=Value(d[0])) for m, d in deltas.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        fine_delta = Case(
+            *[When(member_id=m, then=Value(Decimal(str(d[1])))) for m, d in deltas.items()],
+            default=Value(Decimal("0")),
+            output_field=_MONEY,
+        )
+        updated = MemberStanding.objects.filter(member_id__in=deltas).update(
+            active_loan_count=Greatest(
+                F("active_loan_count") + loan_delta, Value(0)
+            ),
+            unpaid_fine_total=Greatest(
+                F("unpaid_fine_total") + fine_delta,
+                Value(Decimal("0")),
+                output_field=_MONEY,
+            ),
+        )
+
+        # Members without a row yet get one counted from their loans, which
+        # already include this change.
+        if updated < len(deltas):
+            existing = MemberStanding.objects.filter(
+                member_id__in=deltas
+            ).values_list("member_id", flat=True)
+            self.recompute(set(deltas) - set(existing))
+
+        return updated
+
+    def recompute(self, member_ids, dry_run=False):
+        """Recount standings from loans and fines; returns the ones that drifted."""
+        members = Member.objects.filter(id__in=member_ids).annotate(
+            actual_loans=Count(
+                "loan", filter=Q(loan__status=Loan.Status.ACTIVE), distinct=True
+            ),
+            actual_fines=Coalesce(
+                Sum("loan__fine__amount", filter=Q(loan__fine__is_paid=False)),
+                Value(Decimal("0")),
+                output_field=_MONEY,
+            ),
+        )
+        standings = MemberStanding.objects.in_bulk(member_ids)
+
+        drifted, missing = [], []
+        for member in members:
+            standing = standings.get(member.id)
+            if standing is None:
+                standing = MemberStanding(member_id=member.id)
+                missing.append(standing)
+            elif (
+                standing.active_loan_count == member.actual_loans
+                and standing.unpaid_fine_total == member.actual_fines
+            ):
+                continue
+
+            standing.active_loan_count = member.actual_loans
+            standing.unpaid_fine_total = member.actual_fines
+            drifted.append(standing)
+
+        if drifted and not dry_run:
+            created = {standing.member_id for standing in missing}
+            MemberStanding.objects.bulk_create(missing)
+            MemberStanding.objects.bulk_update(
+                [s for s in drifted if s.member_id not in created],
+                ["active_loan_count", "unpaid_fine_total"],
+            )
+
+        return drifted
@@ -1,11 +1,173 @@
+from django.db.models import Count, Exists, F, IntegerField, Max, OuterRef, Q, Subquery, Window
+from django.db.models.functions import Coalesce, RowNumber
+from django.utils import timezone
+
+from library.models.book_models import Book, BookCopy
 from library.models.borrow_models import Reservation
+from library.repositories import identity_map
 
 
 class ReservationRepository:
+    """
+    Reservations form a queue per book, ordered by `queue_position`.
+
+    An ACTIVE reservation is either waiting for a copy or, once a returned
+    copy is held for it, has a `pickup_deadline`. Queue lookups are seeks
+    on the (book, status, queue_position) index. Reservations past their
+    `expires_at` stop counting as waiting straight away, even before the
+    sweeper marks them EXPIRED.
+    """
+
+    def _waiting(self):
+        return Reservation.objects.filter(
+            status=Reservation.Status.ACTIVE,
+            pickup_deadline__isnull=True,
+            expires_at__gt=timezone.now(),
+        )
+
     def first_unfulfilled_for_book(self, book):
-        return (
+        """The next reservation waiting for a copy of `book`, or None."""
+        return identity_map.load(
+            ("reservation:first_unfulfilled", book.id),
+            lambda: self._waiting().filter(book=book).order_by("queue_position").first(),
+        )
+
+    def forget_first_unfulfilled(self, book_id):
+        identity_map.forget(("reservation:first_unfulfilled", book_id))
+
+    def first_unfulfilled_for_books(self, books):
+        """Next waiting reservation per book in one query; {book_id: reservation}."""
+        return {
+            book_id: reservations[0]
+            for book_id, reservations in self.waiting_for_books(
+                {book.id: 1 for book in books}
+            ).items()
+        }
+
+    def waiting_for_books(self, counts):
+        """
+        The first `counts[book_id]` waiting reservations of each book, in
+        queue order, from one windowed query; {book_id: [reservation, ...]}.
+        """
+        if not counts:
+            return {}
+
+        rows = (
+            self._waiting()
+            .filter(book_id__in=counts)
+            .annotate(slot=Window(
+                RowNumber(),
+                partition_by=F("book_id"),
+                order_by=F("queue_position").asc(),
+            ))
+            .filter(slot__lte=max(counts.values()))
+            .order_by("book_id", "queue_position")
+        )
+        waiting = {}
+        for reservation in rows:
+            queue = waiting.setdefault(reservation.book_id, [])
+            if len(queue) < counts[reservation.book_id]:
+                queue.append(reservation)
+        return waiting
+
+    def active_for_member(self, member, book):
+        return identity_map.load(
+            ("reservation:active", member.id, book.id),
+            lambda: Reservation.objects.filter(
+                member=member, book=book, status=Reservation.Status.ACTIVE
+            ).first(),
+        )
+
+    def forget_active_for_member(self, member_id, book_id):
+        identity_map.forget(("reservation:active", member_id, book_id))
+
+    def active_for_member_books(self, member, books):
+        """The member's ACTIVE reservation per book; {book_id: reservation}."""
+        return {
+            reservation.book_id: reservation
+            for reservation in Reservation.objects.filter(
+                member=member, book__in=books, status=Reservation.Status.ACTIVE
+            )
+        }
+
+    def reservation_state_for_books(self, member, book_ids):
+        """
+        Active books annotated with what reserving them for `member` depends
+        on, from a single query; {book_id: book}.
+
+        Each book carries `on_loan_to_member`, `has_available_copy`,
+        `member_reservation_id` and `member_reservation_status` (the
+        member's reservation row in any status, or None), `last_position`
+        (highest ticket ever issued, 0 if none) and `waiting_count`
+        (reservations still waiting in its queue).
+        """
+        member_reservation = Reservation.objects.filter(
+            book=OuterRef("pk"), member=member
+        )
+        queue = (
             Reservation.objects
-            .filter(book=book, fulfilled=False)
-            .order_by("reserved_at")
-            .first()
+            .filter(book=OuterRef("pk"))
+            .order_by()
+            .values("book")
         )
+        books = Book.objects.filter(id__in=book_ids, is_deleted=False).annotate(
+            on_loan_to_member=Exists(BookCopy.objects.filter(
+                book=OuterRef("pk"),
+                loan__member=member,
+                loan__returned_at__isnull=True,
+            )),
+            has_available_copy=Exists(BookCopy.objects.filter(
+                book=OuterRef("pk"), status=BookCopy.Status.AVAILABLE
+            )),
+            member_reservation_id=Subquery(member_reservation.values("id")[:1]),
+            member_reservation_status=Subquery(member_reservation.values("status")[:1]),
+            last_position=Coalesce(
+                Subquery(queue.annotate(last=Max("queue_position")).values("last")),
+                0,
+                output_field=IntegerField(),
+            ),
+            waiting_count=Coalesce(
+                Subquery(
+                    self._waiting().filter(book=OuterRef("pk"))
+                    .order_by().values("book")
+                    .annotate(count=Count("id")).values("count")
+                ),
+                0,
+                output_field=IntegerField(),
+            ),
+        )
+        return {book.id: book for book in books}
+
+    def lapsed(self, cutoff, *, after=None, limit):
+        """
+        ACTIVE reservations that expired by `cutoff`, oldest first.
+
+        Walks the (status, expires_at) index in `(expires_at, id)` order,
+        starting past the `after` key so callers can page through it.
+        """
+        qs = Reservation.objects.filter(
+            status=Reservation.Status.ACTIVE, expires_at__lte=cutoff
+        )
+        if after is not None:
+            expires_at, pk = after
+            qs = qs.filter(
+                Q(expires_at__gt=expires_at) | Q(expires_at=expires_at, id__gt=pk)
+            )
+        return list(qs.order_by("expires_at", "id")[:limit])
+
+    def queue_position(self, reservation):
+        """
+        1-based place of a waiting reservation in its book's queue, counted
+        the way copies are handed off. None once a copy is held for it or it
+        has lapsed.
+        """
+        if (
+            reservation.status != Reservation.Status.ACTIVE
+            or reservation.pickup_deadline is not None
+            or reservation.expires_at <= timezone.now()
+        ):
+            return None
+        return self._waiting().filter(
+            book_id=reservation.book_id,
+            queue_position__lt=reservation.queue_position,
+        ).count() + 1
@@ -1,6 +1,47 @@
 from rest_framework import serializers
 from library.models.book_models import Book, BookCopy
 
+class SparseFieldsetSerializerMixin:
+    """Drops every field not listed in the `fields` serializer context."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.context.get("fields")
+        if requested is not None:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+
+class IdListField(serializers.CharField):
+    """
+    Comma-separated integer ids such as `1,2,3`, deduplicated in order and
+    capped at `max_ids`.
+    """
+
+    default_error_messages = {
+        "not_ids": "Must be a comma-separated list of integers",
+        "blank": "This parameter is required",
+        "no_ids": "This parameter is required",
+        "too_many_ids": "At most {max_ids} ids per request",
+    }
+
+    def __init__(self, *, max_ids=200, **kwargs):
+        self.max_ids = max_ids
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        value = super().to_internal_value(data)
+        try:
+            ids = [int(part) for part in value.split(",") if part.strip()]
+        except ValueError:
+            self.fail("not_ids")
+
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            self.fail("no_ids")
+        if len(ids) > self.max_ids:
+            self.fail("too_many_ids", max_ids=self.max_ids)
+        return ids
+
 class BookCopyInputSerializer(serializers.Serializer):
     barcode = serializers.CharField(max_length=50)
     shelf_location = serializers.CharField(max_length=50)
@@ -32,7 +73,7 @@ class BookCopyDetailSerializer(serializers.ModelSerializer):
         model = BookCopy
         fields = ["id", "barcode", "status", "shelf_location"]
 
-class LibrarianBookDetailSerializer(serializers.ModelSerializer):
+class LibrarianBookDetailSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     authors = serializers.StringRelatedField(many=True)
     copies = BookCopyDetailSerializer(many=True)
 
@@ -49,7 +90,7 @@ class LibrarianBookDetailSerializer(serializers.ModelSerializer):
             "copies",
         ]
 
-class MemberBookDetailSerializer(serializers.ModelSerializer):
+class MemberBookDetailSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     authors = serializers.StringRelatedField(many=True)
 
     class Meta:
@@ -63,7 +104,7 @@ class MemberBookDetailSerializer(serializers.ModelSerializer):
             "published_year",
         ]
 
-class AvailableBookSerializer(serializers.ModelSerializer):
+class AvailableBookSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     authors = serializers.StringRelatedField(many=True)
     available_copies = serializers.IntegerField()
 
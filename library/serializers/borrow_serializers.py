@@ -1,20 +1,65 @@
 from rest_framework import serializers
-from library.models.book_models import Book
-from library.models.borrow_models import Loan
+from library.serializers.book_serializers import IdListField
+from library.repositories.book_repository import BookRepository
+from library.repositories.fine_repository import FineRepository
+from library.repositories.loan_repository import LoanRepository
 
 
 class BorrowBookSerializer(serializers.Serializer):
     book_id = serializers.IntegerField()
 
     def validate_book_id(self, value):
-        if not Book.objects.filter(id=value, is_deleted=False).exists():
+        if BookRepository().get_active(value) is None:
             raise serializers.ValidationError("Book not found")
         return value
-    
+
+class BookIdsSerializer(serializers.Serializer):
+    """A list of distinct book ids, at most `max_length` of them."""
+
+    max_length = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["book_ids"] = serializers.ListField(
+            child=serializers.IntegerField(),
+            allow_empty=False,
+            max_length=self.max_length,
+        )
+
+    def validate_book_ids(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("Duplicate book ids")
+        return value
+
+class BorrowBooksSerializer(BookIdsSerializer):
+    max_length = 20
+
+class ReserveBooksSerializer(BookIdsSerializer):
+    max_length = 50
+
+class BorrowEligibilitySerializer(serializers.Serializer):
+    ids = IdListField(max_ids=200)
+
 class ReturnBookSerializer(serializers.Serializer):
     loan_id = serializers.IntegerField()
 
     def validate_loan_id(self, value):
-        if not Loan.objects.filter(id=value).exists():
+        if LoanRepository().get(value) is None:
             raise serializers.ValidationError("Loan not found")
         return value
+
+class RenewLoanSerializer(serializers.Serializer):
+    loan_id = serializers.IntegerField()
+
+class ReturnCopiesSerializer(serializers.Serializer):
+    barcodes = serializers.ListField(
+        child=serializers.CharField(max_length=50), allow_empty=False, max_length=500
+    )
+
+class PayFineSerializer(serializers.Serializer):
+    fine_id = serializers.IntegerField()
+
+    def validate_fine_id(self, value):
+        if FineRepository().get(value) is None:
+            raise serializers.ValidationError("Fine not found")
+        return value
@@ -1,5 +1,8 @@
 from library.models.book_models import Book, Author, BookCopy
 from django.db import transaction
+from library.services.book_search import index_book
+from library.services.catalog_cache import invalidate_catalog
+from library.services.catalog_index import refresh_catalog_indexes
 
 
 @transaction.atomic
@@ -19,6 +22,7 @@ def create_book_with_copies(
         category=category,
         description=description,
         published_year=published_year,
+        available_copies=len(copies),
     )
 
     author_objects = []
@@ -27,6 +31,7 @@ def create_book_with_copies(
         author_objects.append(author)
 
     book.authors.set(author_objects)
+    index_book(book)
 
     BookCopy.objects.bulk_create([
         BookCopy(
@@ -37,4 +42,7 @@ def create_book_with_copies(
         for copy in copies
     ])
 
+    invalidate_catalog()
+    refresh_catalog_indexes(book.id)
+
     return book
\ No newline at end of file
@@ -1,26 +1,111 @@
-from django.db.models import Count, Q
-from library.models.book_models import Book, BookCopy
+from datetime import datetime
+
+from django.db.models import Count, F, IntegerField, Max
+from django.db.models.expressions import ExpressionWrapper
+
+from library.models.book_models import Book
+from library.services.book_search import get_book_search
 
 def base_active_books():
     return Book.objects.filter(is_deleted=False)
 
-def get_available_books(*, title=None, author=None, ordering="title"):
-    qs = (
-        base_active_books()
-        .annotate(
-            available_copies=Count(
-                "copies",
-                filter=Q(copies__status=BookCopy.Status.AVAILABLE)
-            )
-        )
-        .filter(available_copies__gt=0)
-        .distinct()
+def filter_available_books(
+    *, query=None, title=None, author=None, category=None, decade=None
+):
+    qs = base_active_books().filter(available_copies__gt=0)
+
+    if category:
+        qs = qs.filter(category=category)
+
+    if decade is not None:
+        qs = qs.filter(published_year__gte=decade, published_year__lt=decade + 10)
+
+    return get_book_search().filter(qs, query=query, title=title, author=author)
+
+def get_available_books(*, ordering=None, **filters):
+    qs = filter_available_books(**filters)
+
+    if ordering is None:
+        ranked = filters.get("query") and get_book_search().ranked
+        ordering = "search_rank" if ranked else "title"
+
+    tie_breaker = "-id" if ordering.startswith("-") else "id"
+    return qs.order_by(ordering, tie_breaker)
+
+def get_available_book_facets(*, top_authors=10, **filters):
+    """
+    Category, published decade and top author counts for a list filter.
+
+    Categories and decades come out of a single GROUP BY over both columns
+    and are rolled up here; authors need the M2M join and take a second one.
+    """
+    qs = filter_available_books(**filters).order_by()
+
+    decade = ExpressionWrapper(
+        F("published_year") / 10 * 10, output_field=IntegerField()
+    )
+    categories, decades = {}, {}
+    grouped = (
+        qs.values("category", decade=decade)
+        .annotate(count=Count("id", distinct=True))
+    )
+    for row in grouped:
+        categories[row["category"]] = categories.get(row["category"], 0) + row["count"]
+        decades[row["decade"]] = decades.get(row["decade"], 0) + row["count"]
+
+    authors = (
+        qs.filter(authors__isnull=False)
+        .values("authors__id", "authors__name")
+        .annotate(count=Count("id", distinct=True))
+        .order_by("-count", "authors__name")[:top_authors]
     )
 
-    if title:
-        qs = qs.filter(title__icontains=title)
+    return {
+        "categories": [
+            {"value": value, "count": count}
+            for value, count in sorted(categories.items(), key=lambda i: (-i[1], i[0]))
+        ],
+        "published_decades": [
+            {"value": value, "count": count}
+            for value, count in sorted(decades.items())
+        ],
+        "authors": [
+            {
+                "id": row["authors__id"],
+                "name": row["authors__name"],
+                "count": row["count"],
+            }
+            for row in authors
+        ],
+    }
 
-    if author:
-        qs = qs.filter(authors__name__icontains=author)
+def get_book_last_modified(book_id, *, include_copies=False, active_only=False):
+    """
+    Cheap change marker for a book detail, without loading the object graph.
 
-    return qs.order_by(ordering)
+    Returns `(last_modified, fingerprint)` or None when the book is not
+    visible. Copy edits and removals also save the book, but copy status
+    changes only touch the copy, hence the optional aggregate over copies.
+    """
+    qs = Book.objects.filter(id=book_id)
+    if active_only:
+        qs = qs.filter(is_deleted=False)
+
+    fields = ["updated_at"]
+    if include_copies:
+        qs = qs.annotate(
+            copies_updated_at=Max("copies__updated_at"),
+            copies_count=Count("copies"),
+        )
+        fields += ["copies_updated_at", "copies_count"]
+
+    row = qs.values_list(*fields).first()
+    if row is None:
+        return None
+
+    last_modified = max(value for value in row[:2] if isinstance(value, datetime))
+    fingerprint = ":".join(
+        value.isoformat() if isinstance(value, datetime) else str(value)
+        for value in row
+    )
+    return last_modified, fingerprint
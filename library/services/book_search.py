@@ -0,0 +1,145 @@
+import re
+from functools import lru_cache
+
+from django.db import connection
+from django.db.models import F, Q
+
+from library.models.book_models import Book
+from library.models.search_models import BookSearchDocument
+
+MAX_QUERY_TERMS = 8
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_expression(*, query=None, title=None, author=None):
+    """
+    Translate user input into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term, so "dja bas" matches
+    "Django Basics" and FTS5 operators in the input are never interpreted.
+    """
+    clauses = []
+    for column, text in ((None, query), ("title", title), ("authors", author)):
+        terms = _TOKEN_RE.findall((text or "").lower())[:MAX_QUERY_TERMS]
+        if not terms:
+            continue
+        expression = " AND ".join(f'"{term}"*' for term in terms)
+        if column:
+            expression = f"{column} : ({expression})"
+        clauses.append(f"({expression})")
+
+    return " AND ".join(clauses) or None
+
+
+class FullTextBookSearch:
+    """Ranked, prefix-aware search over the FTS5 `library_book_fts` table."""
+
+    table = BookSearchDocument._meta.db_table
+    ranked = True
+
+    def filter(self, qs, *, query=None, title=None, author=None):
+        expression = build_match_expression(
+            query=query, title=title, author=author
+        )
+        if expression is None:
+            return qs
+
+        return qs.filter(
+            search_document__document__match=expression
+        ).annotate(search_rank=F("search_document__rank"))
+
+    def index_books(self, books):
+        books = list(books)
+        if not books:
+            return
+
+        rows = [
+            (
+                book.id,
+                book.title,
+                ", ".join(author.name for author in book.authors.all()),
+            )
+            for book in books
+        ]
+        with connection.cursor() as cursor:
+            self._delete(cursor, [book.id for book in books])
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, title, authors) "
+                "VALUES (%s, %s, %s)",
+                rows,
+            )
+
+    def remove_books(self, book_ids):
+        book_ids = list(book_ids)
+        if not book_ids:
+            return
+
+        with connection.cursor() as cursor:
+            self._delete(cursor, book_ids)
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+
+    def _delete(self, cursor, book_ids):
+        placeholders = ", ".join(["%s"] * len(book_ids))
+        cursor.execute(
+            f"DELETE FROM {self.table} WHERE rowid IN ({placeholders})",
+            book_ids,
+        )
+
+
+class ContainsBookSearch:
+    """Fallback for backends without FTS5: unranked `icontains` filters."""
+
+    ranked = False
+
+    def filter(self, qs, *, query=None, title=None, author=None):
+        if query:
+            qs = qs.filter(
+                Q(title__icontains=query) | Q(authors__name__icontains=query)
+            )
+
+        if title:
+            qs = qs.filter(title__icontains=title)
+
+        if author:
+            qs = qs.filter(authors__name__icontains=author)
+
+        if query or author:
+            qs = qs.distinct()
+
+        return qs
+
+    def index_books(self, books):
+        pass
+
+    def remove_books(self, book_ids):
+        pass
+
+    def clear(self):
+        pass
+
+
+@lru_cache(maxsize=None)
+def _fts_table_exists(alias):
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+    return BookSearchDocument._meta.db_table in tables
+
+
+def get_book_search():
+    if connection.vendor == "sqlite" and _fts_table_exists(connection.alias):
+        return FullTextBookSearch()
+    return ContainsBookSearch()
+
+
+def index_book(book):
+    get_book_search().index_books(
+        Book.objects.filter(id=book.id).prefetch_related("authors")
+    )
+
+
+def remove_book_from_index(book):
+    get_book_search().remove_books([book.id])
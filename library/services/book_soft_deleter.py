@@ -2,6 +2,9 @@ import logging
 from django.utils.timezone import now
 from rest_framework.exceptions import ValidationError
 from library.models.book_models import Book, BookCopy
+from library.services.book_search import remove_book_from_index
+from library.services.catalog_cache import invalidate_catalog
+from library.services.catalog_index import refresh_catalog_indexes
 
 logger = logging.getLogger("domain")
 
@@ -26,4 +29,9 @@ def soft_delete_book(*, book: Book):
 
     book.is_deleted = True
     book.deleted_at = now()
+    book.available_copies = 0
     book.save()
+
+    remove_book_from_index(book)
+    invalidate_catalog([book.id])
+    refresh_catalog_indexes(book.id)
@@ -2,6 +2,10 @@ import logging
 from django.db import transaction
 from rest_framework.exceptions import ValidationError
 from library.models.book_models import Book, Author, BookCopy
+from library.repositories.book_repository import BookRepository
+from library.services.book_search import index_book
+from library.services.catalog_cache import invalidate_catalog
+from library.services.catalog_index import refresh_catalog_indexes
 
 
 @transaction.atomic
@@ -28,6 +32,7 @@ def update_book_with_copies(*, book: Book, data: dict):
             authors.append(author)
 
     book.authors.set(authors)
+    index_book(book)
 
     incoming = data.get("copies", [])
     if incoming is None:
@@ -90,4 +95,8 @@ def update_book_with_copies(*, book: Book, data: dict):
 
     BookCopy.objects.bulk_create(to_create)
 
+    BookRepository().recount_available_copies([book.id])
+    invalidate_catalog([book.id])
+    refresh_catalog_indexes(book.id)
+
     return book
@@ -1,5 +1,5 @@
 import logging
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.db.models import Q
 from datetime import timedelta
 from django.utils import timezone
@@ -8,10 +8,12 @@ from django.conf import settings
 from library.models.book_models import BookCopy
 from library.models.borrow_models import Loan, Reservation
 from library.logging import ServiceLogger
+from library.services.catalog_cache import invalidate_catalog
+from library.services.loan_policy import loan_policies
 
+from library.repositories.book_repository import BookRepository
 from library.repositories.book_copy_repository import BookCopyRepository
-from library.repositories.loan_repository import LoanRepository
-from library.repositories.fine_repository import FineRepository
+from library.repositories.member_standing_repository import MemberStandingRepository
 from library.repositories.reservation_repository import ReservationRepository
 
 from library.services.specifications.member_specifications import (
@@ -30,15 +32,15 @@ logger = ServiceLogger("borrowing")
 
 @transaction.atomic
 def borrow_book(member, book):
+    book_repo = BookRepository()
     book_copy_repo = BookCopyRepository()
-    loan_repo = LoanRepository()
-    fine_repo = FineRepository()
+    standing_repo = MemberStandingRepository()
     reservation_repo = ReservationRepository()
 
     specs = [
         MemberIsActive(),
-        MemberHasNoUnpaidFines(fine_repo),
-        MemberBelowBorrowLimit(loan_repo),
+        MemberHasNoUnpaidFines(standing_repo),
+        MemberBelowBorrowLimit(standing_repo),
         BookNotReservedByAnother(reservation_repo),
     ]
 
@@ -53,7 +55,22 @@ def borrow_book(member, book):
             )
             raise BorrowingError(error_msg)
 
-    copy = book_copy_repo.find_available_for_book(book)
+    # A copy already on hold for the member is taken ahead of the shelf.
+    own_reservation = reservation_repo.active_for_member(member, book)
+    copy = None
+    if own_reservation is not None and own_reservation.pickup_deadline is not None:
+        copy = book_copy_repo.claim_held_for(own_reservation)
+
+    from_shelf = copy is None
+    optimistic = getattr(settings, "LIBRARY_BORROW_STRATEGY", "optimistic") == "optimistic"
+    if from_shelf and optimistic:
+        # Already BORROWED when returned: the claim is the status UPDATE.
+        copy = book_copy_repo.claim_available_for_book(
+            book, attempts=getattr(settings, "LIBRARY_BORROW_CLAIM_ATTEMPTS", 3)
+        )
+    elif from_shelf:
+        copy = book_copy_repo.find_available_for_book(book)
+
     if not copy:
         logger.operation_failed(
             "borrow",
@@ -63,21 +80,39 @@ def borrow_book(member, book):
         )
         raise BorrowingError("No available copies")
 
-    loan_days = getattr(settings, "LIBRARY_LOAN_DAYS", 14)
-    loan = Loan.objects.create(
-        member=member,
-        book_copy=copy,
-        due_at=timezone.now() + timedelta(days=loan_days)
-    )
+    loan_days = loan_policies.loan_days(book.category, member.tier)
+    try:
+        with transaction.atomic():
+            loan = Loan.objects.create(
+                member=member,
+                book_copy=copy,
+                due_at=timezone.now() + timedelta(days=loan_days)
+            )
+    except IntegrityError:
+        # Another borrower won the copy between allocation and insert.
+        logger.operation_failed(
+            "borrow",
+            reason="copy_already_on_loan",
+            book_id=getattr(book, "id", None),
+            member_id=getattr(member, "id", None),
+        )
+        raise BorrowingError("No available copies")
+
+    if from_shelf:
+        if not optimistic:
+            copy.status = BookCopy.Status.BORROWED
+            copy.save()
+        book_repo.adjust_available_copies(book.id, -1)
+    standing_repo.adjust(member.id, loans=1)
 
-    copy.status = BookCopy.Status.BORROWED
-    copy.save()
+    if own_reservation is not None:
+        own_reservation.fulfilled = True
+        own_reservation.status = Reservation.Status.FULFILLED
+        own_reservation.save(update_fields=["fulfilled", "status"])
+        reservation_repo.forget_first_unfulfilled(book.id)
+        reservation_repo.forget_active_for_member(member.id, book.id)
 
-    first_reservation = reservation_repo.first_unfulfilled_for_book(book)
-    if first_reservation:
-        first_reservation.fulfilled = True
-        first_reservation.status = Reservation.Status.FULFILLED
-        first_reservation.save()
+    invalidate_catalog([book.id])
 
     logger.operation_succeeded(
         "borrow",
@@ -86,4 +121,172 @@ def borrow_book(member, book):
         member_id=member.id,
     )
 
-    return loan
\ No newline at end of file
+    return loan
+
+@transaction.atomic
+def borrow_books(member, books):
+    """
+    Borrow several books for `member` in one transaction.
+
+    Member rules are checked once for the whole cart and raise
+    BorrowingError; per-book rules only reject that book. Shelf copies are
+    claimed according to LIBRARY_BORROW_STRATEGY, like `borrow_book`.
+    Returns one
+    `{"book": book, "loan": loan}` or `{"book": book, "error": message}`
+    per book, in input order.
+    """
+    book_repo = BookRepository()
+    book_copy_repo = BookCopyRepository()
+    standing_repo = MemberStandingRepository()
+    reservation_repo = ReservationRepository()
+
+    for spec in [MemberIsActive(), MemberHasNoUnpaidFines(standing_repo)]:
+        if not spec.is_satisfied_by(member):
+            logger.business_rule_rejected(
+                spec.error_message,
+                book_ids=[book.id for book in books],
+                member_id=member.id,
+            )
+            raise BorrowingError(spec.error_message)
+
+    limit_spec = MemberBelowBorrowLimit(standing_repo)
+    reserved_spec = BookNotReservedByAnother(reservation_repo)
+    remaining = limit_spec.remaining(member)
+    own_reservations = reservation_repo.active_for_member_books(member, books)
+    reserved_by_others = reserved_spec.unsatisfied_book_ids(
+        member, books, own=own_reservations
+    )
+
+    errors, eligible = {}, []
+    for book in books:
+        if book.id in reserved_by_others:
+            errors[book.id] = reserved_spec.error_message
+        elif len(eligible) >= remaining:
+            errors[book.id] = limit_spec.error_message
+        else:
+            eligible.append(book)
+
+    copies = {}
+    for book in eligible:
+        own = own_reservations.get(book.id)
+        if own is not None and own.pickup_deadline is not None:
+            copy = book_copy_repo.claim_held_for(own)
+            if copy is not None:
+                copies[book.id] = copy
+    held_book_ids = set(copies)
+
+    shelf_books = [book for book in eligible if book.id not in held_book_ids]
+    optimistic = getattr(settings, "LIBRARY_BORROW_STRATEGY", "optimistic") == "optimistic"
+    if optimistic:
+        copies.update(book_copy_repo.claim_available_for_books(
+            shelf_books,
+            attempts=getattr(settings, "LIBRARY_BORROW_CLAIM_ATTEMPTS", 3),
+        ))
+    else:
+        for book in shelf_books:
+            copy = book_copy_repo.find_available_for_book(book)
+            if copy is not None:
+                copies[book.id] = copy
+
+    borrowed_at = timezone.now()
+    loans = {}
+    for book in eligible:
+        if book.id in copies:
+            loan_days = loan_policies.loan_days(book.category, member.tier)
+            loans[book.id] = Loan(
+                member=member,
+                book_copy=copies[book.id],
+                due_at=borrowed_at + timedelta(days=loan_days),
+            )
+        else:
+            errors[book.id] = "No available copies"
+
+    try:
+        with transaction.atomic():
+            Loan.objects.bulk_create(loans.values())
+    except IntegrityError:
+        logger.operation_failed(
+            "borrow_batch",
+            reason="copy_already_on_loan",
+            book_ids=list(loans),
+            member_id=member.id,
+        )
+        raise BorrowingError("No available copies")
+
+    shelf_copies = [
+        copies[book_id] for book_id in loans if book_id not in held_book_ids
+    ]
+    if shelf_copies and not optimistic:
+        for copy in shelf_copies:
+            copy.status = BookCopy.Status.BORROWED
+            copy.updated_at = borrowed_at
+        BookCopy.objects.bulk_update(shelf_copies, ["status", "updated_at"])
+    book_repo.adjust_available_copies_bulk(
+        {copy.book_id: -1 for copy in shelf_copies}
+    )
+    if loans:
+        standing_repo.adjust(member.id, loans=len(loans))
+
+    fulfilled = [
+        own_reservations[book_id].id
+        for book_id in loans if book_id in own_reservations
+    ]
+    if fulfilled:
+        Reservation.objects.filter(id__in=fulfilled).update(
+            fulfilled=True, status=Reservation.Status.FULFILLED
+        )
+
+    if loans:
+        invalidate_catalog(loans)
+        logger.operation_succeeded(
+            "borrow_batch",
+            loan_ids=[loan.id for loan in loans.values()],
+            book_ids=list(loans),
+            member_id=member.id,
+        )
+
+    return [
+        {"book": book, "loan": loans[book.id]} if book.id in loans
+        else {"book": book, "error": errors[book.id]}
+        for book in books
+    ]
+
+
+def check_borrow_eligibility(member, books):
+    """
+    Whether `member` could borrow each of `books` right now, without
+    borrowing anything.
+
+    Member rules are evaluated once and the reservation rule for all books
+    with two queries. Returns `{book_id: error_message or None}`, using the
+    same messages `borrow_book` would raise.
+    """
+    standing_repo = MemberStandingRepository()
+    member_specs = [
+        MemberIsActive(),
+        MemberHasNoUnpaidFines(standing_repo),
+        MemberBelowBorrowLimit(standing_repo),
+    ]
+    reservation_repo = ReservationRepository()
+    reserved_spec = BookNotReservedByAnother(reservation_repo)
+
+    member_error = next(
+        (spec.error_message for spec in member_specs if not spec.is_satisfied_by(member)),
+        None,
+    )
+    if member_error:
+        return {book.id: member_error for book in books}
+
+    own = reservation_repo.active_for_member_books(member, books)
+    reserved_by_others = reserved_spec.unsatisfied_book_ids(member, books, own=own)
+
+    verdicts = {}
+    for book in books:
+        on_hold = book.id in own and own[book.id].pickup_deadline is not None
+        if book.id in reserved_by_others:
+            verdicts[book.id] = reserved_spec.error_message
+        elif book.available_copies <= 0 and not on_hold:
+            verdicts[book.id] = "No available copies"
+        else:
+            verdicts[book.id] = None
+    return verdicts
@@ -0,0 +1,79 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import urlencode
+
+from library.services.shared_version import SharedVersion, bump_shared_versions
+
+GLOBAL_VERSION_KEY = "catalog:version"
+BOOK_VERSION_KEY = "catalog:book:{book_id}:version"
+
+
+# Per-process views of the shared counters, one per key seen so far.
+_versions = {}
+
+
+def _shared(key):
+    version = _versions.get(key)
+    if version is None:
+        version = _versions.setdefault(key, SharedVersion(key))
+    return version
+
+
+def get_version(key):
+    return _shared(key).get()
+
+
+def forget_versions():
+    """Drop the local views so every counter is read again."""
+    _versions.clear()
+
+
+def _bump_versions(keys):
+    bump_shared_versions(keys)
+    for key in keys:
+        _shared(key).expire()
+
+
+def invalidate_catalog(book_ids=()):
+    """
+    Invalidate cached catalog responses for `book_ids` and every list.
+
+    The counters live in the database and are bumped once the change
+    commits, so a response cached from pre-commit data keeps the old
+    version in its key. This process sees the bump at once; other
+    workers within `LIBRARY_SHARED_VERSION_TTL` seconds.
+    """
+    keys = [
+        BOOK_VERSION_KEY.format(book_id=book_id)
+        for book_id in dict.fromkeys(book_ids)
+    ]
+    keys.append(GLOBAL_VERSION_KEY)
+    transaction.on_commit(lambda: _bump_versions(keys))
+
+
+def response_cache_key(scope, request, book_id=None):
+    params = urlencode(sorted(
+        (key, sorted(values)) for key, values in request.query_params.lists()
+    ), doseq=True)
+    digest = hashlib.sha256(
+        f"{request.get_host()}?{params}".encode()
+    ).hexdigest()
+
+    if book_id is None:
+        version = get_version(GLOBAL_VERSION_KEY)
+        return f"catalog:{scope}:v{version}:{digest}"
+
+    version = get_version(BOOK_VERSION_KEY.format(book_id=book_id))
+    return f"catalog:{scope}:{book_id}:v{version}:{digest}"
+
+
+def get_cached_response_data(key):
+    return cache.get(key)
+
+
+def cache_response_data(key, data):
+    timeout = getattr(settings, "LIBRARY_CATALOG_CACHE_TIMEOUT", 300)
+    cache.set(key, data, timeout=timeout)
@@ -0,0 +1,319 @@
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+
+from django.db import transaction
+
+from library.models.book_models import Book
+from library.services.shared_version import SharedVersion
+
+_NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize(text):
+    """Lowercase, strip accents and collapse punctuation to single spaces."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_WORD_RE.sub(" ", stripped.lower()).strip()
+
+
+class CatalogIndex:
+    """
+    Base for in-process indexes over active book titles and author names.
+
+    Every process keeps its own copy. Writers apply their change locally
+    after commit and bump a shared version counter in the database;
+    readers in other processes re-read the counter at most once per
+    LIBRARY_SHARED_VERSION_TTL, see a version they do not hold and
+    rebuild on their next lookup.
+    """
+
+    version_key = None
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.version = SharedVersion(self.version_key)
+        self._version = None
+        self._reset()
+
+    def _reset(self):
+        self.titles = {}
+        self.authors = {}
+        self.author_books = {}
+        self.book_authors = {}
+
+    # -- hooks for subclasses ---------------------------------------------
+
+    def _clear_entries(self):
+        raise NotImplementedError
+
+    def _add_entry(self, kind, target_id, text):
+        raise NotImplementedError
+
+    def _remove_entry(self, kind, target_id, text):
+        raise NotImplementedError
+
+    # -- lifecycle --------------------------------------------------------
+
+    def forget(self):
+        """Drop the local copy; the next lookup rebuilds."""
+        self._version = None
+        self.version.expire()
+
+    def ensure_fresh(self):
+        current = self.version.get()
+        if self._version != current:
+            with self._lock:
+                if self._version != current:
+                    self.rebuild(version=current)
+
+    def _finish_rebuild(self):
+        """Called once every entry of a full rebuild has been added."""
+
+    def rebuild(self, version=None):
+        with self._lock:
+            if version is None:
+                # Read before the rows, so a change made meanwhile leaves
+                # the copy behind the counter rather than marked current.
+                version = self.version.refresh()
+            # Not current until the rebuild completes.
+            self._version = None
+            self._reset()
+            self._clear_entries()
+
+            active = Book.objects.filter(is_deleted=False)
+            for book_id, title in active.values_list("id", "title").iterator():
+                self._add_book(book_id, title)
+
+            links = Book.authors.through.objects.filter(book__is_deleted=False)
+            for book_id, author_id, name in links.values_list(
+                "book_id", "author_id", "author__name"
+            ).iterator():
+                self._link_author(book_id, author_id, name)
+
+            self._finish_rebuild()
+            self._version = version
+
+    def apply_book(self, book_id):
+        """Re-read one book and update the local copy in place."""
+        book = (
+            Book.objects
+            .filter(id=book_id, is_deleted=False)
+            .prefetch_related("authors")
+            .first()
+        )
+        with self._lock:
+            held = self._version
+            in_sync = held is not None and held == self.version.refresh()
+            new_version = self.version.bump()
+
+            # Anyone else bumping in between means our copy may miss their
+            # change too, so drop it and rebuild on the next lookup.
+            if not in_sync or new_version != held + 1:
+                self._version = None
+                return
+
+            self._remove_book(book_id)
+            if book is not None:
+                self._add_book(book.id, book.title)
+                for author in book.authors.all():
+                    self._link_author(book.id, author.id, author.name)
+            self._version = new_version
+
+    # -- bookkeeping ------------------------------------------------------
+
+    def _add_book(self, book_id, title):
+        self.titles[book_id] = title
+        self.book_authors[book_id] = set()
+        self._add_entry("title", book_id, title)
+
+    def _link_author(self, book_id, author_id, name):
+        self.book_authors.setdefault(book_id, set()).add(author_id)
+        books = self.author_books.setdefault(author_id, set())
+        if not books:
+            self.authors[author_id] = name
+            self._add_entry("author", author_id, name)
+        books.add(book_id)
+
+    def _remove_book(self, book_id):
+        title = self.titles.pop(book_id, None)
+        if title is None:
+            return
+        self._remove_entry("title", book_id, title)
+
+        for author_id in self.book_authors.pop(book_id, set()):
+            books = self.author_books.get(author_id, set())
+            books.discard(book_id)
+            if not books:
+                self.author_books.pop(author_id, None)
+                self._remove_entry("author", author_id, self.authors.pop(author_id))
+
+
+class PrefixIndex(CatalogIndex):
+    """
+    Sorted array of normalized keys for autocomplete.
+
+    Each title and author name is stored once per word, starting at that
+    word, so "pot" finds "Harry Potter" as well as "Potter Studies".
+    Lookups are a bisect plus a bounded forward scan.
+    """
+
+    version_key = "catalog:autocomplete:version"
+    max_scan = 500
+
+    def _clear_entries(self):
+        self.entries = []
+        self._loading = True
+
+    def _finish_rebuild(self):
+        # A rebuild appends unsorted and sorts once; insort per entry
+        # would make it quadratic.
+        self.entries.sort()
+        self._loading = False
+
+    def _keys(self, text):
+        normalized = normalize(text)
+        words = normalized.split(" ")
+        return {" ".join(words[i:]) for i in range(len(words)) if words[i]}
+
+    def _add_entry(self, kind, target_id, text):
+        for key in self._keys(text):
+            if self._loading:
+                self.entries.append((key, kind, target_id))
+            else:
+                insort(self.entries, (key, kind, target_id))
+
+    def _remove_entry(self, kind, target_id, text):
+        for key in self._keys(text):
+            entry = (key, kind, target_id)
+            i = bisect_left(self.entries, entry)
+            if i < len(self.entries) and self.entries[i] == entry:
+                del self.entries[i]
+
+    def suggest(self, prefix, limit=10):
+        self.ensure_fresh()
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        with self._lock:
+            entries = self.entries
+            start = bisect_left(entries, (prefix,))
+            candidates = {}
+            for key, kind, target_id in entries[start:start + self.max_scan]:
+                if not key.startswith(prefix):
+                    break
+                text = self.titles[target_id] if kind == "title" else self.authors[target_id]
+                # Matches on the first word rank ahead of mid-text matches.
+                starts_text = normalize(text) == key
+                rank = (not starts_text, len(text), text.lower())
+                previous = candidates.get((kind, target_id))
+                if previous is None or rank < previous[0]:
+                    candidates[(kind, target_id)] = (rank, text)
+
+        ranked = sorted(candidates.items(), key=lambda item: item[1][0])
+        return [
+            {"type": kind, "id": target_id, "text": text}
+            for (kind, target_id), (_, text) in ranked[:limit]
+        ]
+
+
+class TrigramIndex(CatalogIndex):
+    """
+    Inverted index from trigrams to titles and author names, for typo
+    tolerant lookups.
+
+    Text is split pg_trgm style: each word is padded as "  word " and cut
+    into three-character grams. Candidates come from the rarest query
+    grams first; very common grams and oversized candidate sets are cut
+    off, so a lookup stays bounded however large the catalog grows.
+    """
+
+    version_key = "catalog:trigram:version"
+    min_score = 0.5
+    max_posting_size = 5000
+    max_candidates = 1000
+
+    def _clear_entries(self):
+        self.postings = {}
+        self.grams = {}
+
+    @staticmethod
+    def trigrams(text):
+        grams = set()
+        for word in normalize(text).split():
+            padded = f"  {word} "
+            grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+        return frozenset(grams)
+
+    def _add_entry(self, kind, target_id, text):
+        grams = self.trigrams(text)
+        self.grams[(kind, target_id)] = grams
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add((kind, target_id))
+
+    def _remove_entry(self, kind, target_id, text):
+        for gram in self.grams.pop((kind, target_id), ()):
+            posting = self.postings.get(gram)
+            if posting is not None:
+                posting.discard((kind, target_id))
+                if not posting:
+                    del self.postings[gram]
+
+    def search(self, text, limit=10):
+        self.ensure_fresh()
+        query = self.trigrams(text)
+        if not query:
+            return []
+
+        with self._lock:
+            postings = sorted(
+                (self.postings.get(gram, ()) for gram in query), key=len
+            )
+            hits = Counter()
+            for posting in postings:
+                if len(posting) > self.max_posting_size:
+                    break
+                hits.update(posting)
+
+            scored = []
+            for target, _ in hits.most_common(self.max_candidates):
+                grams = self.grams[target]
+                shared = len(query & grams)
+                # Share of the query found in the entry, so a misspelt
+                # surname still matches a long full name.
+                score = shared / len(query)
+                if score < self.min_score:
+                    continue
+                similarity = shared / len(query | grams)
+                kind, target_id = target
+                text = self.titles[target_id] if kind == "title" else self.authors[target_id]
+                scored.append((score, similarity, kind, target_id, text))
+
+        scored.sort(key=lambda row: (-row[0], -row[1], row[4]))
+        return [
+            {"type": kind, "id": target_id, "text": text, "score": round(score, 3)}
+            for score, _, kind, target_id, text in scored[:limit]
+        ]
+
+
+autocomplete_index = PrefixIndex()
+fuzzy_index = TrigramIndex()
+
+catalog_indexes = [autocomplete_index, fuzzy_index]
+
+
+def refresh_catalog_indexes(book_id):
+    """Schedule every in-memory catalog index to re-read one book after commit."""
+    def apply():
+        for index in catalog_indexes:
+            index.apply_book(book_id)
+
+    transaction.on_commit(apply)
+
+
+def warm_catalog_indexes():
+    for index in catalog_indexes:
+        index.ensure_fresh()
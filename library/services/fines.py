@@ -0,0 +1,44 @@
+from django.db import transaction
+
+from library.models.borrow_models import Fine, Loan
+from library.logging import ServiceLogger
+from library.repositories.member_standing_repository import MemberStandingRepository
+
+
+class FinePaymentError(Exception):
+    pass
+
+logger = ServiceLogger("fines")
+
+@transaction.atomic
+def pay_fine(fine):
+    # Overdue fines keep accruing until the copy comes back.
+    if fine.loan.status == Loan.Status.ACTIVE:
+        logger.business_rule_rejected(
+            "Fine still accruing",
+            fine_id=fine.id,
+            loan_id=fine.loan_id,
+        )
+        raise FinePaymentError("Fine still accruing until the book is returned")
+
+    paid = Fine.objects.filter(id=fine.id, is_paid=False).update(is_paid=True)
+    if not paid:
+        logger.business_rule_rejected(
+            "Fine already paid",
+            fine_id=fine.id,
+            loan_id=fine.loan_id,
+        )
+        raise FinePaymentError("Fine already paid")
+
+    fine.is_paid = True
+    member_id = fine.loan.member_id
+    MemberStandingRepository().adjust(member_id, fines=-fine.amount)
+
+    logger.operation_succeeded(
+        "pay_fine",
+        fine_id=fine.id,
+        member_id=member_id,
+        amount=str(fine.amount),
+    )
+
+    return fine
@@ -0,0 +1,120 @@
+import threading
+from decimal import Decimal
+from itertools import product
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from library.models.borrow_models import Member
+from library.models.policy_models import LoanPolicy
+from library.services.shared_version import SharedVersion
+
+VERSION_KEY = "loan_policy:version"
+
+
+class LoanTerms(NamedTuple):
+    loan_days: Optional[int]
+    max_books: Optional[int]
+    daily_fine_rate: Optional[Decimal]
+
+
+_NO_TERMS = LoanTerms(None, None, None)
+
+
+def compile_policies(rows):
+    """
+    Resolve policy rows into `{(category, tier): LoanTerms}`.
+
+    Every known category and tier, plus "" for any other, gets an entry
+    with each term taken from the most specific row that sets it:
+    (category, tier), then (category, any), (any, tier), (any, any).
+    Unset terms stay None and are read from settings at lookup.
+    """
+    by_key = {(row.category, row.tier): row for row in rows}
+    categories = {""} | {category for category, _ in by_key}
+    tiers = {""} | set(Member.Tier.values)
+
+    table = {}
+    for category, tier in product(categories, tiers):
+        chain = [
+            by_key.get(key)
+            for key in ((category, tier), (category, ""), ("", tier), ("", ""))
+        ]
+        table[category, tier] = LoanTerms(*(
+            next((getattr(row, field) for row in chain
+                  if row is not None and getattr(row, field) is not None), None)
+            for field in LoanTerms._fields
+        ))
+    return MappingProxyType(table)
+
+
+class LoanPolicyTable:
+    """
+    Read-only lookup table of loan terms, compiled from LoanPolicy rows.
+
+    Each process keeps its own compiled copy, tagged with the shared
+    version counter it was compiled at. A lookup is a dict lookup; the
+    counter is re-read at most once per LIBRARY_SHARED_VERSION_TTL, so
+    an edit reaches other processes within that interval and the editing
+    process at once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = SharedVersion(VERSION_KEY)
+        self._version = None
+        self._table = MappingProxyType({})
+        self._categories = frozenset()
+
+    def forget(self):
+        """Drop the compiled copy; the next lookup recompiles."""
+        self._version = None
+        self.version.expire()
+
+    def ensure_fresh(self):
+        current = self.version.get()
+        if self._version != current:
+            with self._lock:
+                if self._version != current:
+                    self._table = compile_policies(LoanPolicy.objects.all())
+                    self._categories = frozenset(c for c, _ in self._table)
+                    self._version = current
+        return self._table
+
+    def terms(self, category="", tier=""):
+        table = self.ensure_fresh()
+        category = category if category in self._categories else ""
+        return table.get((category, tier or ""), table.get((category, ""), _NO_TERMS))
+
+    def loan_days(self, category, tier):
+        days = self.terms(category, tier).loan_days
+        return getattr(settings, "LIBRARY_LOAN_DAYS", 14) if days is None else days
+
+    def max_books(self, tier):
+        limit = self.terms("", tier).max_books
+        if limit is None:
+            limit = getattr(settings, "LIBRARY_MAX_BOOKS_ALLOWED", None)
+        return 5 if limit is None else limit
+
+    def daily_fine_rate(self, category, tier):
+        rate = self.terms(category, tier).daily_fine_rate
+        if rate is None:
+            rate = Decimal(str(getattr(settings, "LIBRARY_DAILY_FINE_RATE", 1.50)))
+        return rate
+
+
+loan_policies = LoanPolicyTable()
+
+
+def invalidate_loan_policies():
+    """
+    Make every process recompile its policy table.
+
+    The counter is bumped in the caller's transaction, so other processes
+    only see it once the edit is committed. This process recompiles on
+    its next lookup and checks again after commit.
+    """
+    loan_policies.version.bump()
+    transaction.on_commit(loan_policies.version.expire)
@@ -0,0 +1,72 @@
+from collections import defaultdict
+
+from django.db import transaction
+
+from library.models.borrow_models import Fine, Loan
+from library.logging import ServiceLogger
+from library.repositories.loan_repository import LoanRepository
+from library.repositories.member_standing_repository import MemberStandingRepository
+from library.services.loan_policy import loan_policies
+
+logger = ServiceLogger("overdue")
+
+
+@transaction.atomic
+def accrue_overdue_fines(*, as_of, after=None, limit=1000):
+    """
+    Flag one chunk of overdue loans and bring their fines up to `as_of`.
+
+    Loans are taken in (due_at, id) order after the `after` key and locked
+    for the chunk, so a concurrent return waits rather than racing the
+    accrual. Fines are charged per whole late day at the loan's policy
+    rate, like on return. Loans due on the same day at the same rate owe
+    the same amount, so existing fines are raised with one UPDATE per
+    distinct amount and missing ones are inserted in bulk. Returns the
+    chunk's stats and the key to resume after, which is None once nothing
+    is left.
+    """
+    rows = LoanRepository().overdue(as_of, after=after, limit=limit, lock=True)
+    stats = {"loans": len(rows), "flagged": 0, "created": 0, "raised": 0}
+    if not rows:
+        return stats, None
+
+    loan_ids = [row[0] for row in rows]
+    stats["flagged"] = Loan.objects.filter(
+        id__in=loan_ids, is_overdue=False
+    ).update(is_overdue=True)
+
+    accrued = dict(
+        Fine.objects.filter(loan_id__in=loan_ids).values_list("loan_id", "accrued_days")
+    )
+
+    new_fines, raise_to, standing_deltas = [], defaultdict(list), {}
+    for loan_id, member_id, due_at, category, tier in rows:
+        days = (as_of - due_at).days
+        rate = loan_policies.daily_fine_rate(category, tier)
+        previous = accrued.get(loan_id)
+        if previous is None:
+            if days <= 0:
+                continue
+            new_fines.append(Fine(loan_id=loan_id, amount=days * rate, accrued_days=days))
+            previous = 0
+        elif previous < days:
+            raise_to[days, days * rate].append(loan_id)
+        else:
+            continue
+
+        _, fine_delta = standing_deltas.get(member_id, (0, 0))
+        standing_deltas[member_id] = (0, fine_delta + (days - previous) * rate)
+
+    Fine.objects.bulk_create(new_fines)
+    stats["created"] = len(new_fines)
+    for (days, amount), ids in raise_to.items():
+        stats["raised"] += Fine.objects.filter(
+            loan_id__in=ids, is_paid=False, accrued_days__lt=days
+        ).update(amount=amount, accrued_days=days)
+
+    MemberStandingRepository().adjust_bulk(standing_deltas)
+
+    logger.operation_succeeded("accrue_overdue_fines", **stats)
+
+    last_id, _, last_due_at, _, _ = rows[-1]
+    return stats, (last_due_at, last_id)
@@ -0,0 +1,92 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+
+from library.models.borrow_models import Loan, Reservation
+from library.logging import ServiceLogger
+from library.services.loan_policy import loan_policies
+
+logger = ServiceLogger("renewal")
+
+
+@transaction.atomic
+def renew_loans(member, loan_ids=None):
+    """
+    Extend the member's loans by another loan period of their policy.
+
+    `loan_ids=None` renews every loan the member has out. Eligibility for
+    all loans comes from one query, which also locks them: the loan is
+    still ACTIVE and not past due, it has renewals left, and nobody holds
+    an ACTIVE reservation for its book. Eligible loans then move with one
+    UPDATE per distinct loan period, usually a single one. Returns one
+    `{"loan"}` or `{"loan", "error"}` per ACTIVE loan found, or
+    `{"loan_id", "error"}` for ids that are not.
+    """
+    now = timezone.now()
+    max_renewals = getattr(settings, "LIBRARY_MAX_RENEWALS", 2)
+
+    queued = Reservation.objects.filter(
+        book_id=OuterRef("book_copy__book_id"),
+        status=Reservation.Status.ACTIVE,
+        expires_at__gt=now,
+    )
+    loans = Loan.objects.filter(member=member, status=Loan.Status.ACTIVE)
+    if loan_ids is not None:
+        loans = loans.filter(id__in=loan_ids)
+    loans = {
+        loan.id: loan
+        for loan in (
+            loans.select_for_update(of=("self",))
+            .annotate(
+                reserved=Exists(queued), category=F("book_copy__book__category")
+            )
+            .order_by("due_at", "id")
+        )
+    }
+
+    outcomes, eligible = [], defaultdict(list)
+    for loan in loans.values():
+        if loan.due_at < now:
+            error = "Loan is overdue"
+        elif loan.renewal_count >= max_renewals:
+            error = "Renewal limit reached"
+        elif loan.reserved:
+            error = "Book is reserved by another member"
+        else:
+            error = None
+
+        if error:
+            logger.business_rule_rejected(error, loan_id=loan.id, member_id=member.id)
+            outcomes.append({"loan": loan, "error": error})
+        else:
+            days = loan_policies.loan_days(loan.category, member.tier)
+            eligible[days].append(loan)
+            outcomes.append({"loan": loan})
+
+    for days, renewed in eligible.items():
+        extension = timedelta(days=days)
+        Loan.objects.filter(id__in=[loan.id for loan in renewed]).update(
+            due_at=F("due_at") + extension,
+            renewal_count=F("renewal_count") + 1,
+        )
+        for loan in renewed:
+            loan.due_at += extension
+            loan.renewal_count += 1
+
+    if eligible:
+        logger.operation_succeeded(
+            "renew",
+            member_id=member.id,
+            loan_ids=[loan.id for renewed in eligible.values() for loan in renewed],
+        )
+
+    if loan_ids is not None:
+        outcomes += [
+            {"loan_id": loan_id, "error": "Loan not found"}
+            for loan_id in loan_ids if loan_id not in loans
+        ]
+    return outcomes
@@ -1,42 +1,217 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import transaction
 from django.utils.timezone import now
 from rest_framework.exceptions import ValidationError
 
 from library.models.borrow_models import BookCopy, Reservation
 from library.logging import ServiceLogger
+from library.repositories.book_repository import BookRepository
+from library.repositories.reservation_repository import ReservationRepository
+from library.services.catalog_cache import invalidate_catalog
+
+
+class ReservationError(Exception):
+    pass
 
 logger = ServiceLogger("reservation")
 
 
 @transaction.atomic
 def reserve_book(*, member, book):
-    
-    if BookCopy.objects.filter(
-        book=book,
-        loan__member=member,
-        loan__returned_at__isnull=True
-    ).exists():
-        raise ValidationError("You already borrowed this book")
-
-    if Reservation.objects.filter(
-        member=member,
-        book=book,
-        status=Reservation.Status.ACTIVE
-    ).exists():
-        raise ValidationError("You already reserved this book")
-
-    available = BookCopy.objects.filter(
-        book=book,
-        status=BookCopy.Status.AVAILABLE
-    ).exists()
-
-    if available:
-        raise ValidationError(
-            "Book is available, reservation not allowed"
+    outcome = reserve_books(member, [book.id])[0]
+    if "error" in outcome:
+        raise ValidationError(outcome["error"])
+    return outcome["reservation"]
+
+
+@transaction.atomic
+def reserve_books(member, book_ids):
+    """
+    Join the reservation queues of several books at once.
+
+    Every precondition for every book comes from one annotated query, and
+    new reservations are written with one bulk insert. The books are
+    locked first, so concurrent reservations of the same book queue up
+    and each reads the ticket the previous one issued. A reservation the
+    member let lapse or cancelled earlier is reopened at the back of the
+    queue, since there is one row per member and book. Returns one
+    `{"book", "reservation", "queue_position"}` or `{"book", "error"}` per
+    active book, in request order; unknown or deleted books are left out.
+    """
+    reservation_repo = ReservationRepository()
+    BookRepository().lock(book_ids)
+    books = reservation_repo.reservation_state_for_books(member, book_ids)
+
+    expires_at = Reservation.default_expiry()
+    outcomes, created, reopened = [], [], []
+    for book_id in book_ids:
+        book = books.get(book_id)
+        if book is None:
+            continue
+
+        if book.on_loan_to_member:
+            error = "You already borrowed this book"
+        elif book.member_reservation_status == Reservation.Status.ACTIVE:
+            error = "You already reserved this book"
+        elif book.has_available_copy:
+            error = "Book is available, reservation not allowed"
+        else:
+            error = None
+
+        if error:
+            logger.business_rule_rejected(
+                error, book_id=book.id, member_id=member.id
+            )
+            outcomes.append({"book": book, "error": error})
+            continue
+
+        reservation = Reservation(
+            member=member,
+            book=book,
+            status=Reservation.Status.ACTIVE,
+            expires_at=expires_at,
+            queue_position=book.last_position + 1,
         )
+        if book.member_reservation_id is None:
+            created.append(reservation)
+        else:
+            reservation.id = book.member_reservation_id
+            reservation.reserved_at = now()
+            reservation.fulfilled = False
+            reservation.pickup_deadline = None
+            reopened.append(reservation)
 
-    return Reservation.objects.create(
-        member=member,
-        book=book,
-        expires_at=Reservation.default_expiry(),
+        reservation_repo.forget_active_for_member(member.id, book.id)
+        reservation_repo.forget_first_unfulfilled(book.id)
+        outcomes.append({
+            "book": book,
+            "reservation": reservation,
+            "queue_position": book.waiting_count + 1,
+        })
+
+    Reservation.objects.bulk_create(created)
+    Reservation.objects.bulk_update(reopened, [
+        "status", "expires_at", "queue_position",
+        "reserved_at", "fulfilled", "pickup_deadline",
+    ])
+
+    if created or reopened:
+        logger.operation_succeeded(
+            "reserve",
+            member_id=member.id,
+            book_ids=[r.book_id for r in created + reopened],
+        )
+
+    return outcomes
+
+
+def hand_off_copies(copies):
+    """
+    Put copies coming back into circulation on hold for the next waiting
+    reservations of their books, or back on the shelf.
+
+    Each waiting reservation gets at most one copy, in queue order, and a
+    pickup deadline that also becomes its expiry. Writes the copies, the
+    held reservations and the available counters. Returns
+    `{copy_id: reservation or None}`.
+    """
+    if not copies:
+        return {}
+
+    reservation_repo = ReservationRepository()
+    waiting = reservation_repo.waiting_for_books(
+        Counter(copy.book_id for copy in copies)
     )
+
+    changed_at = now()
+    pickup_days = getattr(settings, "LIBRARY_HOLD_PICKUP_DAYS", 3)
+    deadline = changed_at + timedelta(days=pickup_days)
+
+    handed_to, holds, released = {}, [], Counter()
+    for copy in copies:
+        queue = waiting.get(copy.book_id)
+        copy.updated_at = changed_at
+        if queue:
+            reservation = queue.pop(0)
+            reservation.pickup_deadline = deadline
+            reservation.expires_at = deadline
+            holds.append(reservation)
+            copy.status = BookCopy.Status.RESERVED
+            copy.held_for = reservation
+            reservation_repo.forget_first_unfulfilled(copy.book_id)
+        else:
+            reservation = None
+            copy.status = BookCopy.Status.AVAILABLE
+            copy.held_for = None
+            released[copy.book_id] += 1
+        handed_to[copy.id] = reservation
+
+    BookCopy.objects.bulk_update(copies, ["status", "held_for", "updated_at"])
+    if holds:
+        Reservation.objects.bulk_update(holds, ["pickup_deadline", "expires_at"])
+    BookRepository().adjust_available_copies_bulk(released)
+
+    return handed_to
+
+
+@transaction.atomic
+def cancel_reservation(reservation):
+    if reservation.status != Reservation.Status.ACTIVE:
+        raise ReservationError(
+            f"Cannot cancel a {reservation.status.lower()} reservation"
+        )
+
+    reservation.status = Reservation.Status.CANCELLED
+    reservation.save(update_fields=["status"])
+
+    held_copy = BookCopy.objects.filter(held_for=reservation).first()
+    if held_copy is not None:
+        hand_off_copies([held_copy])
+        invalidate_catalog([held_copy.book_id])
+
+    logger.operation_succeeded(
+        "cancel_reservation",
+        reservation_id=reservation.id,
+        book_id=reservation.book_id,
+        member_id=reservation.member_id,
+        released_copy_id=getattr(held_copy, "id", None),
+    )
+
+    return reservation
+
+
+@transaction.atomic
+def expire_reservations(reservations):
+    """
+    Mark lapsed reservations EXPIRED and pass on any copies held for them.
+
+    Meant for one sweeper chunk at a time, so each transaction stays
+    short. Reservations fulfilled or cancelled since they were read are
+    left alone. Returns `(expired, handed_to)` where `handed_to` is the
+    `hand_off_copies` result for the copies that were on hold.
+    """
+    ids = [reservation.id for reservation in reservations]
+    if not ids:
+        return 0, {}
+
+    expired = Reservation.objects.filter(
+        id__in=ids, status=Reservation.Status.ACTIVE
+    ).update(status=Reservation.Status.EXPIRED)
+
+    held_copies = list(BookCopy.objects.filter(
+        held_for_id__in=ids, status=BookCopy.Status.RESERVED
+    ))
+    handed_to = hand_off_copies(held_copies)
+    if held_copies:
+        invalidate_catalog({copy.book_id for copy in held_copies})
+
+    logger.operation_succeeded(
+        "expire_reservations",
+        expired=expired,
+        held_copies=len(held_copies),
+    )
+
+    return expired, handed_to
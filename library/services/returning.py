@@ -1,20 +1,45 @@
 import logging
+from decimal import Decimal
 from django.utils import timezone
 from django.db import transaction
-from library.models.borrow_models import BookCopy, Loan, Fine, Reservation
+from library.models.borrow_models import Loan, Fine
 from library.logging import ServiceLogger
-
-# currency units per day consider moving to settings
-DAILY_FINE_RATE = 1.50
+from library.repositories.member_standing_repository import MemberStandingRepository
+from library.services.catalog_cache import invalidate_catalog
+from library.services.loan_policy import loan_policies
+from library.services.reservation import hand_off_copies
 
 logger = ServiceLogger("returning")
 
-def calculate_fine(loan: Loan) -> float:
+def days_late(loan: Loan) -> int:
     if loan.returned_at <= loan.due_at:
         return 0
+    return (loan.returned_at - loan.due_at).days
+
+def calculate_fine(loan: Loan) -> float:
+    """Late days at the rate of the loan's book category and member tier."""
+    days = days_late(loan)
+    if not days:
+        return 0
+    rate = loan_policies.daily_fine_rate(loan.book_copy.book.category, loan.member.tier)
+    return days * float(rate)
+
+def _settle_fine(loan, fine_amount, accrued):
+    """
+    The fine to write for a late return, topping up one the overdue job
+    already accrued. Returns `(fine, standing_delta)`; the fine is unsaved
+    when new.
+    """
+    days = days_late(loan)
+    if accrued is None:
+        return Fine(loan=loan, amount=fine_amount, accrued_days=days), fine_amount
 
-    days_late = (loan.returned_at - loan.due_at).days
-    return days_late * DAILY_FINE_RATE
+    delta = Decimal(str(fine_amount)) - accrued.amount
+    if accrued.is_paid or delta <= 0:
+        return accrued, 0
+    accrued.amount = fine_amount
+    accrued.accrued_days = days
+    return accrued, delta
 
 
 @transaction.atomic
@@ -32,12 +57,17 @@ def return_book(loan : Loan) -> float:
     loan.returned_at = timezone.now()
 
     fine_amount = calculate_fine(loan)
+    loan.status = Loan.Status.OVERDUE if fine_amount > 0 else Loan.Status.RETURNED
+    # Written first so a running overdue job has finished with this loan
+    # before its fine is read.
+    loan.save()
+
+    fine_delta = 0
     if fine_amount > 0:
-        loan.status = Loan.Status.OVERDUE
-        Fine.objects.create(
-            loan=loan,
-            amount=fine_amount
+        fine, fine_delta = _settle_fine(
+            loan, fine_amount, Fine.objects.filter(loan=loan).first()
         )
+        fine.save()
         logger.operation_succeeded(
             "return",
             loan_id=loan.id,
@@ -45,23 +75,86 @@ def return_book(loan : Loan) -> float:
             book_copy_id=loan.book_copy.id,
             fine_amount=fine_amount,
         )
-    else:
-        loan.status = Loan.Status.RETURNED
-
-    loan.save()
 
     copy = loan.book_copy
+    hand_off_copies([copy])
+
+    MemberStandingRepository().adjust(loan.member_id, loans=-1, fines=fine_delta)
 
-    has_reservations = Reservation.objects.filter(
-        book=copy.book,
-        fulfilled=False
-    ).exists()
+    invalidate_catalog([copy.book_id])
 
-    copy.status = (
-        BookCopy.Status.RESERVED
-        if has_reservations
-        else BookCopy.Status.AVAILABLE
+    return fine_amount
+
+@transaction.atomic
+def return_books_by_barcodes(barcodes):
+    """
+    Check in every scanned copy that is currently on loan.
+
+    Loans, fines the overdue job already accrued and the reservation
+    queues of their books are read in one query each and written back with
+    bulk updates. Returns one
+    `{"barcode", "loan", "fine"}` or `{"barcode", "error"}` per distinct
+    barcode, in scan order.
+    """
+    barcodes = list(dict.fromkeys(barcodes))
+    loans = {
+        loan.book_copy.barcode: loan
+        for loan in (
+            Loan.objects
+            .filter(status=Loan.Status.ACTIVE, book_copy__barcode__in=barcodes)
+            .select_related("book_copy__book", "member")
+        )
+    }
+
+    book_ids = {loan.book_copy.book_id for loan in loans.values()}
+
+    now = timezone.now()
+    late = [loan.id for loan in loans.values() if loan.due_at < now]
+    accrued = (
+        {fine.loan_id: fine for fine in Fine.objects.filter(loan_id__in=late)}
+        if late else {}
     )
-    copy.save()
+    new_fines, topped_up, fine_amounts = [], [], {}
+    standing_deltas = {}
+    for loan in loans.values():
+        loan.returned_at = now
+        fine_amount = calculate_fine(loan)
+        fine_amounts[loan.id] = fine_amount
+        fine_delta = 0
+        if fine_amount > 0:
+            loan.status = Loan.Status.OVERDUE
+            fine, fine_delta = _settle_fine(loan, fine_amount, accrued.get(loan.id))
+            if fine.pk is None:
+                new_fines.append(fine)
+            elif fine_delta:
+                topped_up.append(fine)
+        else:
+            loan.status = Loan.Status.RETURNED
+
+        loan_delta, member_fines = standing_deltas.get(loan.member_id, (0, 0))
+        standing_deltas[loan.member_id] = (loan_delta - 1, member_fines + fine_delta)
+
+    if loans:
+        Loan.objects.bulk_update(loans.values(), ["returned_at", "status"])
+        Fine.objects.bulk_create(new_fines)
+        Fine.objects.bulk_update(topped_up, ["amount", "accrued_days"])
+        hand_off_copies([loan.book_copy for loan in loans.values()])
+        MemberStandingRepository().adjust_bulk(standing_deltas)
+        invalidate_catalog(book_ids)
+
+        logger.operation_succeeded(
+            "return_batch",
+            loan_ids=[loan.id for loan in loans.values()],
+            fine_total=sum(fine_amounts.values()),
+        )
 
-    return fine_amount
\ No newline at end of file
+    return [
+        {
+            "barcode": barcode,
+            "loan": loans[barcode],
+            "fine": fine_amounts[loans[barcode].id],
+        }
+        if barcode in loans
+        else {"barcode": barcode, "error": "No active loan for this copy"}
+        for barcode in barcodes
+    ]
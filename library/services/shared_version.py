@@ -0,0 +1,89 @@
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from library.models.version_models import VersionCounter
+
+
+def read_shared_version(key):
+    """The counter's value, 0 if it was never bumped."""
+    return (
+        VersionCounter.objects.filter(key=key).values_list("value", flat=True).first()
+        or 0
+    )
+
+
+@transaction.atomic
+def bump_shared_version(key):
+    """
+    Increment a counter and return its new value.
+
+    Inside a caller's transaction the bump commits or rolls back with
+    the change it announces.
+    """
+    if not VersionCounter.objects.filter(key=key).update(value=F("value") + 1):
+        _, created = VersionCounter.objects.get_or_create(
+            key=key, defaults={"value": 1}
+        )
+        if not created:
+            VersionCounter.objects.filter(key=key).update(value=F("value") + 1)
+    return read_shared_version(key)
+
+
+@transaction.atomic
+def bump_shared_versions(keys):
+    """
+    Increment several counters with one UPDATE, creating the missing
+    ones at 1.
+    """
+    keys = list(dict.fromkeys(keys))
+    updated = VersionCounter.objects.filter(key__in=keys).update(
+        value=F("value") + 1
+    )
+    if updated < len(keys):
+        existing = set(
+            VersionCounter.objects.filter(key__in=keys).values_list("key", flat=True)
+        )
+        VersionCounter.objects.bulk_create(
+            [VersionCounter(key=key, value=1) for key in keys if key not in existing],
+            ignore_conflicts=True,
+        )
+
+
+class SharedVersion:
+    """
+    A process's view of one counter, re-read from the database at most
+    once every `LIBRARY_SHARED_VERSION_TTL` seconds.
+
+    Other processes therefore see a bump within that interval, at the
+    cost of one query per interval instead of one per lookup.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self._value = None
+        self._checked_at = None
+
+    def get(self):
+        now = time.monotonic()
+        ttl = getattr(settings, "LIBRARY_SHARED_VERSION_TTL", 5)
+        if self._checked_at is None or now - self._checked_at >= ttl:
+            self._value = read_shared_version(self.key)
+            self._checked_at = now
+        return self._value
+
+    def refresh(self):
+        """Read the counter now, whatever is left of the interval."""
+        self.expire()
+        return self.get()
+
+    def bump(self):
+        self._value = bump_shared_version(self.key)
+        self._checked_at = time.monotonic()
+        return self._value
+
+    def expire(self):
+        """Make the next `get` read the database."""
+        self._checked_at = None
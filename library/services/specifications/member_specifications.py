@@ -1,6 +1,5 @@
-from library.repositories.loan_repository import LoanRepository
-from library.repositories.fine_repository import FineRepository
-from django.conf import settings
+from library.repositories.member_standing_repository import MemberStandingRepository
+from library.services.loan_policy import loan_policies
 
 
 class MemberIsActive:
@@ -13,21 +12,22 @@ class MemberIsActive:
 class MemberBelowBorrowLimit:
     error_message = "Borrow limit reached"
 
-    def __init__(self, loan_repo: LoanRepository = None):
-        self.loan_repo = loan_repo or LoanRepository()
+    def __init__(self, standing_repo: MemberStandingRepository = None):
+        self.standing_repo = standing_repo or MemberStandingRepository()
+
+    def remaining(self, member):
+        limit = loan_policies.max_books(member.tier)
+        return limit - self.standing_repo.get_for_member(member).active_loan_count
 
     def is_satisfied_by(self, member, **_):
-        limit = getattr(settings, "LIBRARY_MAX_BOOKS_ALLOWED", None)
-        if limit is None:
-            limit = 5
-        return self.loan_repo.count_active_by_member(member) < limit
+        return self.remaining(member) > 0
 
 
 class MemberHasNoUnpaidFines:
     error_message = "Outstanding fines"
 
-    def __init__(self, fine_repo: FineRepository = None):
-        self.fine_repo = fine_repo or FineRepository()
+    def __init__(self, standing_repo: MemberStandingRepository = None):
+        self.standing_repo = standing_repo or MemberStandingRepository()
 
     def is_satisfied_by(self, member, **_):
-        return not self.fine_repo.member_has_unpaid_fines(member)
+        return self.standing_repo.get_for_member(member).unpaid_fine_total <= 0
@@ -7,8 +7,27 @@ class BookNotReservedByAnother:
     def __init__(self, reservation_repo: ReservationRepository = None):
         self.reservation_repo = reservation_repo or ReservationRepository()
 
+    @staticmethod
+    def blocks(member, own, first_waiting):
+        """
+        A member with a copy on hold may always collect it; anyone else
+        has to be at the head of the waiting queue, if there is one.
+        """
+        if own is not None and own.pickup_deadline is not None:
+            return False
+        return first_waiting is not None and first_waiting.member_id != member.id
+
     def is_satisfied_by(self, member, book=None, **_):
+        own = self.reservation_repo.active_for_member(member, book)
         first = self.reservation_repo.first_unfulfilled_for_book(book)
-        if first and first.member != member:
-            return False
-        return True
+        return not self.blocks(member, own, first)
+
+    def unsatisfied_book_ids(self, member, books, own=None):
+        """Ids of `books` the member may not borrow, with one query per lookup."""
+        if own is None:
+            own = self.reservation_repo.active_for_member_books(member, books)
+        first = self.reservation_repo.first_unfulfilled_for_books(books)
+        return {
+            book.id for book in books
+            if self.blocks(member, own.get(book.id), first.get(book.id))
+        }
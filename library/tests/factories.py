@@ -1,6 +1,8 @@
 from django.contrib.auth.models import User, Group
 from library.models.book_models import Author, Book, BookCopy
-from library.models.borrow_models import Member
+from library.models.borrow_models import Member, MemberStanding, Loan, Fine
+from library.repositories.member_standing_repository import MemberStandingRepository
+from library.services.book_search import index_book
 
 
 def create_user(*, is_librarian=False):
@@ -15,11 +17,12 @@ def create_user(*, is_librarian=False):
 
     # Create Member object for non-librarian users
     if not is_librarian:
-        Member.objects.create(
+        member = Member.objects.create(
             user=user,
             is_active=True,
             membership_number=f"MEM-{Member.objects.count() + 1:05d}"
         )
+        MemberStanding.objects.create(member=member)
 
     return user
 
@@ -44,8 +47,10 @@ def create_book(
         category="Tech",
         description="Some description",
         published_year=2024,
+        available_copies=copies if copy_status == BookCopy.Status.AVAILABLE else 0,
     )
     book.authors.set(authors)
+    index_book(book)
 
     for i in range(copies):
         BookCopy.objects.create(
@@ -55,4 +60,19 @@ def create_book(
             shelf_location="A1"
         )
 
-    return book
\ No newline at end of file
+    return book
+
+def create_loan(*, member, book_copy, due_at, **fields):
+    """Create a loan directly and keep the member's standing in step."""
+    loan = Loan.objects.create(
+        member=member, book_copy=book_copy, due_at=due_at, **fields
+    )
+    MemberStandingRepository().recompute([member.id])
+    return loan
+
+
+def create_fine(*, loan, amount, is_paid=False):
+    """Create a fine directly and keep the member's standing in step."""
+    fine = Fine.objects.create(loan=loan, amount=amount, is_paid=is_paid)
+    MemberStandingRepository().recompute([loan.member_id])
+    return fine
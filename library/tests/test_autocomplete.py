@@ -0,0 +1,93 @@
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from library.services.shared_version import bump_shared_version
+from library.services.catalog_index import autocomplete_index
+from factories import create_user, create_author, create_book
+
+
+class BookAutocompleteAPITests(APITestCase):
+    """Tests for the in-memory title and author autocomplete"""
+
+    def setUp(self):
+        self.harry = create_book(
+            title="Harry Potter", authors=[create_author("J. K. Rowling")]
+        )
+        self.studies = create_book(
+            title="Potter Studies", authors=[create_author("Émile Zola")]
+        )
+
+    def _suggest(self, q, **params):
+        response = self.client.get(
+            "/api/public/books/autocomplete/", {"q": q, **params}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [r["text"] for r in response.data["results"]]
+
+    def test_title_prefix_ranks_leading_word_first(self):
+        """Test a prefix matches any word, leading-word matches first"""
+        self.assertEqual(self._suggest("pot"), ["Potter Studies", "Harry Potter"])
+
+    def test_author_prefix_is_accent_insensitive(self):
+        """Test author names are normalized before matching"""
+        self.assertEqual(self._suggest("emi"), ["Émile Zola"])
+
+    def test_limit_is_applied(self):
+        self.assertEqual(len(self._suggest("pot", limit=1)), 1)
+
+    def test_lookup_does_not_touch_database_when_fresh(self):
+        """Test warm lookups are served from memory"""
+        self._suggest("har")
+
+        with self.assertNumQueries(0):
+            autocomplete_index.suggest("har")
+
+    def test_created_book_is_added_incrementally(self):
+        """Test the factory service updates the index after commit"""
+        librarian = create_user(is_librarian=True)
+        self.client.force_authenticate(user=librarian)
+        self._suggest("har")
+        version = autocomplete_index._version
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                "/api/librarian/books/",
+                {
+                    "title": "Hard Times",
+                    "isbn": "9780000000001",
+                    "category": "Fiction",
+                    "description": "Novel",
+                    "published_year": 1854,
+                    "authors": ["Charles Dickens"],
+                    "copies": [{"barcode": "HT-1", "shelf_location": "C1"}],
+                },
+                format="json",
+            )
+
+        self.assertEqual(autocomplete_index._version, version + 1)
+        self.assertEqual(self._suggest("har"), ["Hard Times", "Harry Potter"])
+        self.assertEqual(self._suggest("dick"), ["Charles Dickens"])
+
+    def test_soft_deleted_book_and_orphan_author_are_removed(self):
+        librarian = create_user(is_librarian=True)
+        self.client.force_authenticate(user=librarian)
+        self._suggest("har")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/librarian/books/{self.harry.id}/delete/")
+
+        self.assertEqual(self._suggest("har"), [])
+        self.assertEqual(self._suggest("rowl"), [])
+
+    @override_settings(LIBRARY_SHARED_VERSION_TTL=60)
+    def test_version_bump_from_another_process_triggers_rebuild(self):
+        """Test a bump in the database is picked up once the TTL runs out"""
+        self._suggest("har")
+        create_book(title="Harbour Lights")
+
+        bump_shared_version(autocomplete_index.version_key)
+        self.assertNotIn("Harbour Lights", self._suggest("har"))
+
+        autocomplete_index.version.expire()
+        self.assertIn("Harbour Lights", self._suggest("har"))
@@ -0,0 +1,109 @@
+from io import StringIO
+
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from library.models.book_models import Book, BookCopy
+from library.models.borrow_models import Member
+from factories import create_user, create_book
+
+
+class AvailableCopiesCounterTests(APITestCase):
+    """Tests for the denormalized Book.available_copies counter"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.member = Member.objects.get(user=self.user)
+        self.book = create_book(copies=2)
+
+    def test_borrow_decrements_counter(self):
+        """Test borrowing a copy decrements the counter"""
+        response = self.client.post("/api/books/borrow/", {"book_id": self.book.id})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.available_copies, 1)
+
+    def test_return_increments_counter(self):
+        """Test returning a copy that becomes AVAILABLE increments the counter"""
+        response = self.client.post("/api/books/borrow/", {"book_id": self.book.id})
+        loan_id = response.data["loan_id"]
+
+        response = self.client.post("/api/books/return/", {"loan_id": loan_id})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.available_copies, 2)
+
+    def test_fully_borrowed_book_leaves_public_list(self):
+        """Test the public list filters on the stored counter"""
+        book = create_book(title="Single Copy", copies=1)
+        self.client.post("/api/books/borrow/", {"book_id": book.id})
+
+        response = self.client.get("/api/public/books/")
+
+        titles = [b["title"] for b in response.data["results"]]
+        self.assertNotIn("Single Copy", titles)
+        self.assertIn("Test Book", titles)
+
+    def test_soft_delete_zeroes_counter(self):
+        """Test soft deleting a book resets its counter"""
+        librarian = create_user(is_librarian=True)
+        self.client.force_authenticate(user=librarian)
+
+        self.client.delete(f"/api/librarian/books/{self.book.id}/delete/")
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.available_copies, 0)
+
+    def test_update_recounts_counter(self):
+        """Test replacing copies through the updater recounts the counter"""
+        librarian = create_user(is_librarian=True)
+        self.client.force_authenticate(user=librarian)
+
+        response = self.client.patch(
+            f"/api/librarian/books/{self.book.id}/update/",
+            {"copies": [
+                {"barcode": "NEW-1", "shelf_location": "B1"},
+                {"barcode": "NEW-2", "shelf_location": "B1"},
+                {"barcode": "NEW-3", "shelf_location": "B1"},
+            ]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.available_copies, 3)
+
+
+class ReconcileAvailableCopiesCommandTests(APITestCase):
+    """Tests for the reconcile_available_copies management command"""
+
+    def test_command_fixes_drift(self):
+        """Test drifted counters are recounted from BookCopy rows"""
+        drifted = create_book(copies=3)
+        correct = create_book(copies=1)
+        Book.objects.filter(id=drifted.id).update(available_copies=7)
+
+        out = StringIO()
+        call_command("reconcile_available_copies", chunk_size=1, stdout=out)
+
+        drifted.refresh_from_db()
+        correct.refresh_from_db()
+        self.assertEqual(drifted.available_copies, 3)
+        self.assertEqual(correct.available_copies, 1)
+        self.assertIn("fixed 1", out.getvalue())
+
+    def test_dry_run_does_not_write(self):
+        """Test --dry-run only reports drift"""
+        book = create_book(copies=2)
+        BookCopy.objects.filter(book=book).update(status=BookCopy.Status.BORROWED)
+
+        out = StringIO()
+        call_command("reconcile_available_copies", dry_run=True, stdout=out)
+
+        book.refresh_from_db()
+        self.assertEqual(book.available_copies, 2)
+        self.assertIn("would fix 1", out.getvalue())
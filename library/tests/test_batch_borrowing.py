@@ -0,0 +1,154 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from library.models.book_models import BookCopy
+from library.models.borrow_models import Member, Loan, Reservation
+from library.services.loan_policy import loan_policies
+from factories import create_user, create_book, create_loan, create_fine
+
+
+class BorrowBooksAPITests(APITestCase):
+    """Tests for borrowing several books in one request"""
+
+    url = "/api/books/borrow/batch/"
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.member = Member.objects.get(user=self.user)
+
+        self.books = [create_book(title=f"Book {i}", copies=2) for i in range(3)]
+        self.ids = [book.id for book in self.books]
+
+    def test_borrows_every_book(self):
+        """Test every book in the cart is borrowed in one request"""
+        response = self.client.post(self.url, {"book_ids": self.ids}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([r["book_id"] for r in response.data["results"]], self.ids)
+        loans = Loan.objects.filter(member=self.member)
+        self.assertEqual(loans.count(), 3)
+        self.assertEqual(
+            {loan.book_copy.book_id for loan in loans}, set(self.ids)
+        )
+        for loan in loans:
+            self.assertEqual(loan.book_copy.status, BookCopy.Status.BORROWED)
+        for book in self.books:
+            book.refresh_from_db()
+            self.assertEqual(book.available_copies, 1)
+
+    def test_query_count_does_not_grow_with_cart(self):
+        """Test each extra book only adds its copy claim UPDATE"""
+        more = [create_book(title=f"More {i}", copies=1) for i in range(2)]
+
+        loan_policies.ensure_fresh()
+        with self.assertNumQueries(16):
+            self.client.post(self.url, {"book_ids": self.ids[:1]}, format="json")
+
+        with self.assertNumQueries(16 + 3):
+            self.client.post(
+                self.url,
+                {"book_ids": self.ids[1:] + [book.id for book in more]},
+                format="json",
+            )
+
+    def test_partial_success(self):
+        """Test unavailable, reserved and unknown books are reported per item"""
+        unavailable = create_book(
+            title="Gone", copies=1, copy_status=BookCopy.Status.BORROWED
+        )
+        reserved = create_book(title="Reserved", copies=1)
+        Reservation.objects.create(
+            member=Member.objects.get(user=create_user()),
+            book=reserved,
+            expires_at=timezone.now() + timedelta(days=2),
+        )
+
+        response = self.client.post(
+            self.url,
+            {"book_ids": [self.ids[0], unavailable.id, reserved.id, 99999]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        results = response.data["results"]
+        self.assertIn("loan_id", results[0])
+        self.assertEqual(results[1]["error"], "No available copies")
+        self.assertEqual(results[2]["error"], "Book reserved by another member")
+        self.assertEqual(results[3]["error"], "Book not found")
+        self.assertEqual(Loan.objects.filter(member=self.member).count(), 1)
+
+    def test_own_reservation_is_fulfilled(self):
+        """Test borrowing a book the member reserved fulfils the reservation"""
+        reservation = Reservation.objects.create(
+            member=self.member,
+            book=self.books[0],
+            expires_at=timezone.now() + timedelta(days=2),
+        )
+
+        self.client.post(self.url, {"book_ids": self.ids}, format="json")
+
+        reservation.refresh_from_db()
+        self.assertTrue(reservation.fulfilled)
+        self.assertEqual(reservation.status, Reservation.Status.FULFILLED)
+
+    @override_settings(LIBRARY_MAX_BOOKS_ALLOWED=2)
+    def test_borrow_limit_applies_across_the_cart(self):
+        """Test the borrow limit counts every book in the cart"""
+        response = self.client.post(self.url, {"book_ids": self.ids}, format="json")
+
+        results = response.data["results"]
+        self.assertEqual(sum("loan_id" in r for r in results), 2)
+        self.assertEqual(results[2]["error"], "Borrow limit reached")
+
+    @override_settings(LIBRARY_BORROW_STRATEGY="locking")
+    def test_locking_strategy(self):
+        """Test the locking strategy borrows the whole cart too"""
+        response = self.client.post(self.url, {"book_ids": self.ids}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        loans = Loan.objects.filter(member=self.member)
+        self.assertEqual(loans.count(), 3)
+        for loan in loans:
+            self.assertEqual(loan.book_copy.status, BookCopy.Status.BORROWED)
+        for book in self.books:
+            book.refresh_from_db()
+            self.assertEqual(book.available_copies, 1)
+
+    def test_nothing_borrowed_is_a_client_error(self):
+        """Test a cart where no book can be borrowed answers 400"""
+        for book in self.books:
+            book.copies.update(status=BookCopy.Status.BORROWED)
+
+        response = self.client.post(self.url, {"book_ids": self.ids}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_member_rules_reject_the_whole_cart(self):
+        """Test a blocked member is refused before any book is borrowed"""
+        loan = create_loan(
+            member=self.member,
+            book_copy=create_book(title="Old", copies=1).copies.first(),
+            due_at=timezone.now() - timedelta(days=2),
+        )
+        create_fine(loan=loan, amount=5.00)
+
+        response = self.client.post(self.url, {"book_ids": self.ids}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Outstanding fines", response.data["error"])
+        self.assertEqual(Loan.objects.filter(member=self.member).count(), 1)
+
+    def test_duplicate_ids_are_rejected(self):
+        """Test a cart listing a book twice answers 400"""
+        response = self.client.post(
+            self.url, {"book_ids": [self.ids[0], self.ids[0]]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("book_ids", response.data)
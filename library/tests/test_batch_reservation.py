@@ -0,0 +1,147 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from library.models.book_models import BookCopy
+from library.models.borrow_models import Member, Reservation
+from factories import create_user, create_book, create_loan
+
+
+class ReserveBooksAPITests(APITestCase):
+    """Tests for joining several reservation queues in one request"""
+
+    url = "/api/books/reserve/batch/"
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.member = Member.objects.get(user=self.user)
+
+        self.books = [
+            create_book(title=f"Volume {i}", copies=1, copy_status=BookCopy.Status.BORROWED)
+            for i in range(3)
+        ]
+        self.ids = [book.id for book in self.books]
+
+    def _reserve(self, ids):
+        return self.client.post(self.url, {"book_ids": ids}, format="json")
+
+    def test_reserves_every_book(self):
+        """Test every listed book is reserved in one request"""
+        response = self._reserve(self.ids)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([r["book_id"] for r in response.data["results"]], self.ids)
+        self.assertEqual(
+            [r["queue_position"] for r in response.data["results"]], [1, 1, 1]
+        )
+        self.assertEqual(
+            Reservation.objects.filter(
+                member=self.member, status=Reservation.Status.ACTIVE
+            ).count(),
+            3,
+        )
+
+    def test_joins_the_back_of_existing_queues(self):
+        """Test each reservation joins the back of its book's queue"""
+        other = Member.objects.get(user=create_user())
+        Reservation.objects.create(
+            member=other,
+            book=self.books[0],
+            expires_at=timezone.now() + timedelta(days=2),
+        )
+
+        response = self._reserve(self.ids[:1])
+
+        result = response.data["results"][0]
+        self.assertEqual(result["queue_position"], 2)
+        self.assertEqual(
+            Reservation.objects.get(id=result["reservation_id"]).queue_position, 2
+        )
+
+    def test_partial_success(self):
+        """Test books that cannot be reserved are reported per item"""
+        available = create_book(title="On shelf", copies=1)
+        Reservation.objects.create(
+            member=self.member,
+            book=self.books[1],
+            expires_at=timezone.now() + timedelta(days=2),
+        )
+        copy = self.books[2].copies.first()
+        create_loan(
+            member=self.member,
+            book_copy=copy,
+            due_at=timezone.now() + timedelta(days=3),
+        )
+
+        response = self._reserve(self.ids + [available.id, 999])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        results = response.data["results"]
+        self.assertIn("reservation_id", results[0])
+        self.assertEqual(
+            [r.get("error") for r in results[1:]],
+            [
+                "You already reserved this book",
+                "You already borrowed this book",
+                "Book is available, reservation not allowed",
+                "Book not found",
+            ],
+        )
+
+    def test_nothing_reserved_is_400(self):
+        """Test a list where no book can be reserved answers 400"""
+        available = create_book(title="On shelf", copies=1)
+
+        response = self._reserve([available.id])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_lapsed_reservation_is_reopened(self):
+        """Test a lapsed reservation is reopened at the back of the queue"""
+        old = Reservation.objects.create(
+            member=self.member,
+            book=self.books[0],
+            expires_at=timezone.now() - timedelta(days=1),
+            status=Reservation.Status.EXPIRED,
+        )
+
+        response = self._reserve(self.ids[:1])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        old.refresh_from_db()
+        self.assertEqual(response.data["results"][0]["reservation_id"], old.id)
+        self.assertEqual(old.status, Reservation.Status.ACTIVE)
+        self.assertEqual(old.queue_position, 2)
+        self.assertGreater(old.expires_at, timezone.now())
+
+    def test_duplicate_ids_are_rejected(self):
+        """Test a list naming a book twice answers 400"""
+        response = self._reserve([self.ids[0], self.ids[0]])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_count_does_not_grow_with_list(self):
+        """Test one lock, one precondition query and one INSERT for any list size"""
+        more = [
+            create_book(title=f"More {i}", copies=1, copy_status=BookCopy.Status.BORROWED)
+            for i in range(5)
+        ]
+
+        with self.assertNumQueries(7):
+            self._reserve(self.ids[:1])
+
+        with self.assertNumQueries(7):
+            self._reserve(self.ids[1:] + [book.id for book in more])
+
+    def test_single_reserve_uses_the_same_rules(self):
+        """Test the single reserve endpoint refuses a book reserved in a batch"""
+        self._reserve(self.ids[:1])
+
+        response = self.client.post("/api/books/reserve/", {"book_id": self.ids[0]})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("You already reserved this book", str(response.data))
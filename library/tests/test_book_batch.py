@@ -0,0 +1,94 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from factories import create_user, create_book
+
+
+class MemberBookBatchAPITests(APITestCase):
+    """Tests for fetching many books by id in one request"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.books = [create_book(title=f"Book {i}") for i in range(6)]
+
+    def _ids(self, books):
+        return ",".join(str(book.id) for book in books)
+
+    def test_results_keep_requested_order(self):
+        """Test results come back in the order the ids were given"""
+        wanted = [self.books[3], self.books[0], self.books[5]]
+
+        response = self.client.get(f"/api/public/books/batch/?ids={self._ids(wanted)}")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [b["id"] for b in response.data["results"]],
+            [b.id for b in wanted],
+        )
+        self.assertEqual(response.data["missing"], [])
+
+    def test_unknown_and_deleted_ids_are_reported_missing(self):
+        """Test unknown and soft-deleted ids are listed as missing"""
+        deleted = self.books[1]
+        deleted.is_deleted = True
+        deleted.save()
+
+        response = self.client.get(
+            f"/api/public/books/batch/?ids={self.books[0].id},{deleted.id},99999"
+        )
+
+        self.assertEqual([b["id"] for b in response.data["results"]], [self.books[0].id])
+        self.assertEqual(response.data["missing"], [deleted.id, 99999])
+
+    def test_query_count_does_not_grow_with_ids(self):
+        """Test group check, books and authors prefetch regardless of size"""
+        with self.assertNumQueries(3):
+            self.client.get(f"/api/public/books/batch/?ids={self._ids(self.books[:2])}")
+
+        with self.assertNumQueries(3):
+            self.client.get(f"/api/public/books/batch/?ids={self._ids(self.books)}")
+
+    def test_too_many_ids_rejected(self):
+        """Test more than 200 ids answers 400"""
+        ids = ",".join(str(i) for i in range(1, 202))
+
+        response = self.client.get(f"/api/public/books/batch/?ids={ids}")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_malformed_ids_rejected(self):
+        """Test a non-numeric id answers 400"""
+        response = self.client.get("/api/public/books/batch/?ids=1,two")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class LibrarianBookBatchAPITests(APITestCase):
+    """Tests for the librarian multi-get endpoint"""
+
+    def setUp(self):
+        self.librarian = create_user(is_librarian=True)
+        self.client.force_authenticate(user=self.librarian)
+
+    def test_librarian_batch_includes_copies(self):
+        """Test librarian results carry each book's copies, in requested order"""
+        first = create_book(copies=2)
+        second = create_book(copies=1)
+
+        response = self.client.get(
+            f"/api/librarian/books/batch/?ids={second.id},{first.id}"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [len(b["copies"]) for b in response.data["results"]], [1, 2]
+        )
+
+    def test_member_cannot_use_librarian_batch(self):
+        """Test members are refused the librarian batch endpoint"""
+        self.client.force_authenticate(user=create_user())
+
+        response = self.client.get("/api/librarian/books/batch/?ids=1")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,74 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from library.models.book_models import Book, BookCopy
+from factories import create_author, create_book
+
+
+class AvailableBookFacetsAPITests(APITestCase):
+    """Tests for the faceted counts over the available-books listing"""
+
+    def setUp(self):
+        jane = create_author("Jane Doe")
+        john = create_author("John Smith")
+
+        self._book("Django Basics", "Tech", 2019, [jane])
+        self._book("Django Patterns", "Tech", 2021, [jane, john])
+        self._book("Gardening", "Home", 1995, [john])
+        self._book("Checked Out", "Tech", 2020, [jane], status=BookCopy.Status.BORROWED)
+
+    def _book(self, title, category, year, authors, status=BookCopy.Status.AVAILABLE):
+        book = create_book(title=title, authors=authors, copy_status=status)
+        Book.objects.filter(id=book.id).update(category=category, published_year=year)
+        return book
+
+    def test_counts_for_all_available_books(self):
+        """Test category, decade and author counts cover available books only"""
+        response = self.client.get("/api/public/books/facets/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["categories"], [
+            {"value": "Tech", "count": 2},
+            {"value": "Home", "count": 1},
+        ])
+        self.assertEqual(response.data["published_decades"], [
+            {"value": 1990, "count": 1},
+            {"value": 2010, "count": 1},
+            {"value": 2020, "count": 1},
+        ])
+        self.assertEqual(
+            [(a["name"], a["count"]) for a in response.data["authors"]],
+            [("Jane Doe", 2), ("John Smith", 2)],
+        )
+
+    def test_counts_follow_current_filter(self):
+        """Test counts are computed over the filtered list"""
+        response = self.client.get("/api/public/books/facets/?q=django")
+
+        self.assertEqual(response.data["categories"], [{"value": "Tech", "count": 2}])
+        self.assertEqual(
+            [(a["name"], a["count"]) for a in response.data["authors"]],
+            [("Jane Doe", 2), ("John Smith", 1)],
+        )
+
+    def test_facet_values_filter_the_list(self):
+        """Test facet values work as filters on the book list"""
+        response = self.client.get("/api/public/books/?category=Tech&decade=2020")
+
+        titles = [b["title"] for b in response.data["results"]]
+        self.assertEqual(titles, ["Django Patterns"])
+
+    def test_invalid_decade_rejected(self):
+        """Test a non-numeric decade answers 400"""
+        response = self.client.get("/api/public/books/facets/?decade=nineties")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_facets_are_cached_per_filter(self):
+        """Test a repeated filter is answered from the response cache"""
+        self.client.get("/api/public/books/facets/?category=Home")
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/public/books/facets/?category=Home")
+
+        self.assertEqual(response.data["categories"], [{"value": "Home", "count": 1}])
@@ -0,0 +1,143 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from library.models.book_models import Book
+from library.services.book_queries import get_available_books
+from library.services.book_search import (
+    ContainsBookSearch,
+    FullTextBookSearch,
+    build_match_expression,
+    get_book_search,
+)
+from factories import create_user, create_author, create_book
+
+
+class BuildMatchExpressionTests(SimpleTestCase):
+    """Tests for translating user input into FTS5 expressions"""
+
+    def test_words_become_quoted_prefix_terms(self):
+        """Test each word becomes a quoted prefix term, all required"""
+        self.assertEqual(
+            build_match_expression(query="Dja bas"),
+            '("dja"* AND "bas"*)',
+        )
+
+    def test_column_filters(self):
+        """Test title and author filters are scoped to their columns"""
+        self.assertEqual(
+            build_match_expression(title="django", author="doe"),
+            '(title : ("django"*)) AND (authors : ("doe"*))',
+        )
+
+    def test_operators_are_not_interpreted(self):
+        """Test FTS5 operators and quotes in input are treated as plain words"""
+        self.assertEqual(
+            build_match_expression(query='NEAR("x" OR'),
+            '("near"* AND "x"* AND "or"*)',
+        )
+
+    def test_empty_input(self):
+        """Test input without words yields no expression"""
+        self.assertIsNone(build_match_expression(query="  ?! "))
+
+
+class FullTextSearchTests(APITestCase):
+    """Tests for the public book list search backed by FTS5"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+
+        self.basics = create_book(
+            title="Django Basics", authors=[create_author("Jane Doe")]
+        )
+        self.patterns = create_book(
+            title="Advanced Django Patterns", authors=[create_author("John Smith")]
+        )
+        self.jazz = create_book(
+            title="Gypsy Jazz", authors=[create_author("Django Reinhardt")]
+        )
+
+    def _titles(self, response):
+        return [b["title"] for b in response.data["results"]]
+
+    def test_sqlite_uses_full_text_backend(self):
+        """Test SQLite gets the FTS5 search backend"""
+        self.assertIsInstance(get_book_search(), FullTextBookSearch)
+
+    def test_multi_word_prefix_query(self):
+        """Test every word of the query must prefix-match"""
+        response = self.client.get("/api/public/books/?q=dja pat")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._titles(response), ["Advanced Django Patterns"])
+
+    def test_query_matches_title_and_author(self):
+        """Test a query matches titles and author names"""
+        response = self.client.get("/api/public/books/?q=django")
+
+        self.assertEqual(
+            set(self._titles(response)),
+            {"Django Basics", "Advanced Django Patterns", "Gypsy Jazz"},
+        )
+
+    def test_title_matches_rank_above_author_matches(self):
+        """Test title matches are ranked ahead of author-only matches"""
+        response = self.client.get("/api/public/books/?q=django")
+
+        self.assertEqual(self._titles(response)[-1], "Gypsy Jazz")
+
+    def test_author_filter(self):
+        """Test ?author= only matches author names"""
+        response = self.client.get("/api/public/books/?author=reinh")
+
+        self.assertEqual(self._titles(response), ["Gypsy Jazz"])
+
+    def test_updated_title_is_reindexed(self):
+        """Test an updated title replaces the old one in the index"""
+        librarian = create_user(is_librarian=True)
+        self.client.force_authenticate(user=librarian)
+        self.client.patch(
+            f"/api/librarian/books/{self.basics.id}/update/",
+            {
+                "title": "Flask Basics",
+                "copies": [{"barcode": "BC-NEW", "shelf_location": "A1"}],
+            },
+            format="json",
+        )
+
+        titles = [b.title for b in get_available_books(query="flask")]
+        self.assertEqual(titles, ["Flask Basics"])
+        titles = [b.title for b in get_available_books(query="django")]
+        self.assertNotIn("Flask Basics", titles)
+
+    def test_soft_deleted_book_is_removed_from_index(self):
+        """Test a soft-deleted book drops out of the index"""
+        librarian = create_user(is_librarian=True)
+        self.client.force_authenticate(user=librarian)
+        self.client.delete(f"/api/librarian/books/{self.jazz.id}/delete/")
+
+        self.assertFalse(
+            get_book_search().filter(Book.objects.all(), query="gypsy").exists()
+        )
+
+    def test_rebuild_command_restores_index(self):
+        """Test the rebuild command re-indexes every book"""
+        get_book_search().clear()
+
+        out = StringIO()
+        call_command("rebuild_book_search_index", chunk_size=2, stdout=out)
+
+        titles = [b.title for b in get_available_books(query="basics")]
+        self.assertEqual(titles, ["Django Basics"])
+        self.assertIn("Indexed 3 books", out.getvalue())
+
+    def test_contains_fallback(self):
+        """Test the icontains backend used on other databases"""
+        qs = ContainsBookSearch().filter(Book.objects.all(), query="reinhardt")
+
+        self.assertEqual([b.title for b in qs], ["Gypsy Jazz"])
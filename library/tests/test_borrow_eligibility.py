@@ -0,0 +1,109 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from library.models.book_models import BookCopy
+from library.models.borrow_models import Member, Loan, Reservation
+from library.services.loan_policy import loan_policies
+from factories import create_user, create_book, create_loan, create_fine
+
+
+class BorrowEligibilityAPITests(APITestCase):
+    """Tests for previewing whether a member could borrow a list of books"""
+
+    url = "/api/books/borrow/eligibility/"
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.member = Member.objects.get(user=self.user)
+
+        self.available = create_book(title="Available", copies=1)
+        self.out = create_book(
+            title="Out", copies=1, copy_status=BookCopy.Status.BORROWED
+        )
+        self.reserved = create_book(title="Reserved", copies=1)
+        Reservation.objects.create(
+            member=Member.objects.get(user=create_user()),
+            book=self.reserved,
+            expires_at=timezone.now() + timedelta(days=2),
+        )
+
+    def _get(self, *books, extra=()):
+        ids = [book.id for book in books] + list(extra)
+        return self.client.get(self.url, {"ids": ",".join(map(str, ids))})
+
+    def test_per_book_verdicts(self):
+        """Test each requested book gets its own verdict and reason"""
+        response = self._get(self.available, self.out, self.reserved, extra=[99999])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(r["book_id"], r["can_borrow"], r["error"]) for r in response.data["results"]],
+            [
+                (self.available.id, True, None),
+                (self.out.id, False, "No available copies"),
+                (self.reserved.id, False, "Book reserved by another member"),
+                (99999, False, "Book not found"),
+            ],
+        )
+
+    def test_own_reservation_is_eligible(self):
+        """Test a book reserved by the member themselves can be borrowed"""
+        Reservation.objects.all().delete()
+        Reservation.objects.create(
+            member=self.member,
+            book=self.reserved,
+            expires_at=timezone.now() + timedelta(days=2),
+        )
+
+        response = self._get(self.reserved)
+
+        self.assertTrue(response.data["results"][0]["can_borrow"])
+
+    def test_member_rules_apply_to_every_book(self):
+        """Test a member-level block is reported for every book"""
+        loan = create_loan(
+            member=self.member,
+            book_copy=self.out.copies.first(),
+            due_at=timezone.now() - timedelta(days=2),
+            status=Loan.Status.OVERDUE,
+        )
+        create_fine(loan=loan, amount=3)
+
+        response = self._get(self.available, self.reserved)
+
+        self.assertEqual(
+            {r["error"] for r in response.data["results"]}, {"Outstanding fines"}
+        )
+
+    @override_settings(LIBRARY_MAX_BOOKS_ALLOWED=0)
+    def test_borrow_limit(self):
+        """Test a member at the borrow limit is told so"""
+        response = self._get(self.available)
+
+        self.assertEqual(response.data["results"][0]["error"], "Borrow limit reached")
+
+    def test_query_count_is_independent_of_list_size(self):
+        """Test checking more books does not add queries"""
+        loan_policies.ensure_fresh()
+        with self.assertNumQueries(6):
+            self._get(self.available)
+
+        with self.assertNumQueries(6):
+            self._get(self.available, self.out, self.reserved)
+
+    def test_nothing_is_borrowed(self):
+        """Test the preview creates no loans"""
+        self._get(self.available)
+
+        self.assertFalse(Loan.objects.filter(member=self.member).exists())
+
+    def test_ids_are_required(self):
+        """Test a request without ids answers 400"""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,11 +1,14 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
 from datetime import timedelta
+from unittest import mock
+from django.test import override_settings
 from django.utils import timezone
 
 from library.models.book_models import BookCopy
-from library.models.borrow_models import Member, Loan, Fine, Reservation
-from factories import create_user, create_book
+from library.models.borrow_models import Member, Loan, Reservation
+from library.repositories.book_copy_repository import BookCopyRepository
+from factories import create_user, create_book, create_loan, create_fine
 
 
 class BorrowBookAPITests(APITestCase):
@@ -112,12 +115,12 @@ class BorrowBookAPITests(APITestCase):
         """Test member cannot borrow if they have unpaid fines"""
         # Create a paid fine (should not block borrowing)
         book1 = create_book(title="Book 1", copies=1)
-        loan1 = Loan.objects.create(
+        loan1 = create_loan(
             member=self.member,
             book_copy=book1.copies.first(),
             due_at=timezone.now() - timedelta(days=2)
         )
-        Fine.objects.create(loan=loan1, amount=5.00, is_paid=True)
+        create_fine(loan=loan1, amount=5.00, is_paid=True)
 
         # Should be able to borrow (fine is paid)
         response = self.client.post("/api/books/borrow/", {
@@ -127,12 +130,12 @@ class BorrowBookAPITests(APITestCase):
 
         # Create an unpaid fine
         book2 = create_book(title="Book 2", copies=1)
-        loan2 = Loan.objects.create(
+        loan2 = create_loan(
             member=self.member,
             book_copy=book2.copies.first(),
             due_at=timezone.now() - timedelta(days=2)
         )
-        Fine.objects.create(loan=loan2, amount=5.00, is_paid=False)
+        create_fine(loan=loan2, amount=5.00, is_paid=False)
 
         # Should not be able to borrow (unpaid fine)
         book3 = create_book(title="Book 3", copies=1)
@@ -433,3 +436,100 @@ class CancelReservationAPITests(APITestCase):
         })
 
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class CopyAllocationTests(APITestCase):
+    """Tests for how a borrower is assigned one of several available copies"""
+
+    def setUp(self):
+        self.book = create_book(copies=4)
+
+    def test_allocation_spreads_across_available_copies(self):
+        """Concurrent borrowers should not all queue for the same copy"""
+        repo = BookCopyRepository()
+
+        picked = {repo.find_available_for_book(self.book).id for _ in range(40)}
+
+        self.assertGreater(len(picked), 1)
+
+    def test_only_available_copies_are_candidates(self):
+        """Borrowed copies are never handed out"""
+        self.book.copies.exclude(
+            id=self.book.copies.order_by("-id").first().id
+        ).update(status=BookCopy.Status.BORROWED)
+        repo = BookCopyRepository()
+
+        picked = {repo.find_available_for_book(self.book).id for _ in range(10)}
+
+        self.assertEqual(picked, {self.book.copies.order_by("-id").first().id})
+
+    def test_no_copy_when_none_available(self):
+        self.book.copies.update(status=BookCopy.Status.BORROWED)
+
+        self.assertIsNone(BookCopyRepository().find_available_for_book(self.book))
+
+
+class OptimisticClaimTests(APITestCase):
+    """Tests for claiming a copy with a conditional UPDATE instead of a row lock"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.member = Member.objects.get(user=self.user)
+        self.book = create_book(copies=2)
+        self.first, self.second = self.book.copies.order_by("id")
+
+    def test_lost_claim_moves_on_to_next_copy(self):
+        """A candidate taken by someone else after it was read is skipped"""
+        self.first.status = BookCopy.Status.BORROWED
+        self.first.save()
+        repo = BookCopyRepository()
+
+        with mock.patch.object(
+            repo, "_candidate_ids", return_value=[self.first.id, self.second.id]
+        ):
+            copy = repo.claim_available_for_book(self.book)
+
+        self.assertEqual(copy, self.second)
+        self.assertEqual(copy.status, BookCopy.Status.BORROWED)
+
+    def test_gives_up_after_bounded_attempts(self):
+        """Lost rounds re-read candidates until the attempts run out"""
+        self.book.copies.update(status=BookCopy.Status.BORROWED)
+        repo = BookCopyRepository()
+
+        with mock.patch.object(
+            repo, "_candidate_ids", return_value=[self.first.id]
+        ) as candidates:
+            copy = repo.claim_available_for_book(self.book, attempts=3)
+
+        self.assertIsNone(copy)
+        self.assertEqual(candidates.call_count, 3)
+
+    def test_loan_constraint_violation_is_a_client_error(self):
+        """A copy already on loan despite its status is rejected with 400, not 500"""
+        self.book.copies.exclude(id=self.first.id).update(
+            status=BookCopy.Status.BORROWED
+        )
+        other = Member.objects.get(user=create_user())
+        Loan.objects.create(
+            member=other,
+            book_copy=self.first,
+            due_at=timezone.now() + timedelta(days=14),
+        )
+
+        response = self.client.post("/api/books/borrow/", {"book_id": self.book.id})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.status, BookCopy.Status.AVAILABLE)
+
+    @override_settings(LIBRARY_BORROW_STRATEGY="locking")
+    def test_locking_strategy(self):
+        response = self.client.post("/api/books/borrow/", {"book_id": self.book.id})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        loan = Loan.objects.get(id=response.data["loan_id"])
+        self.assertEqual(loan.book_copy.status, BookCopy.Status.BORROWED)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.available_copies, 1)
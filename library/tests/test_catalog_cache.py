@@ -0,0 +1,99 @@
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from library.models.book_models import Book
+from library.services.catalog_cache import GLOBAL_VERSION_KEY, forget_versions
+from library.services.shared_version import bump_shared_version
+from factories import create_user, create_book
+
+
+class CatalogResponseCacheTests(APITestCase):
+    """Tests for the versioned public catalog response cache"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.book = create_book(title="Django Basics", copies=1)
+
+    def _titles(self, response):
+        return [b["title"] for b in response.data["results"]]
+
+    def test_repeated_anonymous_list_skips_database(self):
+        """Test a repeated list request is answered from the cache"""
+        self.client.get("/api/public/books/?title=django&page=1")
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/public/books/?page=1&title=django")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._titles(response), ["Django Basics"])
+
+    def test_borrow_invalidates_list(self):
+        """Test borrowing the last copy drops the book from the cached list"""
+        self.client.get("/api/public/books/")
+
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/api/books/borrow/", {"book_id": self.book.id})
+
+        response = self.client.get("/api/public/books/")
+        self.assertEqual(self._titles(response), [])
+
+    def test_update_invalidates_detail(self):
+        """Test editing a book refreshes its cached detail response"""
+        self.client.force_authenticate(user=self.user)
+        self.client.get(f"/api/public/books/{self.book.id}/")
+
+        librarian = create_user(is_librarian=True)
+        self.client.force_authenticate(user=librarian)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                f"/api/librarian/books/{self.book.id}/update/",
+                {"title": "Flask Basics", "copies": [{"barcode": "BC-X", "shelf_location": "A1"}]},
+                format="json",
+            )
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(f"/api/public/books/{self.book.id}/")
+        self.assertEqual(response.data["title"], "Flask Basics")
+
+    def test_soft_delete_invalidates_detail(self):
+        """Test a soft deleted book is no longer served from the cache"""
+        self.client.force_authenticate(user=self.user)
+        self.client.get(f"/api/public/books/{self.book.id}/")
+
+        librarian = create_user(is_librarian=True)
+        self.client.force_authenticate(user=librarian)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/librarian/books/{self.book.id}/delete/")
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(f"/api/public/books/{self.book.id}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_other_books_detail_stays_cached(self):
+        """Test invalidation is scoped per book for detail responses"""
+        other = create_book(title="Other Book")
+        self.client.force_authenticate(user=self.user)
+        self.client.get(f"/api/public/books/{other.id}/")
+
+        Book.objects.filter(id=other.id).update(title="Changed Directly")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/api/books/borrow/", {"book_id": self.book.id})
+
+        response = self.client.get(f"/api/public/books/{other.id}/")
+        self.assertEqual(response.data["title"], "Other Book")
+
+    @override_settings(LIBRARY_SHARED_VERSION_TTL=60)
+    def test_other_processes_pick_up_bumps_after_the_ttl(self):
+        """Test another worker's bump is seen once the local version expires"""
+        self.client.get("/api/public/books/")
+        Book.objects.filter(id=self.book.id).update(title="Changed Elsewhere")
+        bump_shared_version(GLOBAL_VERSION_KEY)
+
+        response = self.client.get("/api/public/books/")
+        self.assertEqual(self._titles(response), ["Django Basics"])
+
+        forget_versions()
+        response = self.client.get("/api/public/books/")
+        self.assertEqual(self._titles(response), ["Changed Elsewhere"])
@@ -0,0 +1,70 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from factories import create_user, create_book
+
+
+class BookDetailConditionalGetTests(APITestCase):
+    """Tests for ETag / Last-Modified handling on book detail endpoints"""
+
+    def setUp(self):
+        self.member = create_user()
+        self.librarian = create_user(is_librarian=True)
+        self.book = create_book(copies=2)
+        self.member_url = f"/api/public/books/{self.book.id}/"
+        self.librarian_url = f"/api/librarian/books/{self.book.id}/"
+
+    def test_member_detail_sends_validators(self):
+        """Test detail responses carry ETag and Last-Modified"""
+        self.client.force_authenticate(user=self.member)
+
+        response = self.client.get(self.member_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", response.headers)
+        self.assertIn("Last-Modified", response.headers)
+
+    def test_matching_etag_returns_304_with_single_query(self):
+        """Test a matching If-None-Match short-circuits serialization"""
+        self.client.force_authenticate(user=self.member)
+        etag = self.client.get(self.member_url).headers["ETag"]
+
+        # Group check for IsMember plus the change-marker query.
+        with self.assertNumQueries(2):
+            response = self.client.get(self.member_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_fields_param_changes_etag(self):
+        """Test sparse fieldsets are distinct representations"""
+        self.client.force_authenticate(user=self.member)
+
+        full = self.client.get(self.member_url).headers["ETag"]
+        sparse = self.client.get(f"{self.member_url}?fields=title").headers["ETag"]
+
+        self.assertNotEqual(full, sparse)
+
+    def test_copy_status_change_invalidates_librarian_etag(self):
+        """Test borrowing a copy changes the librarian detail ETag"""
+        self.client.force_authenticate(user=self.librarian)
+        etag = self.client.get(self.librarian_url).headers["ETag"]
+
+        self.client.force_authenticate(user=self.member)
+        self.client.post("/api/books/borrow/", {"book_id": self.book.id})
+
+        self.client.force_authenticate(user=self.librarian)
+        response = self.client.get(self.librarian_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_deleted_book_returns_404_for_member(self):
+        """Test hidden books are not answered with validators"""
+        self.book.is_deleted = True
+        self.book.save()
+        self.client.force_authenticate(user=self.member)
+
+        response = self.client.get(self.member_url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn("ETag", response.headers)
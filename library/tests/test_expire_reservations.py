@@ -0,0 +1,103 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from library.models.book_models import Book, BookCopy
+from library.models.borrow_models import Member, Reservation
+from library.repositories.reservation_repository import ReservationRepository
+from factories import create_user, create_book
+
+
+class ExpireReservationsCommandTests(APITestCase):
+    """Tests for the lapsed reservation sweeper"""
+
+    def setUp(self):
+        self.book = create_book(copies=1, copy_status=BookCopy.Status.BORROWED)
+        self.copy = self.book.copies.first()
+        self.members = [Member.objects.get(user=create_user()) for _ in range(3)]
+
+    def _reserve(self, member, *, expires_in, book=None):
+        return Reservation.objects.create(
+            member=member,
+            book=book or self.book,
+            expires_at=timezone.now() + timedelta(days=expires_in),
+        )
+
+    def _hold(self, reservation):
+        reservation.pickup_deadline = reservation.expires_at
+        reservation.save()
+        self.copy.status = BookCopy.Status.RESERVED
+        self.copy.held_for = reservation
+        self.copy.save()
+
+    def _sweep(self, **options):
+        out = StringIO()
+        call_command("expire_reservations", stdout=out, **options)
+        return out.getvalue()
+
+    def test_only_lapsed_reservations_expire(self):
+        """Test only reservations past their expiry are expired"""
+        lapsed = self._reserve(self.members[0], expires_in=-1)
+        current = self._reserve(self.members[1], expires_in=1)
+
+        output = self._sweep()
+
+        lapsed.refresh_from_db()
+        current.refresh_from_db()
+        self.assertEqual(lapsed.status, Reservation.Status.EXPIRED)
+        self.assertEqual(current.status, Reservation.Status.ACTIVE)
+        self.assertIn("Expired 1 reservations", output)
+
+    def test_walks_every_chunk(self):
+        """Test the sweep expires reservations across every chunk"""
+        books = [create_book(title=f"Book {i}") for i in range(5)]
+        for book in books:
+            self._reserve(self.members[0], expires_in=-1, book=book)
+
+        output = self._sweep(chunk_size=2)
+
+        self.assertFalse(
+            Reservation.objects.filter(status=Reservation.Status.ACTIVE).exists()
+        )
+        self.assertIn("Expired 5 reservations", output)
+
+    def test_lapsed_hold_passes_to_next_in_queue(self):
+        """Test a lapsed hold passes its copy to the next waiter"""
+        held = self._reserve(self.members[0], expires_in=-1)
+        self._hold(held)
+        waiting = self._reserve(self.members[1], expires_in=2)
+
+        output = self._sweep()
+
+        self.copy.refresh_from_db()
+        waiting.refresh_from_db()
+        self.assertEqual(self.copy.held_for_id, waiting.id)
+        self.assertEqual(self.copy.status, BookCopy.Status.RESERVED)
+        self.assertIsNotNone(waiting.pickup_deadline)
+        self.assertIn("passed on 1 held copies", output)
+
+    def test_lapsed_hold_skips_lapsed_waiters(self):
+        """Test a lapsed hold skips waiters who lapsed too and shelves the copy"""
+        held = self._reserve(self.members[0], expires_in=-2)
+        self._hold(held)
+        self._reserve(self.members[1], expires_in=-1)
+
+        output = self._sweep(chunk_size=1)
+
+        self.copy.refresh_from_db()
+        self.assertEqual(self.copy.status, BookCopy.Status.AVAILABLE)
+        self.assertIsNone(self.copy.held_for_id)
+        self.assertEqual(Book.objects.get(id=self.book.id).available_copies, 1)
+        self.assertIn("released 1 to the shelf", output)
+
+    def test_lapsed_reservation_does_not_block_the_queue(self):
+        """Test a lapsed reservation is not treated as the head of the queue"""
+        self._reserve(self.members[0], expires_in=-1)
+        waiting = self._reserve(self.members[1], expires_in=2)
+
+        self.assertEqual(
+            ReservationRepository().first_unfulfilled_for_book(self.book), waiting
+        )
@@ -0,0 +1,77 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from library.services.catalog_index import TrigramIndex, fuzzy_index
+from factories import create_user, create_author, create_book
+
+
+class TrigramIndexTests(APITestCase):
+    """Tests for typo-tolerant title and author lookups"""
+
+    def setUp(self):
+        create_book(title="The Hobbit", authors=[create_author("J. R. R. Tolkien")])
+        create_book(title="Harry Potter", authors=[create_author("J. K. Rowling")])
+        create_book(title="Cooking at Home", authors=[create_author("Nigella Lawson")])
+
+    def _search(self, q):
+        response = self.client.get("/api/public/books/fuzzy/", {"q": q})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["results"]
+
+    def test_trigrams_are_padded_per_word(self):
+        """Test each word is padded before it is split into trigrams"""
+        self.assertEqual(
+            TrigramIndex.trigrams("Ab c"),
+            {"  a", " ab", "ab ", "  c", " c "},
+        )
+
+    def test_misspelt_author_is_found(self):
+        """Test a misspelt author name still finds the book"""
+        results = self._search("tolkein")
+
+        self.assertEqual(results[0]["text"], "J. R. R. Tolkien")
+        self.assertEqual(results[0]["type"], "author")
+
+    def test_misspelt_title_is_found(self):
+        """Test a misspelt title still finds the book"""
+        results = self._search("hary poter")
+
+        self.assertEqual(results[0]["text"], "Harry Potter")
+        self.assertEqual(results[0]["type"], "title")
+
+    def test_unrelated_text_returns_nothing(self):
+        """Test text sharing too few trigrams returns no results"""
+        self.assertEqual(self._search("xylophone"), [])
+
+    def test_results_are_ranked_by_score(self):
+        """Test closer matches are listed first"""
+        results = self._search("rowlng")
+
+        scores = [r["score"] for r in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(results[0]["text"], "J. K. Rowling")
+
+    def test_updated_title_is_reindexed(self):
+        """Test an edited title is searchable under its new spelling"""
+        librarian = create_user(is_librarian=True)
+        self.client.force_authenticate(user=librarian)
+        book_id = self._search("hobbit")[0]["id"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                f"/api/librarian/books/{book_id}/update/",
+                {"title": "The Silmarillion", "copies": []},
+                format="json",
+            )
+
+        self.assertEqual(self._search("hobit"), [])
+        self.assertEqual(self._search("silmarilion")[0]["text"], "The Silmarillion")
+
+    def test_oversized_postings_are_skipped(self):
+        """Test trigrams whose postings exceed the size cap are skipped"""
+        self._search("tolkein")
+        fuzzy_index.max_posting_size = 0
+        try:
+            self.assertEqual(fuzzy_index.search("tolkein"), [])
+        finally:
+            del fuzzy_index.max_posting_size
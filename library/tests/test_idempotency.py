@@ -0,0 +1,189 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from library.models.book_models import BookCopy
+from library.models.borrow_models import Member, Loan, Fine, Reservation
+from library.models.idempotency_models import IdempotencyKey
+from factories import create_user, create_book, create_loan
+
+
+class IdempotencyKeyTests(APITestCase):
+    """Tests for replaying circulation POSTs retried with an Idempotency-Key"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.member = Member.objects.get(user=self.user)
+        self.book = create_book(copies=2)
+
+    def _borrow(self, key, book=None):
+        return self.client.post(
+            "/api/books/borrow/",
+            {"book_id": (book or self.book).id},
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retried_borrow_is_replayed(self):
+        """Test a retried borrow replays the first response without a second loan"""
+        first = self._borrow("borrow-1")
+        second = self._borrow("borrow-1")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data["loan_id"], first.data["loan_id"])
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(Loan.objects.filter(member=self.member).count(), 1)
+
+    def test_retried_return_is_replayed(self):
+        """Test a retried return replays the first response"""
+        copy = self.book.copies.first()
+        copy.status = BookCopy.Status.BORROWED
+        copy.save()
+        loan = create_loan(
+            member=self.member,
+            book_copy=copy,
+            due_at=timezone.now() - timedelta(days=2, hours=1),
+        )
+
+        for _ in range(2):
+            response = self.client.post(
+                "/api/books/return/", {"loan_id": loan.id}, HTTP_IDEMPOTENCY_KEY="ret-1"
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(response.data["fine"], 3.0)
+
+        self.assertEqual(Fine.objects.filter(loan=loan).count(), 1)
+
+    def test_retried_reserve_is_replayed(self):
+        """Test a retried reservation replays the first response"""
+        book = create_book(title="Out", copies=1, copy_status=BookCopy.Status.BORROWED)
+
+        responses = [
+            self.client.post(
+                "/api/books/reserve/", {"book_id": book.id}, HTTP_IDEMPOTENCY_KEY="res-1"
+            )
+            for _ in range(2)
+        ]
+
+        self.assertEqual(
+            [r.status_code for r in responses],
+            [status.HTTP_201_CREATED, status.HTTP_201_CREATED],
+        )
+        self.assertEqual(Reservation.objects.filter(member=self.member).count(), 1)
+
+    def test_without_key_requests_run_every_time(self):
+        """Test requests without the header run every time"""
+        self.client.post("/api/books/borrow/", {"book_id": self.book.id})
+        response = self.client.post("/api/books/borrow/", {"book_id": self.book.id})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Loan.objects.filter(member=self.member).count(), 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_key_reused_for_another_request_is_refused(self):
+        """Test a key reused with a different body answers 422"""
+        self._borrow("borrow-1")
+
+        response = self._borrow("borrow-1", book=create_book(title="Other"))
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Loan.objects.filter(member=self.member).count(), 1)
+
+    def test_keys_are_scoped_per_user(self):
+        """Test two members can use the same key independently"""
+        self._borrow("shared")
+
+        self.client.force_authenticate(user=create_user())
+        response = self._borrow("shared")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(response.has_header("Idempotent-Replayed"))
+        self.assertEqual(Loan.objects.count(), 2)
+
+    def test_in_flight_key_conflicts(self):
+        """Test a retry while the first request is in flight answers 409"""
+        self._borrow("pending")
+        IdempotencyKey.objects.filter(key="pending").update(
+            status_code=None, response_body=None
+        )
+
+        response = self._borrow("pending")
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Loan.objects.filter(member=self.member).count(), 1)
+
+    def test_abandoned_claim_is_taken_over_after_the_lease(self):
+        """Test an unfinished claim older than the lease is claimed again"""
+        self._borrow("crashed")
+        IdempotencyKey.objects.filter(key="crashed").update(
+            status_code=None,
+            response_body=None,
+            created_at=timezone.now() - timedelta(seconds=61),
+        )
+
+        with self.settings(LIBRARY_IDEMPOTENCY_LEASE=60):
+            response = self._borrow("crashed")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            IdempotencyKey.objects.get(key="crashed").status_code,
+            status.HTTP_201_CREATED,
+        )
+
+    def test_raised_api_error_is_stored_and_replayed(self):
+        """Test a raised validation error is stored and replayed"""
+        first = self.client.post(
+            "/api/books/borrow/", {"book_id": "x"}, HTTP_IDEMPOTENCY_KEY="invalid"
+        )
+        second = self.client.post(
+            "/api/books/borrow/", {"book_id": "x"}, HTTP_IDEMPOTENCY_KEY="invalid"
+        )
+
+        self.assertEqual(first.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(second.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+
+    def test_rejected_request_is_replayed_too(self):
+        """Test a returned 400 is replayed even after the cause is gone"""
+        book = create_book(title="Out", copies=1, copy_status=BookCopy.Status.BORROWED)
+
+        first = self._borrow("none-left", book=book)
+        book.copies.update(status=BookCopy.Status.AVAILABLE)
+        second = self._borrow("none-left", book=book)
+
+        self.assertEqual(first.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(second.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(second.data, first.data)
+
+    def test_expired_key_runs_again(self):
+        """Test a request with an expired key runs the handler again"""
+        self._borrow("borrow-1")
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        response = self._borrow("borrow-1")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(response.has_header("Idempotent-Replayed"))
+        self.assertEqual(Loan.objects.filter(member=self.member).count(), 2)
+
+    def test_purge_removes_only_expired_keys(self):
+        """Test the purge command deletes only expired keys"""
+        self._borrow("old")
+        self._borrow("new", book=create_book(title="New"))
+        IdempotencyKey.objects.filter(key="old").update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        out = StringIO()
+        call_command("purge_idempotency_keys", chunk_size=1, stdout=out)
+
+        self.assertEqual(
+            list(IdempotencyKey.objects.values_list("key", flat=True)), ["new"]
+        )
+        self.assertIn("Deleted 1 expired idempotency keys", out.getvalue())
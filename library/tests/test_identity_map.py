@@ -0,0 +1,129 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from library.models.book_models import BookCopy
+from library.models.borrow_models import Member, Loan, Reservation
+from library.repositories.book_repository import BookRepository
+from library.repositories.identity_map import identity_map
+from library.repositories.reservation_repository import ReservationRepository
+from library.services.loan_policy import loan_policies
+from factories import create_user, create_book, create_loan
+
+
+class IdentityMapTests(TestCase):
+    """Tests for the request-scoped repository identity map"""
+
+    def setUp(self):
+        self.book = create_book()
+
+    def test_lookups_are_loaded_once_per_scope(self):
+        """Test repeated lookups in a scope return the same object from one query"""
+        repo = BookRepository()
+
+        with identity_map():
+            with self.assertNumQueries(1):
+                first = repo.get_active(self.book.id)
+                second = repo.get_active(self.book.id)
+
+        self.assertIs(first, second)
+
+    def test_misses_are_remembered_too(self):
+        """Test a lookup that found nothing is not repeated in the scope"""
+        with identity_map():
+            with self.assertNumQueries(1):
+                self.assertIsNone(BookRepository().get_active(99999))
+                self.assertIsNone(BookRepository().get_active(99999))
+
+    def test_no_caching_outside_a_scope(self):
+        """Test lookups outside a scope query every time"""
+        repo = BookRepository()
+
+        with self.assertNumQueries(2):
+            repo.get_active(self.book.id)
+            repo.get_active(self.book.id)
+
+    def test_scopes_do_not_share_objects(self):
+        """Test separate scopes load their own objects"""
+        repo = BookRepository()
+
+        with identity_map():
+            first = repo.get_active(self.book.id)
+        with identity_map():
+            second = repo.get_active(self.book.id)
+
+        self.assertIsNot(first, second)
+
+    def test_fulfilled_reservation_is_forgotten(self):
+        """Test a forgotten reservation lookup is read again"""
+        reservation = Reservation.objects.create(
+            member=Member.objects.get(user=create_user()),
+            book=self.book,
+            expires_at=timezone.now() + timedelta(days=2),
+        )
+        repo = ReservationRepository()
+
+        with identity_map():
+            self.assertEqual(repo.first_unfulfilled_for_book(self.book), reservation)
+            Reservation.objects.filter(id=reservation.id).update(
+                fulfilled=True, status=Reservation.Status.FULFILLED
+            )
+            repo.forget_first_unfulfilled(self.book.id)
+
+            self.assertIsNone(repo.first_unfulfilled_for_book(self.book))
+
+
+class EndpointQueryCountTests(APITestCase):
+    """Tests for repeated lookups within one borrow or return request"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.member = Member.objects.get(user=self.user)
+        self.book = create_book(copies=2)
+
+    def test_borrow(self):
+        """Test a borrow runs a fixed number of queries"""
+        Reservation.objects.create(
+            member=self.member,
+            book=self.book,
+            expires_at=timezone.now() + timedelta(days=2),
+        )
+
+        loan_policies.ensure_fresh()
+        with self.assertNumQueries(17):
+            response = self.client.post("/api/books/borrow/", {"book_id": self.book.id})
+
+        self.assertEqual(response.status_code, 201)
+
+    def test_return(self):
+        """Test a return runs a fixed number of queries"""
+        copy = self.book.copies.first()
+        copy.status = BookCopy.Status.BORROWED
+        copy.save()
+        loan = create_loan(
+            member=self.member,
+            book_copy=copy,
+            due_at=timezone.now() + timedelta(days=3),
+        )
+
+        with self.assertNumQueries(10):
+            response = self.client.post("/api/books/return/", {"loan_id": loan.id})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Loan.objects.get(id=loan.id).status, Loan.Status.RETURNED)
+
+    def test_return_of_another_members_loan_is_not_found(self):
+        """Test returning another member's loan answers 404"""
+        other = Member.objects.get(user=create_user())
+        loan = create_loan(
+            member=other,
+            book_copy=self.book.copies.first(),
+            due_at=timezone.now() + timedelta(days=3),
+        )
+
+        response = self.client.post("/api/books/return/", {"loan_id": loan.id})
+
+        self.assertEqual(response.status_code, 404)
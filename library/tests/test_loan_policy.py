@@ -0,0 +1,222 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from library.models.book_models import BookCopy
+from library.models.borrow_models import Member, Loan, Fine
+from library.models.policy_models import LoanPolicy
+from library.services.loan_policy import (
+    LoanPolicyTable, LoanTerms, compile_policies, invalidate_loan_policies,
+    loan_policies,
+)
+from library.services.overdue import accrue_overdue_fines
+from factories import create_user, create_book, create_loan
+
+
+class CompilePoliciesTests(SimpleTestCase):
+    """Tests for resolving policy rows into the lookup table"""
+
+    def test_most_specific_row_wins_per_term(self):
+        """Test each term comes from the most specific row that sets it"""
+        table = compile_policies([
+            LoanPolicy(loan_days=14, max_books=5, daily_fine_rate=Decimal("1.50")),
+            LoanPolicy(tier=Member.Tier.STUDENT, loan_days=21, max_books=8),
+            LoanPolicy(category="Reference", loan_days=3),
+            LoanPolicy(
+                category="Reference", tier=Member.Tier.STUDENT,
+                daily_fine_rate=Decimal("0.50"),
+            ),
+        ])
+
+        self.assertEqual(
+            table["Reference", Member.Tier.STUDENT],
+            LoanTerms(3, 8, Decimal("0.50")),
+        )
+        self.assertEqual(
+            table["Reference", Member.Tier.PREMIUM], LoanTerms(3, 5, Decimal("1.50"))
+        )
+        self.assertEqual(
+            table["", Member.Tier.STUDENT], LoanTerms(21, 8, Decimal("1.50"))
+        )
+
+    def test_unset_terms_stay_none(self):
+        """Test terms no row sets are left as None"""
+        table = compile_policies([LoanPolicy(category="Reference", loan_days=3)])
+
+        self.assertEqual(table["Reference", ""], LoanTerms(3, None, None))
+        self.assertEqual(table["", Member.Tier.STANDARD], LoanTerms(None, None, None))
+
+    def test_table_is_read_only(self):
+        """Test the compiled table cannot be modified"""
+        table = compile_policies([])
+
+        with self.assertRaises(TypeError):
+            table["", ""] = LoanTerms(1, 1, None)
+
+
+@override_settings(LIBRARY_LOAN_DAYS=14, LIBRARY_DAILY_FINE_RATE=1.50)
+class LoanPolicyTableTests(TestCase):
+    """Tests for lookups against the compiled policy table"""
+
+    def setUp(self):
+        self.addCleanup(invalidate_loan_policies)
+
+    def test_settings_are_the_fallback(self):
+        """Test settings apply when no policy row matches"""
+        self.assertEqual(loan_policies.loan_days("Tech", Member.Tier.STANDARD), 14)
+        self.assertEqual(
+            loan_policies.daily_fine_rate("Tech", Member.Tier.STANDARD), Decimal("1.5")
+        )
+
+    def test_unknown_category_uses_the_tier_row(self):
+        """Test a category without rows falls back to the tier row"""
+        LoanPolicy.objects.create(tier=Member.Tier.PREMIUM, loan_days=28)
+
+        self.assertEqual(loan_policies.loan_days("Poetry", Member.Tier.PREMIUM), 28)
+
+    def test_saving_a_policy_recompiles_the_table(self):
+        """Test saving or deleting a policy is reflected in lookups"""
+        policy = LoanPolicy.objects.create(category="Tech", loan_days=7)
+        self.assertEqual(loan_policies.loan_days("Tech", Member.Tier.STANDARD), 7)
+
+        policy.loan_days = 10
+        policy.save()
+        self.assertEqual(loan_policies.loan_days("Tech", Member.Tier.STANDARD), 10)
+
+        policy.delete()
+        self.assertEqual(loan_policies.loan_days("Tech", Member.Tier.STANDARD), 14)
+
+    @override_settings(LIBRARY_SHARED_VERSION_TTL=60)
+    def test_other_processes_pick_up_edits_after_the_ttl(self):
+        """Test another process's table picks up edits once its version expires"""
+        other = LoanPolicyTable()
+        self.assertEqual(other.loan_days("Tech", Member.Tier.STANDARD), 14)
+
+        LoanPolicy.objects.create(category="Tech", loan_days=7)
+        self.assertEqual(other.loan_days("Tech", Member.Tier.STANDARD), 14)
+
+        other.version.expire()
+        self.assertEqual(other.loan_days("Tech", Member.Tier.STANDARD), 7)
+
+    def test_lookups_do_not_query(self):
+        """Test lookups on a fresh table run no queries"""
+        LoanPolicy.objects.create(category="Tech", loan_days=7)
+        loan_policies.ensure_fresh()
+
+        with self.assertNumQueries(0):
+            for _ in range(3):
+                loan_policies.loan_days("Tech", Member.Tier.STUDENT)
+                loan_policies.max_books(Member.Tier.STUDENT)
+                loan_policies.daily_fine_rate("Tech", Member.Tier.STUDENT)
+
+
+@override_settings(LIBRARY_LOAN_DAYS=14, LIBRARY_MAX_BOOKS_ALLOWED=5)
+class LoanPolicyCirculationTests(APITestCase):
+    """Tests for borrowing and returning under category and tier policies"""
+
+    def setUp(self):
+        self.addCleanup(invalidate_loan_policies)
+
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.member = Member.objects.get(user=self.user)
+        Member.objects.filter(id=self.member.id).update(tier=Member.Tier.STUDENT)
+
+        self.book = create_book(copies=3)
+
+    def _borrow(self, book=None):
+        book = book or self.book
+        return self.client.post("/api/books/borrow/", {"book_id": book.id})
+
+    def _due_in_days(self, loan_id):
+        loan = Loan.objects.get(id=loan_id)
+        return round((loan.due_at - loan.borrowed_at) / timedelta(days=1))
+
+    def test_borrow_uses_category_and_tier_loan_days(self):
+        """Test a borrow is due after the category and tier loan period"""
+        LoanPolicy.objects.create(category="Tech", loan_days=7)
+        LoanPolicy.objects.create(
+            category="Tech", tier=Member.Tier.STUDENT, loan_days=10
+        )
+
+        response = self._borrow()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._due_in_days(response.data["loan_id"]), 10)
+
+    def test_batch_borrow_uses_each_books_loan_days(self):
+        """Test a batch borrow uses each book's own loan period"""
+        LoanPolicy.objects.create(category="Tech", loan_days=7)
+
+        response = self.client.post(
+            "/api/books/borrow/batch/", {"book_ids": [self.book.id]}, format="json"
+        )
+
+        loan_id = response.data["results"][0]["loan_id"]
+        self.assertEqual(self._due_in_days(loan_id), 7)
+
+    def test_tier_borrow_cap(self):
+        """Test the tier's borrow cap overrides the global limit"""
+        LoanPolicy.objects.create(tier=Member.Tier.STUDENT, max_books=1)
+        self._borrow()
+
+        response = self._borrow(create_book(title="Second"))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Borrow limit reached", response.data["error"])
+        self.assertEqual(Loan.objects.filter(member=self.member).count(), 1)
+
+    def test_return_charges_the_category_fine_rate(self):
+        """Test a late return is fined at the category rate"""
+        LoanPolicy.objects.create(category="Tech", daily_fine_rate=Decimal("0.25"))
+        copy = self.book.copies.first()
+        copy.status = BookCopy.Status.BORROWED
+        copy.save()
+        loan = create_loan(
+            member=self.member,
+            book_copy=copy,
+            due_at=timezone.now() - timedelta(days=4, hours=1),
+        )
+
+        response = self.client.post("/api/books/return/", {"loan_id": loan.id})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["fine"], 1.0)
+        self.assertEqual(Fine.objects.get(loan=loan).amount, Decimal("1.00"))
+
+    def test_overdue_accrual_charges_each_loans_rate(self):
+        """Test overdue accrual fines each loan at its own rate"""
+        LoanPolicy.objects.create(category="Tech", daily_fine_rate=Decimal("0.25"))
+        rare = create_book(title="Rare", copies=1, copy_status=BookCopy.Status.BORROWED)
+        rare.category = "Rare"
+        rare.save()
+        self.book.copies.update(status=BookCopy.Status.BORROWED)
+        due_at = timezone.now() - timedelta(days=2, hours=1)
+        loans = [
+            create_loan(member=self.member, book_copy=copy, due_at=due_at)
+            for copy in (self.book.copies.first(), rare.copies.first())
+        ]
+
+        accrue_overdue_fines(as_of=timezone.now())
+
+        self.assertEqual(
+            [Fine.objects.get(loan=loan).amount for loan in loans],
+            [Decimal("0.50"), Decimal("3.00")],
+        )
+
+    def test_renewal_extends_by_the_policy_period(self):
+        """Test a renewal extends the loan by the policy period"""
+        LoanPolicy.objects.create(category="Tech", loan_days=5)
+        copy = self.book.copies.first()
+        copy.status = BookCopy.Status.BORROWED
+        copy.save()
+        due_at = timezone.now() + timedelta(days=2)
+        loan = create_loan(member=self.member, book_copy=copy, due_at=due_at)
+
+        self.client.post("/api/books/renew/", {"loan_id": loan.id})
+
+        self.assertEqual(Loan.objects.get(id=loan.id).due_at, due_at + timedelta(days=5))
@@ -1,3 +1,5 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 from rest_framework import status
 
@@ -51,3 +53,125 @@ class MemberBookDetailTests(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertNotIn("copies", response.data)
+
+
+class MemberBookCursorPaginationTests(APITestCase):
+    """Tests for keyset pagination and whitelisted ordering of the book list"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+
+        for i in range(12):
+            book = create_book(title=f"Book {i:02d}")
+            book.published_year = 2000 + i % 3
+            book.save()
+
+    def _walk(self, url):
+        titles = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            titles += [b["title"] for b in response.data["results"]]
+            url = response.data["next"]
+        return titles
+
+    def test_cursor_walks_all_pages_in_order(self):
+        """Test following next links returns every book once, in order"""
+        titles = self._walk("/api/public/books/?pagination=cursor")
+
+        self.assertEqual(titles, [f"Book {i:02d}" for i in range(12)])
+
+    def test_cursor_with_duplicate_descending_keys(self):
+        """Test ties on a descending key are broken by id without skipping rows"""
+        titles = self._walk(
+            "/api/public/books/?pagination=cursor&ordering=-published_year"
+        )
+
+        self.assertEqual(len(titles), 12)
+        self.assertEqual(len(set(titles)), 12)
+        self.assertEqual(titles[:4], ["Book 11", "Book 08", "Book 05", "Book 02"])
+
+    def test_unknown_ordering_rejected(self):
+        """Test ordering by a field outside the whitelist answers 400"""
+        response = self.client.get("/api/public/books/?ordering=description")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_cursor_returns_404(self):
+        """Test a malformed cursor answers 404"""
+        response = self.client.get("/api/public/books/?cursor=not-a-cursor")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class SparseFieldsetTests(APITestCase):
+    """Tests for trimming book reads with ?fields="""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.book = create_book(title="Django Basics")
+
+    def test_list_returns_only_requested_fields(self):
+        """Test the list returns the requested fields plus id"""
+        response = self.client.get("/api/public/books/?fields=title,available_copies")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(response.data["results"][0]),
+            {"id", "title", "available_copies"},
+        )
+
+    def test_unrequested_description_is_not_loaded(self):
+        """Test unrequested columns and authors are never queried"""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/public/books/?fields=title")
+
+        book_queries = [q["sql"] for q in queries if "library_book" in q["sql"]]
+        self.assertTrue(book_queries)
+        self.assertFalse(any("description" in sql for sql in book_queries))
+        self.assertFalse(any("library_author" in sql for sql in book_queries))
+
+    def test_detail_returns_only_requested_fields(self):
+        """Test the detail endpoint honours ?fields= too"""
+        response = self.client.get(
+            f"/api/public/books/{self.book.id}/?fields=title,authors"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data), {"id", "title", "authors"})
+
+    def test_unknown_field_rejected(self):
+        """Test an unknown field name answers 400"""
+        response = self.client.get("/api/public/books/?fields=title,copies")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ResponseCompressionTests(APITestCase):
+    """Tests for gzip above the response size threshold"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+
+    def test_large_response_is_compressed(self):
+        """Test a response over the threshold is gzipped for clients that accept it"""
+        for i in range(10):
+            create_book(title=f"Book {i}")
+
+        response = self.client.get(
+            "/api/public/books/", HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        self.assertEqual(response.headers.get("Content-Encoding"), "gzip")
+
+    def test_small_response_is_not_compressed(self):
+        """Test a response under the threshold is sent as is"""
+        response = self.client.get(
+            "/api/public/books/?fields=title", HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        self.assertNotIn("Content-Encoding", response.headers)
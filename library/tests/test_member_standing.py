@@ -0,0 +1,166 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from library.models.book_models import BookCopy
+from library.models.borrow_models import Member, MemberStanding, Loan, Fine
+from factories import create_user, create_book, create_loan, create_fine
+
+
+class MemberStandingTests(APITestCase):
+    """Tests for the per-member loan count and unpaid fine total"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.member = Member.objects.get(user=self.user)
+        self.book = create_book(copies=2)
+
+    def _standing(self, member=None):
+        return MemberStanding.objects.get(member=member or self.member)
+
+    def test_borrow_and_return_keep_loan_count(self):
+        """Test borrowing and returning keep the loan count in step"""
+        response = self.client.post("/api/books/borrow/", {"book_id": self.book.id})
+        self.assertEqual(self._standing().active_loan_count, 1)
+
+        self.client.post("/api/books/return/", {"loan_id": response.data["loan_id"]})
+
+        self.assertEqual(self._standing().active_loan_count, 0)
+
+    def test_batch_borrow_counts_every_loan(self):
+        """Test a batch borrow adds every new loan to the count"""
+        other = create_book(title="Other", copies=1)
+
+        self.client.post(
+            "/api/books/borrow/batch/",
+            {"book_ids": [self.book.id, other.id]},
+            format="json",
+        )
+
+        self.assertEqual(self._standing().active_loan_count, 2)
+
+    def test_late_return_adds_fine(self):
+        """Test a late return adds its fine to the unpaid total"""
+        loan = create_loan(
+            member=self.member,
+            book_copy=self.book.copies.first(),
+            due_at=timezone.now() - timedelta(days=2, hours=1),
+        )
+
+        self.client.post("/api/books/return/", {"loan_id": loan.id})
+
+        standing = self._standing()
+        self.assertEqual(standing.active_loan_count, 0)
+        self.assertEqual(standing.unpaid_fine_total, Decimal("3.00"))
+
+    def test_return_desk_updates_each_member(self):
+        """Test a desk return updates the standing of each borrower"""
+        other = Member.objects.get(user=create_user())
+        copies = list(self.book.copies.all())
+        for member, copy in zip([self.member, other], copies):
+            create_loan(
+                member=member,
+                book_copy=copy,
+                due_at=timezone.now() - timedelta(days=1, hours=1),
+            )
+        BookCopy.objects.filter(book=self.book).update(status=BookCopy.Status.BORROWED)
+        self.client.force_authenticate(user=create_user(is_librarian=True))
+
+        self.client.post(
+            "/api/librarian/returns/",
+            {"barcodes": [copy.barcode for copy in copies]},
+            format="json",
+        )
+
+        for member in [self.member, other]:
+            standing = self._standing(member)
+            self.assertEqual(standing.active_loan_count, 0)
+            self.assertEqual(standing.unpaid_fine_total, Decimal("1.50"))
+
+    def test_paying_fine_lifts_borrow_block(self):
+        """Test paying the fine lets a blocked member borrow again"""
+        loan = create_loan(
+            member=self.member,
+            book_copy=self.book.copies.first(),
+            due_at=timezone.now() - timedelta(days=2),
+            status=Loan.Status.OVERDUE,
+        )
+        fine = create_fine(loan=loan, amount=5)
+        response = self.client.post("/api/books/borrow/", {"book_id": self.book.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(user=create_user(is_librarian=True))
+        response = self.client.post("/api/librarian/fines/pay/", {"fine_id": fine.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(Fine.objects.get(id=fine.id).is_paid)
+        self.assertEqual(self._standing().unpaid_fine_total, 0)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post("/api/books/borrow/", {"book_id": self.book.id})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_fine_cannot_be_paid_twice(self):
+        """Test paying an already paid fine is refused"""
+        loan = create_loan(
+            member=self.member,
+            book_copy=self.book.copies.first(),
+            due_at=timezone.now(),
+            status=Loan.Status.OVERDUE,
+        )
+        fine = create_fine(loan=loan, amount=5)
+        self.client.force_authenticate(user=create_user(is_librarian=True))
+
+        self.client.post("/api/librarian/fines/pay/", {"fine_id": fine.id})
+        response = self.client.post("/api/librarian/fines/pay/", {"fine_id": fine.id})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._standing().unpaid_fine_total, 0)
+
+    def test_member_cannot_pay_fines(self):
+        """Test only librarians can record a fine payment"""
+        response = self.client.post("/api/librarian/fines/pay/", {"fine_id": 1})
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_missing_standing_is_built_on_first_borrow(self):
+        """Test a missing standing row is rebuilt from loans on the next borrow"""
+        copy = self.book.copies.first()
+        copy.status = BookCopy.Status.BORROWED
+        copy.save()
+        create_loan(
+            member=self.member,
+            book_copy=copy,
+            due_at=timezone.now() + timedelta(days=3),
+        )
+        MemberStanding.objects.filter(member=self.member).delete()
+
+        self.client.post("/api/books/borrow/", {"book_id": self.book.id})
+
+        self.assertEqual(self._standing().active_loan_count, 2)
+
+    def test_verify_command_fixes_drift(self):
+        """Test the verify command corrects counts that drifted"""
+        Loan.objects.create(
+            member=self.member,
+            book_copy=self.book.copies.first(),
+            due_at=timezone.now() + timedelta(days=3),
+        )
+        other = Member.objects.get(user=create_user())
+        MemberStanding.objects.filter(member=other).delete()
+
+        out = StringIO()
+        call_command("verify_member_standing", chunk_size=1, dry_run=True, stdout=out)
+        self.assertEqual(self._standing().active_loan_count, 0)
+        self.assertIn("would fix 2", out.getvalue())
+
+        out = StringIO()
+        call_command("verify_member_standing", chunk_size=1, stdout=out)
+        self.assertEqual(self._standing().active_loan_count, 1)
+        self.assertTrue(MemberStanding.objects.filter(member=other).exists())
+        self.assertIn("Scanned 2 members, fixed 2", out.getvalue())
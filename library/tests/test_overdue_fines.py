@@ -0,0 +1,144 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from library.models.book_models import BookCopy
+from library.models.borrow_models import Member, MemberStanding, Loan, Fine
+from library.services.overdue import accrue_overdue_fines
+from factories import create_user, create_book, create_loan
+
+
+class OverdueAccrualTests(APITestCase):
+    """Tests for the nightly overdue flagging and fine accrual job"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.member = Member.objects.get(user=self.user)
+        self.book = create_book(copies=4, copy_status=BookCopy.Status.BORROWED)
+        self.copies = list(self.book.copies.order_by("id"))
+
+    def _loan(self, copy, *, days_late):
+        return create_loan(
+            member=self.member,
+            book_copy=copy,
+            due_at=timezone.now() - timedelta(days=days_late, hours=1),
+        )
+
+    def _run(self, **options):
+        out = StringIO()
+        call_command("accrue_overdue_fines", stdout=out, **options)
+        return out.getvalue()
+
+    def _standing(self):
+        return MemberStanding.objects.get(member=self.member)
+
+    def test_flags_overdue_loans_and_creates_fines(self):
+        """Test late loans are flagged and fined while on-time loans are untouched"""
+        late = self._loan(self.copies[0], days_late=3)
+        on_time = create_loan(
+            member=self.member,
+            book_copy=self.copies[1],
+            due_at=timezone.now() + timedelta(days=3),
+        )
+
+        output = self._run()
+
+        late.refresh_from_db()
+        on_time.refresh_from_db()
+        self.assertTrue(late.is_overdue)
+        self.assertEqual(late.status, Loan.Status.ACTIVE)
+        self.assertFalse(on_time.is_overdue)
+        fine = Fine.objects.get(loan=late)
+        self.assertEqual(fine.amount, Decimal("4.50"))
+        self.assertEqual(fine.accrued_days, 3)
+        self.assertEqual(self._standing().unpaid_fine_total, Decimal("4.50"))
+        self.assertIn("Scanned 1 overdue loans", output)
+
+    def test_rerun_accrues_only_new_days(self):
+        """Test a rerun charges only the days since the last accrual"""
+        loan = self._loan(self.copies[0], days_late=2)
+        self._run()
+
+        stats, _ = accrue_overdue_fines(as_of=timezone.now() + timedelta(days=1))
+
+        self.assertEqual(stats["raised"], 1)
+        self.assertEqual(Fine.objects.get(loan=loan).amount, Decimal("4.50"))
+        self.assertEqual(self._standing().unpaid_fine_total, Decimal("4.50"))
+
+        self._run()
+        self.assertEqual(self._standing().unpaid_fine_total, Decimal("4.50"))
+
+    def test_one_update_per_distinct_day_count(self):
+        """Test fines are raised with one UPDATE per distinct day count"""
+        for copy in self.copies[:3]:
+            self._loan(copy, days_late=2)
+        self._loan(self.copies[3], days_late=5)
+        self._run()
+
+        # Savepoint pair, lock read, flag, fine read, one UPDATE per day
+        # count and the standing UPDATE.
+        with self.assertNumQueries(8):
+            accrue_overdue_fines(as_of=timezone.now() + timedelta(days=1))
+
+    def test_walks_every_chunk(self):
+        """Test the job accrues loans across every chunk"""
+        for days_late, copy in enumerate(self.copies, start=1):
+            self._loan(copy, days_late=days_late)
+
+        output = self._run(chunk_size=3)
+
+        self.assertEqual(Loan.objects.filter(is_overdue=True).count(), 4)
+        self.assertEqual(Fine.objects.count(), 4)
+        self.assertEqual(self._standing().unpaid_fine_total, Decimal("15.00"))
+        self.assertIn("Scanned 4 overdue loans", output)
+
+    def test_return_settles_accrued_fine(self):
+        """Test a return brings an accrued fine up to the return date"""
+        loan = self._loan(self.copies[0], days_late=3)
+        Loan.objects.filter(id=loan.id).update(due_at=loan.due_at - timedelta(days=1))
+        accrue_overdue_fines(as_of=timezone.now() - timedelta(days=1))
+        self.assertEqual(self._standing().unpaid_fine_total, Decimal("4.50"))
+
+        response = self.client.post("/api/books/return/", {"loan_id": loan.id})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["fine"], 6.0)
+        fine = Fine.objects.get(loan=loan)
+        self.assertEqual(fine.amount, Decimal("6.00"))
+        self.assertEqual(fine.accrued_days, 4)
+        self.assertEqual(self._standing().unpaid_fine_total, Decimal("6.00"))
+
+    def test_return_desk_settles_accrued_fines(self):
+        """Test a desk return settles each accrued fine once"""
+        loans = [self._loan(copy, days_late=2) for copy in self.copies[:2]]
+        self._run()
+
+        self.client.force_authenticate(user=create_user(is_librarian=True))
+        response = self.client.post(
+            "/api/librarian/returns/",
+            {"barcodes": [copy.barcode for copy in self.copies[:2]]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Fine.objects.filter(loan__in=loans).count(), 2)
+        self.assertEqual(self._standing().unpaid_fine_total, Decimal("6.00"))
+        self.assertEqual(self._standing().active_loan_count, 0)
+
+    def test_accruing_fine_cannot_be_paid(self):
+        """Test a fine on a loan still out cannot be paid yet"""
+        loan = self._loan(self.copies[0], days_late=2)
+        self._run()
+        fine = Fine.objects.get(loan=loan)
+
+        self.client.force_authenticate(user=create_user(is_librarian=True))
+        response = self.client.post("/api/librarian/fines/pay/", {"fine_id": fine.id})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Fine.objects.get(id=fine.id).is_paid)
@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from library.models.book_models import BookCopy
+from library.models.borrow_models import Member, Loan, Reservation
+from library.services.loan_policy import loan_policies
+from factories import create_user, create_book, create_loan
+
+
+@override_settings(LIBRARY_LOAN_DAYS=14, LIBRARY_MAX_RENEWALS=2)
+class LoanRenewalAPITests(APITestCase):
+    """Tests for renewing one loan or all of a member's loans"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.member = Member.objects.get(user=self.user)
+
+        self.books = [
+            create_book(title=f"Book {i}", copies=1, copy_status=BookCopy.Status.BORROWED)
+            for i in range(3)
+        ]
+        self.due_at = timezone.now() + timedelta(days=3)
+        self.loans = [
+            create_loan(
+                member=self.member,
+                book_copy=book.copies.first(),
+                due_at=self.due_at,
+            )
+            for book in self.books
+        ]
+
+    def _renew(self, loan):
+        return self.client.post("/api/books/renew/", {"loan_id": loan.id})
+
+    def test_renewal_extends_from_current_due_date(self):
+        """Test a renewal extends the loan from its current due date"""
+        response = self._renew(self.loans[0])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        loan = Loan.objects.get(id=self.loans[0].id)
+        self.assertEqual(loan.due_at, self.due_at + timedelta(days=14))
+        self.assertEqual(loan.renewal_count, 1)
+        self.assertEqual(response.data["renewal_count"], 1)
+        self.assertEqual(response.data["due_at"], loan.due_at)
+
+    def test_renewal_limit(self):
+        """Test a loan renewed the maximum number of times is refused"""
+        self._renew(self.loans[0])
+        self._renew(self.loans[0])
+
+        response = self._renew(self.loans[0])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"], "Renewal limit reached")
+        self.assertEqual(Loan.objects.get(id=self.loans[0].id).renewal_count, 2)
+
+    def test_reserved_book_cannot_be_renewed(self):
+        """Test a loan whose book another member reserved is refused"""
+        Reservation.objects.create(
+            member=Member.objects.get(user=create_user()),
+            book=self.books[0],
+            expires_at=timezone.now() + timedelta(days=2),
+        )
+
+        response = self._renew(self.loans[0])
+
+        self.assertEqual(response.data["error"], "Book is reserved by another member")
+        self.assertEqual(Loan.objects.get(id=self.loans[0].id).due_at, self.due_at)
+
+    def test_overdue_loan_cannot_be_renewed(self):
+        """Test an overdue loan is refused"""
+        Loan.objects.filter(id=self.loans[0].id).update(
+            due_at=timezone.now() - timedelta(days=1)
+        )
+
+        response = self._renew(self.loans[0])
+
+        self.assertEqual(response.data["error"], "Loan is overdue")
+
+    def test_other_members_loan_is_not_found(self):
+        """Test renewing another member's loan answers 404"""
+        self.client.force_authenticate(user=create_user())
+
+        response = self._renew(self.loans[0])
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(Loan.objects.get(id=self.loans[0].id).renewal_count, 0)
+
+    def test_renew_all_reports_each_loan(self):
+        """Test renewing all loans reports an outcome per loan"""
+        Reservation.objects.create(
+            member=Member.objects.get(user=create_user()),
+            book=self.books[1],
+            expires_at=timezone.now() + timedelta(days=2),
+        )
+
+        response = self.client.post("/api/books/renew/all/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = {r["loan_id"]: r for r in response.data["results"]}
+        self.assertEqual(results[self.loans[0].id]["renewal_count"], 1)
+        self.assertEqual(
+            results[self.loans[1].id]["error"], "Book is reserved by another member"
+        )
+        self.assertEqual(
+            Loan.objects.filter(member=self.member, renewal_count=1).count(), 2
+        )
+
+    def test_renew_all_is_set_based(self):
+        """Test one locking read and one UPDATE whatever the number of loans"""
+        loan_policies.ensure_fresh()
+        with self.assertNumQueries(6):
+            self.client.post("/api/books/renew/all/")
+
+        more = create_book(title="More", copies=2, copy_status=BookCopy.Status.BORROWED)
+        for copy in more.copies.all():
+            create_loan(member=self.member, book_copy=copy, due_at=self.due_at)
+
+        with self.assertNumQueries(6):
+            self.client.post("/api/books/renew/all/")
@@ -0,0 +1,196 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from library.models.book_models import Book, BookCopy
+from library.models.borrow_models import Member, Loan, Reservation
+from factories import create_user, create_book, create_loan
+
+
+class ReservationQueueTests(APITestCase):
+    """Tests for queue positions and copies put on hold on return"""
+
+    def setUp(self):
+        self.book = create_book(copies=2, copy_status=BookCopy.Status.BORROWED)
+        self.copies = list(self.book.copies.order_by("id"))
+
+        self.borrower = Member.objects.get(user=create_user())
+        self.loans = [
+            create_loan(
+                member=self.borrower,
+                book_copy=copy,
+                due_at=timezone.now() + timedelta(days=5),
+            )
+            for copy in self.copies
+        ]
+
+        self.users = [create_user() for _ in range(3)]
+        self.members = [Member.objects.get(user=user) for user in self.users]
+
+    def _reserve(self, user):
+        self.client.force_authenticate(user=user)
+        return self.client.post("/api/books/reserve/", {"book_id": self.book.id})
+
+    def _return(self, loan):
+        self.client.force_authenticate(user=self.borrower.user)
+        return self.client.post("/api/books/return/", {"loan_id": loan.id})
+
+    def _queue(self, user, reservation_id):
+        self.client.force_authenticate(user=user)
+        return self.client.get(f"/api/reservations/{reservation_id}/queue/")
+
+    def test_reservations_are_numbered_in_order(self):
+        """Test reservations get queue positions in the order they were made"""
+        positions = [self._reserve(user).data["queue_position"] for user in self.users]
+
+        self.assertEqual(positions, [1, 2, 3])
+        self.assertEqual(
+            list(Reservation.objects.order_by("id").values_list("queue_position", flat=True)),
+            [1, 2, 3],
+        )
+
+    def test_position_moves_up_when_someone_ahead_cancels(self):
+        """Test a member moves up the queue when someone ahead cancels"""
+        first = self._reserve(self.users[0]).data["reservation_id"]
+        last = self._reserve(self.users[1]).data["reservation_id"]
+
+        self.client.force_authenticate(user=self.users[0])
+        self.client.post("/api/books/cancel-reservation/", {"reservation_id": first})
+
+        response = self._queue(self.users[1], last)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["queue_position"], 1)
+        self.assertIsNone(response.data["held_copy"])
+
+    def test_queue_is_private_to_the_owner(self):
+        """Test another member cannot see a reservation's queue position"""
+        reservation_id = self._reserve(self.users[0]).data["reservation_id"]
+
+        response = self._queue(self.users[1], reservation_id)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_return_holds_copy_for_head_of_queue(self):
+        """Test a returned copy is held for the member at the head of the queue"""
+        first = self._reserve(self.users[0]).data["reservation_id"]
+        second = self._reserve(self.users[1]).data["reservation_id"]
+
+        self._return(self.loans[0])
+
+        copy = BookCopy.objects.get(id=self.copies[0].id)
+        self.assertEqual(copy.status, BookCopy.Status.RESERVED)
+        self.assertEqual(copy.held_for_id, first)
+        self.assertEqual(Book.objects.get(id=self.book.id).available_copies, 0)
+
+        held = self._queue(self.users[0], first).data
+        self.assertEqual(held["held_copy"], copy.barcode)
+        self.assertIsNotNone(held["pickup_deadline"])
+        self.assertIsNone(Reservation.objects.get(id=second).pickup_deadline)
+
+    def test_bulk_return_hands_copies_out_in_queue_order(self):
+        """Test a bulk return holds copies for waiters in queue order"""
+        ids = [self._reserve(user).data["reservation_id"] for user in self.users]
+        librarian = create_user(is_librarian=True)
+        self.client.force_authenticate(user=librarian)
+
+        self.client.post(
+            "/api/librarian/returns/",
+            {"barcodes": [copy.barcode for copy in self.copies]},
+            format="json",
+        )
+
+        held_for = set(
+            BookCopy.objects.filter(book=self.book).values_list("held_for_id", flat=True)
+        )
+        self.assertEqual(held_for, set(ids[:2]))
+        self.assertIsNone(Reservation.objects.get(id=ids[2]).pickup_deadline)
+
+    def test_holder_borrows_the_held_copy(self):
+        """Test the holder of a reservation borrows the copy held for them"""
+        first = self._reserve(self.users[0]).data["reservation_id"]
+        self._return(self.loans[0])
+
+        self.client.force_authenticate(user=self.users[0])
+        response = self.client.post("/api/books/borrow/", {"book_id": self.book.id})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        loan = Loan.objects.get(member=self.members[0])
+        self.assertEqual(loan.book_copy_id, self.copies[0].id)
+        copy = BookCopy.objects.get(id=self.copies[0].id)
+        self.assertEqual(copy.status, BookCopy.Status.BORROWED)
+        self.assertIsNone(copy.held_for_id)
+        self.assertEqual(Book.objects.get(id=self.book.id).available_copies, 0)
+        self.assertEqual(
+            Reservation.objects.get(id=first).status, Reservation.Status.FULFILLED
+        )
+
+    def test_held_copy_is_not_borrowable_by_others(self):
+        """Test a held copy cannot be borrowed by other members"""
+        self._reserve(self.users[0])
+        self._return(self.loans[0])
+
+        self.client.force_authenticate(user=self.users[1])
+        response = self.client.post("/api/books/borrow/", {"book_id": self.book.id})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"], "No available copies")
+        self.assertFalse(Loan.objects.filter(member=self.members[1]).exists())
+
+    def test_cancelled_hold_passes_to_next_in_queue(self):
+        """Test cancelling a held reservation passes the copy to the next waiter"""
+        first = self._reserve(self.users[0]).data["reservation_id"]
+        second = self._reserve(self.users[1]).data["reservation_id"]
+        self._return(self.loans[0])
+
+        self.client.force_authenticate(user=self.users[0])
+        response = self.client.post(
+            "/api/books/cancel-reservation/", {"reservation_id": first}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        copy = BookCopy.objects.get(id=self.copies[0].id)
+        self.assertEqual(copy.held_for_id, second)
+        self.assertIsNotNone(Reservation.objects.get(id=second).pickup_deadline)
+
+    def test_cancelled_hold_goes_back_on_shelf_when_queue_is_empty(self):
+        """Test a cancelled hold returns the copy to the shelf when nobody waits"""
+        first = self._reserve(self.users[0]).data["reservation_id"]
+        self._return(self.loans[0])
+
+        self.client.force_authenticate(user=self.users[0])
+        self.client.post("/api/books/cancel-reservation/", {"reservation_id": first})
+
+        copy = BookCopy.objects.get(id=self.copies[0].id)
+        self.assertEqual(copy.status, BookCopy.Status.AVAILABLE)
+        self.assertIsNone(copy.held_for_id)
+        self.assertEqual(Book.objects.get(id=self.book.id).available_copies, 1)
+
+    def test_position_skips_held_and_lapsed_reservations(self):
+        """Test queue positions count only reservations still waiting"""
+        first = self._reserve(self.users[0]).data["reservation_id"]
+        second = self._reserve(self.users[1]).data["reservation_id"]
+        self._return(self.loans[0])
+        Reservation.objects.filter(id=second).update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        response = self._reserve(self.users[2])
+
+        self.assertEqual(response.data["queue_position"], 1)
+        held = self._queue(self.users[0], first).data
+        self.assertIsNone(held["queue_position"])
+        self.assertIsNotNone(held["held_copy"])
+
+    def test_batch_position_skips_held_reservations(self):
+        """Test batch reservations report positions behind waiters only"""
+        self._reserve(self.users[0])
+        self._return(self.loans[0])
+
+        self.client.force_authenticate(user=self.users[1])
+        response = self.client.post(
+            "/api/books/reserve/batch/", {"book_ids": [self.book.id]}, format="json"
+        )
+
+        self.assertEqual(response.data["results"][0]["queue_position"], 1)
@@ -202,3 +202,101 @@ class ReturnBookAPITests(APITestCase):
         loan.refresh_from_db()
         self.assertIsNotNone(loan.returned_at)
         self.assertGreaterEqual(loan.returned_at, before_return)
+
+
+class ReturnCopiesAPITests(APITestCase):
+    """Tests for the librarian return desk that checks in scanned barcodes"""
+
+    url = "/api/librarian/returns/"
+
+    def setUp(self):
+        self.librarian = create_user(is_librarian=True)
+        self.client.force_authenticate(user=self.librarian)
+        self.member = Member.objects.get(user=create_user())
+
+        self.book = create_book(copies=3, copy_status=BookCopy.Status.BORROWED)
+        self.copies = list(self.book.copies.order_by("id"))
+        self.loans = [
+            Loan.objects.create(
+                member=self.member,
+                book_copy=copy,
+                due_at=timezone.now() + timedelta(days=5),
+            )
+            for copy in self.copies
+        ]
+
+    def test_returns_every_scanned_copy(self):
+        barcodes = [copy.barcode for copy in self.copies]
+
+        response = self.client.post(self.url, {"barcodes": barcodes}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([r["barcode"] for r in response.data["results"]], barcodes)
+        for loan in self.loans:
+            loan.refresh_from_db()
+            self.assertEqual(loan.status, Loan.Status.RETURNED)
+            self.assertIsNotNone(loan.returned_at)
+        for copy in self.copies:
+            copy.refresh_from_db()
+            self.assertEqual(copy.status, BookCopy.Status.AVAILABLE)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.available_copies, 3)
+
+    def test_query_count_is_independent_of_batch_size(self):
+        barcodes = [copy.barcode for copy in self.copies]
+
+        with self.assertNumQueries(9):
+            self.client.post(self.url, {"barcodes": barcodes[:1]}, format="json")
+
+        with self.assertNumQueries(9):
+            self.client.post(self.url, {"barcodes": barcodes[1:]}, format="json")
+
+    def test_overdue_copy_gets_a_fine(self):
+        self.loans[0].due_at = timezone.now() - timedelta(days=3, hours=1)
+        self.loans[0].save()
+
+        response = self.client.post(
+            self.url, {"barcodes": [self.copies[0].barcode]}, format="json"
+        )
+
+        result = response.data["results"][0]
+        self.assertEqual(result["status"], Loan.Status.OVERDUE)
+        self.assertEqual(result["fine"], 4.5)
+        self.assertEqual(Fine.objects.get(loan=self.loans[0]).amount, 4.5)
+
+    def test_reserved_title_goes_to_hold_shelf(self):
+        Reservation.objects.create(
+            member=Member.objects.get(user=create_user()),
+            book=self.book,
+            expires_at=timezone.now() + timedelta(days=2),
+        )
+
+        self.client.post(self.url, {"barcodes": [self.copies[0].barcode]}, format="json")
+
+        self.copies[0].refresh_from_db()
+        self.assertEqual(self.copies[0].status, BookCopy.Status.RESERVED)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.available_copies, 0)
+
+    def test_unknown_and_already_returned_barcodes_are_reported(self):
+        self.client.post(self.url, {"barcodes": [self.copies[0].barcode]}, format="json")
+
+        response = self.client.post(
+            self.url,
+            {"barcodes": [self.copies[0].barcode, "NOPE", self.copies[1].barcode]},
+            format="json",
+        )
+
+        results = response.data["results"]
+        self.assertEqual(results[0]["error"], "No active loan for this copy")
+        self.assertEqual(results[1]["error"], "No active loan for this copy")
+        self.assertEqual(results[2]["status"], Loan.Status.RETURNED)
+
+    def test_member_cannot_use_return_desk(self):
+        self.client.force_authenticate(user=self.member.user)
+
+        response = self.client.post(
+            self.url, {"barcodes": [self.copies[0].barcode]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
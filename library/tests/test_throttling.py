@@ -0,0 +1,118 @@
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from library.apis.throttling import TokenBucketStore, token_buckets
+from library.models.borrow_models import Loan
+from factories import create_user, create_book
+
+
+class TokenBucketStoreTests(SimpleTestCase):
+    """Tests for the in-process token bucket counters"""
+
+    def setUp(self):
+        self.store = TokenBucketStore()
+
+    def test_burst_then_refill(self):
+        """Test a bucket allows a burst and then refills over time"""
+        waits = [self.store.take("k", rate=2, burst=3, now=0) for _ in range(4)]
+
+        self.assertEqual(waits[:3], [0, 0, 0])
+        self.assertAlmostEqual(waits[3], 0.5)
+        self.assertEqual(self.store.take("k", rate=2, burst=3, now=0.5), 0)
+
+    def test_refill_is_capped_at_burst(self):
+        """Test an idle bucket never holds more than its burst"""
+        self.store.take("k", rate=1, burst=2, now=0)
+
+        waits = [self.store.take("k", rate=1, burst=2, now=100) for _ in range(3)]
+
+        self.assertEqual(waits[:2], [0, 0])
+        self.assertGreater(waits[2], 0)
+
+    def test_keys_are_independent(self):
+        """Test taking from one key leaves other keys full"""
+        self.store.take("a", rate=1, burst=1, now=0)
+
+        self.assertEqual(self.store.take("b", rate=1, burst=1, now=0), 0)
+
+    def test_least_recently_used_bucket_is_evicted(self):
+        """Test the least recently used bucket is dropped past max_keys"""
+        self.store.max_keys = 2
+        self.store.take("old", rate=1, burst=1, now=0)
+        self.store.take("busy", rate=1, burst=5, now=10)
+
+        self.store.take("new", rate=1, burst=1, now=10)
+
+        self.assertEqual(set(self.store._buckets), {"busy", "new"})
+
+    def test_eviction_does_not_wait_for_buckets_to_refill(self):
+        """Test eviction drops the idle bucket even if it is not yet full"""
+        self.store.max_keys = 2
+        for key in ("a", "b"):
+            self.store.take(key, rate=0.001, burst=5, now=0)
+        self.store.take("a", rate=0.001, burst=5, now=1)
+
+        self.store.take("c", rate=0.001, burst=5, now=1)
+
+        self.assertEqual(list(self.store._buckets), ["a", "c"])
+
+
+class CirculationThrottleTests(APITestCase):
+    """Tests for 429 responses from the circulation endpoints"""
+
+    def setUp(self):
+        token_buckets.clear()
+        self.addCleanup(token_buckets.clear)
+
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.book = create_book(copies=5)
+
+    def _borrow(self):
+        return self.client.post("/api/books/borrow/", {"book_id": self.book.id})
+
+    @override_settings(LIBRARY_CIRCULATION_MEMBER_RATE=(0.5, 2))
+    def test_member_limit_answers_429_with_retry_after(self):
+        """Test a member over the limit gets 429 with Retry-After"""
+        responses = [self._borrow() for _ in range(3)]
+
+        self.assertEqual(
+            [r.status_code for r in responses],
+            [status.HTTP_201_CREATED, status.HTTP_201_CREATED,
+             status.HTTP_429_TOO_MANY_REQUESTS],
+        )
+        self.assertEqual(responses[2]["Retry-After"], "2")
+        self.assertEqual(Loan.objects.count(), 2)
+
+    @override_settings(LIBRARY_CIRCULATION_MEMBER_RATE=(0.5, 1))
+    def test_members_have_separate_buckets(self):
+        """Test one member's requests do not use up another's"""
+        self._borrow()
+
+        self.client.force_authenticate(user=create_user())
+        response = self._borrow()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    @override_settings(
+        LIBRARY_CIRCULATION_MEMBER_RATE=None,
+        LIBRARY_CIRCULATION_GLOBAL_RATE=(0.5, 1),
+    )
+    def test_global_limit_is_shared(self):
+        """Test the global limit counts requests from every member"""
+        self._borrow()
+
+        self.client.force_authenticate(user=create_user())
+        response = self._borrow()
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(LIBRARY_CIRCULATION_MEMBER_RATE=(0.5, 1))
+    def test_catalog_browsing_is_not_throttled(self):
+        """Test catalog reads are not limited by the circulation buckets"""
+        self._borrow()
+
+        response = self.client.get("/api/public/books/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
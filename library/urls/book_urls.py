@@ -5,7 +5,12 @@ from library.apis.book_apis import (
     BookUpdateAPI,
     LibrarianBookDetailAPI,
     MemberBookDetailAPI,
+    MemberBookBatchAPI,
+    LibrarianBookBatchAPI,
     AvailableBooksAPI,
+    AvailableBookFacetsAPI,
+    BookAutocompleteAPI,
+    BookFuzzySearchAPI,
     BookSoftDeleteAPI,
 )
 
@@ -21,10 +26,34 @@ urlpatterns = [
         name="member-book-list",
     ),
 
+    path(
+        "public/books/facets/",
+        AvailableBookFacetsAPI.as_view(),
+        name="member-book-facets",
+    ),
+
+    path(
+        "public/books/autocomplete/",
+        BookAutocompleteAPI.as_view(),
+        name="book-autocomplete",
+    ),
+
+    path(
+        "public/books/fuzzy/",
+        BookFuzzySearchAPI.as_view(),
+        name="book-fuzzy-search",
+    ),
+
     # ======================
     # MEMBER ENDPOINTS
     # ======================
 
+    path(
+        "public/books/batch/",
+        MemberBookBatchAPI.as_view(),
+        name="member-book-batch",
+    ),
+
     path(
         "public/books/<int:id>/",
         MemberBookDetailAPI.as_view(),
@@ -41,6 +70,12 @@ urlpatterns = [
         name="librarian-book-create",
     ),
 
+    path(
+        "librarian/books/batch/",
+        LibrarianBookBatchAPI.as_view(),
+        name="librarian-book-batch",
+    ),
+
     path(
         "librarian/books/<int:id>/",
         LibrarianBookDetailAPI.as_view(),
@@ -2,9 +2,17 @@ from django.urls import path
 
 from library.apis.borrow_apis import (
     BorrowBookAPI,
+    BorrowBooksAPI,
+    BorrowEligibilityAPI,
     ReturnBookAPI,
+    ReturnCopiesAPI,
+    RenewLoanAPI,
+    RenewAllLoansAPI,
+    PayFineAPI,
     ReserveBookAPI,
+    ReserveBooksAPI,
     CancelReservationAPI,
+    ReservationQueueAPI,
 )
 
 urlpatterns = [
@@ -16,11 +24,45 @@ urlpatterns = [
         BorrowBookAPI.as_view(),
         name="book-borrow"
     ),
+    path(
+        "books/borrow/batch/",
+        BorrowBooksAPI.as_view(),
+        name="book-borrow-batch"
+    ),
+    path(
+        "books/borrow/eligibility/",
+        BorrowEligibilityAPI.as_view(),
+        name="book-borrow-eligibility"
+    ),
     path(
         "books/return/",
         ReturnBookAPI.as_view(),
         name="book-return"
     ),
+    path(
+        "librarian/returns/",
+        ReturnCopiesAPI.as_view(),
+        name="librarian-returns"
+    ),
+    path(
+        "books/renew/",
+        RenewLoanAPI.as_view(),
+        name="loan-renew"
+    ),
+    path(
+        "books/renew/all/",
+        RenewAllLoansAPI.as_view(),
+        name="loan-renew-all"
+    ),
+
+    # -----------------------------
+    # Fines
+    # -----------------------------
+    path(
+        "librarian/fines/pay/",
+        PayFineAPI.as_view(),
+        name="fine-pay"
+    ),
 
     # -----------------------------
     # Reservations
@@ -30,9 +72,19 @@ urlpatterns = [
         ReserveBookAPI.as_view(),
         name="book-reserve"
     ),
+    path(
+        "books/reserve/batch/",
+        ReserveBooksAPI.as_view(),
+        name="book-reserve-batch"
+    ),
     path(
         "books/cancel-reservation/",
         CancelReservationAPI.as_view(),
         name="reservation-cancel"
     ),
+    path(
+        "reservations/<int:reservation_id>/queue/",
+        ReservationQueueAPI.as_view(),
+        name="reservation-queue"
+    ),
 ]